@@ -0,0 +1,155 @@
+"""
+Vision Module - Activity Gate
+=============================
+
+This module decides when a camera frame is worth running face recognition on.
+
+Each frame is shrunk to a small grayscale image and compared against a slowly
+updated background (running average). The share of pixels that differ is the
+scene activity. Recognition then runs:
+
+- immediately when activity jumps (someone walks in), at most `max_rate`
+  times per second;
+- at a rate that scales with activity while the scene keeps changing;
+- only every 1/`min_rate` seconds while nothing moves.
+
+The rate is also capped so recognition stays within a CPU budget, measured
+from its own processing time and the system load average.
+
+Integration Note:
+    - The vision worker (and the in-thread vision loop) ask the gate on every
+      frame and pass the answer to `scan_for_people(frame, detect=...)`: the
+      face tracker still follows faces on every frame, the gate only forces
+      or suppresses its detection/recognition step.
+"""
+
+import os
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .face_tracking import downscale, to_gray
+
+
+class ActivityGate:
+    """
+    Frame-differencing gate with an activity- and CPU-adaptive recognition rate.
+    """
+    def __init__(self, min_rate=0.2, max_rate=10.0, scale=8, pixel_threshold=25,
+                 trigger=0.02, full_activity=0.2, learning_rate=0.05, cpu_budget=0.5):
+        """
+        Args:
+            min_rate (float): Recognitions per second in a static scene.
+            max_rate (float): Upper bound on recognitions per second.
+            scale (int): Downscale factor before differencing.
+            pixel_threshold (int): Gray-level change (0-255) that marks a pixel as changed.
+            trigger (float): Share of changed pixels that counts as motion.
+            full_activity (float): Share of changed pixels that earns `max_rate`.
+            learning_rate (float): How fast the background absorbs changes.
+            cpu_budget (float): Share of one core recognition may use.
+        """
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.scale = scale
+        self.pixel_threshold = pixel_threshold
+        self.trigger = trigger
+        self.full_activity = full_activity
+        self.learning_rate = learning_rate
+        self.cpu_budget = cpu_budget
+        self.background = None
+        self.activity = 0.0
+        self.was_active = False
+        self.last_run = None
+        self.avg_processing = 0.0
+        self.stats = {"frames": 0, "processed": 0, "motion_triggers": 0}
+
+    def observe(self, frame):
+        """
+        Updates the background model with a new frame.
+
+        Returns:
+            float: Share of pixels that changed (0.0 - 1.0).
+        """
+        gray = to_gray(downscale(frame, self.scale)).astype(np.float32)
+        if self.background is None or self.background.shape != gray.shape:
+            # First frame only seeds the background (it is processed anyway)
+            self.background = gray
+            self.activity = 0.0
+        else:
+            changed = np.abs(gray - self.background) > self.pixel_threshold
+            self.activity = float(changed.mean())
+            self.background += self.learning_rate * (gray - self.background)
+        self.stats["frames"] += 1
+        return self.activity
+
+    def cpu_rate_limit(self):
+        """Highest rate that keeps recognition within the CPU budget."""
+        limit = self.max_rate
+        if self.avg_processing > 0:
+            limit = min(limit, self.cpu_budget / self.avg_processing)
+        if hasattr(os, "getloadavg"):
+            load_per_core = os.getloadavg()[0] / (os.cpu_count() or 1)
+            if load_per_core > 0.9:
+                # The machine is saturated: back off towards the idle rate
+                limit /= 2
+        return max(self.min_rate, limit)
+
+    def target_rate(self):
+        """Recognitions per second wanted for the current activity."""
+        if self.activity < self.trigger:
+            return self.min_rate
+        share = min(1.0, self.activity / self.full_activity)
+        rate = self.min_rate + share * (self.max_rate - self.min_rate)
+        return min(rate, self.cpu_rate_limit())
+
+    def should_process(self, frame, now=None):
+        """
+        Observes a frame and decides whether to run recognition on it.
+
+        Returns:
+            bool: True if recognition should run now.
+        """
+        now = now if now is not None else time.monotonic()
+        self.observe(frame)
+        active = self.activity >= self.trigger
+        since = now - self.last_run if self.last_run is not None else float("inf")
+
+        if active and not self.was_active and since >= 1 / self.cpu_rate_limit():
+            # Motion just started: react at once
+            self.stats["motion_triggers"] += 1
+            run = True
+        else:
+            run = since >= 1 / self.target_rate()
+        self.was_active = active
+        if run:
+            self.last_run = now
+            self.stats["processed"] += 1
+        return run
+
+    def record_processing(self, seconds):
+        """Feeds back how long a recognition took (for the CPU budget)."""
+        if self.avg_processing == 0:
+            self.avg_processing = seconds
+        else:
+            self.avg_processing = 0.8 * self.avg_processing + 0.2 * seconds
+
+    def report(self):
+        """
+        Returns gate statistics.
+
+        Returns:
+            dict: Frames seen and processed, share skipped, motion triggers,
+                  current activity and target recognition rate.
+        """
+        frames = self.stats["frames"]
+        return {
+            "frames": frames,
+            "processed": self.stats["processed"],
+            "skipped_ratio": 1 - self.stats["processed"] / frames if frames else 0.0,
+            "motion_triggers": self.stats["motion_triggers"],
+            "activity": self.activity,
+            "rate": self.target_rate(),
+        }
@@ -0,0 +1,243 @@
+"""
+AI Module - Async LLM Handler
+=============================
+
+This module provides an asyncio variant of `LocalLLMHandler`.
+
+A voice command can be superseded while the LLM is still generating ("go
+forward" immediately followed by "stop"). `AsyncLocalLLMHandler.submit`
+runs each command as an asyncio task and cancels the in-flight one when a
+newer or higher-priority command arrives. Cancelling closes the HTTP stream,
+which makes Ollama stop computing the abandoned response.
+
+The HTTP/1.1 streaming request is written directly on asyncio streams, so no
+extra dependency or worker thread is needed.
+
+Integration Note:
+    - Used by `RobotApp.run_async` in `main.py`.
+    - Shares the fast path, cache and prompt handling of `LocalLLMHandler`.
+"""
+
+import asyncio
+import json
+import time
+import urllib.parse
+
+from .llm_handler import LocalLLMHandler, StreamingIntentParser
+
+# Commands that must never be cancelled by a chattier one
+PRIORITY_ACTIONS = {"stop"}
+HIGH_PRIORITY = 10
+NORMAL_PRIORITY = 0
+
+
+class LLMStreamError(Exception):
+    """Raised when the LLM server cannot be reached or answers with an error."""
+
+
+class AsyncLocalLLMHandler(LocalLLMHandler):
+    """
+    Asyncio interface to the local LLM with cancellation of superseded commands.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.current_task = None
+        self.current_priority = NORMAL_PRIORITY
+        self.cancelled_count = 0
+
+    @classmethod
+    def from_handler(cls, handler):
+        """
+        Creates an async handler sharing the client, matcher, cache and prompt
+        context of an existing `LocalLLMHandler`.
+        """
+        async_handler = cls(model_name=handler.model_name, api_url=handler.api_url,
+                            client=handler.client, reuse_context=handler.reuse_context,
+                            use_fast_path=handler.matcher is not None, cache=handler.cache)
+        async_handler.matcher = handler.matcher
+        async_handler.prefix_context = handler.prefix_context
+        return async_handler
+
+    async def _post_stream(self, payload):
+        """
+        Posts a streaming generate request and yields each decoded NDJSON object.
+
+        The connection is closed when the generator is closed or cancelled.
+        """
+        url = urllib.parse.urlsplit(self.client.generate_url)
+        connect_timeout, read_timeout = self.client.timeout
+        body = json.dumps(dict(payload, stream=True, keep_alive=self.client.keep_alive)).encode()
+
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(url.hostname, url.port or 80), connect_timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise LLMStreamError(f"Cannot connect to {url.netloc}: {e}") from e
+
+        try:
+            writer.write(
+                f"POST {url.path} HTTP/1.1\r\n"
+                f"Host: {url.netloc}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+
+            async def readline():
+                return await asyncio.wait_for(reader.readline(), read_timeout)
+
+            status_line = (await readline()).decode("latin-1").split()
+            if len(status_line) < 2 or status_line[1] != "200":
+                raise LLMStreamError(f"LLM server answered {' '.join(status_line[1:])}")
+
+            chunked = False
+            while True:
+                header = (await readline()).decode("latin-1").strip()
+                if not header:
+                    break
+                name, _, value = header.partition(":")
+                if name.lower() == "transfer-encoding" and "chunked" in value.lower():
+                    chunked = True
+
+            pending = b""
+            while True:
+                if chunked:
+                    size = int((await readline()).split(b";")[0], 16)
+                    if size == 0:
+                        break
+                    data = await asyncio.wait_for(reader.readexactly(size + 2), read_timeout)
+                    pending += data[:-2]
+                else:
+                    data = await asyncio.wait_for(reader.read(4096), read_timeout)
+                    if not data:
+                        break
+                    pending += data
+
+                *lines, pending = pending.split(b"\n")
+                for line in lines:
+                    if line.strip():
+                        yield json.loads(line)
+
+            if pending.strip():
+                yield json.loads(pending)
+
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+            raise LLMStreamError(f"LLM stream failed: {e}") from e
+        finally:
+            # Dropping the connection makes Ollama abandon the generation
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def query_llm_stream_async(self, prompt, context=None):
+        """
+        Async counterpart of `query_llm_stream`.
+
+        Yields:
+            str: Successive chunks of the generated response.
+        """
+        payload = {"model": self.model_name, "prompt": prompt}
+        if context:
+            payload["context"] = context
+
+        stream = self._post_stream(payload)
+        try:
+            async for data in stream:
+                if data.get("done"):
+                    self._record_stats(data)
+                yield data.get("response", "")
+        except LLMStreamError as e:
+            print(f"AI Error: Failed to connect to LLM. Is Ollama running? Error: {e}")
+            yield "Error: I cannot reach my brain right now."
+        finally:
+            await stream.aclose()
+
+    async def prime_context_async(self):
+        """Async counterpart of `prime_context`."""
+        done = {}
+        try:
+            async for data in self._post_stream(self.prime_payload()):
+                if data.get("done"):
+                    done = data
+        except LLMStreamError as e:
+            print(f"AI Error: Could not prime prompt context: {e}")
+        return self._store_prime(done)
+
+    async def interpret_command_async(self, user_input, on_action=None, on_say=None):
+        """
+        Async counterpart of `interpret_command_stream`.
+
+        Can be cancelled at any await point; the HTTP stream is then closed.
+
+        Returns:
+            dict: The final intent.
+        """
+        intent = self.fast_path(user_input)
+        if intent is not None:
+            if on_action:
+                on_action(intent["action"])
+            return intent
+
+        if self.should_prime():
+            await self.prime_context_async()
+
+        parser = StreamingIntentParser()
+        pending_say = ""
+        start = time.monotonic()
+        self.metrics["time_to_first_action"] = None
+
+        # Never prime from here: the sync path would block the event loop.
+        # If priming failed above, the full prompt is sent instead.
+        prompt, context = self.build_prompt(user_input, prime=False)
+        async for chunk in self.query_llm_stream_async(prompt, context=context):
+            action, text = parser.feed(chunk)
+            if action is not None:
+                self.metrics["time_to_first_action"] = time.monotonic() - start
+                if on_action:
+                    on_action(action)
+
+            pending_say += text
+            if pending_say and parser.action == "say" and on_say:
+                on_say(pending_say)
+                pending_say = ""
+
+        self.metrics["total_time"] = time.monotonic() - start
+        self.metrics["streamed_commands"] += 1
+        self._record_llm_latency(self.metrics["total_time"])
+        intent = self.parse_intent(parser.buffer)
+        self.cache.put(user_input, intent)
+        return intent
+
+    def command_priority(self, user_input):
+        """Returns HIGH_PRIORITY for safety commands such as 'stop'."""
+        if self.matcher is not None:
+            intent, confidence = self.matcher.match(user_input)
+            if intent and intent["action"] in PRIORITY_ACTIONS and confidence >= self.matcher.threshold:
+                return HIGH_PRIORITY
+        return NORMAL_PRIORITY
+
+    def submit(self, user_input, on_action=None, on_say=None):
+        """
+        Starts interpreting a command, superseding the one in flight.
+
+        A newer command cancels the running one unless the running one has a
+        higher priority (a pending 'stop' is never dropped for a chat line).
+        Must be called from inside the running event loop.
+
+        Returns:
+            asyncio.Task: Resolves to the intent dict, or is cancelled if superseded.
+        """
+        priority = self.command_priority(user_input)
+        if self.current_task is not None and not self.current_task.done():
+            if priority >= self.current_priority:
+                print(f"AI: '{user_input}' supersedes the command in progress")
+                self.current_task.cancel()
+                self.cancelled_count += 1
+
+        task = asyncio.ensure_future(self.interpret_command_async(user_input, on_action, on_say))
+        self.current_task = task
+        self.current_priority = priority
+        return task
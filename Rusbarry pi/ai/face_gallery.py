@@ -0,0 +1,236 @@
+"""
+Vision Module - Known Face Gallery
+==================================
+
+This module stores the encodings of known people as one contiguous NumPy
+matrix with the names in a parallel array, so a detected face is compared
+against the whole gallery with a single vectorized distance computation.
+
+Encodings are cached in an `.npz` file keyed by image path, modification
+time and size. Photos without a detectable face are cached the same way (as
+"no face"), so they aren't encoded again on every startup. At startup only
+new or changed photos are encoded; removed photos are dropped from the cache.
+
+Matching goes through a nearest-neighbour index (`face_index.py`): exact
+brute force for small galleries, an approximate index for large ones.
+
+Layout of the faces directory:
+    data/faces/alice.jpg            -> "alice"
+    data/faces/bob/front.jpg        -> "bob" (several photos per person)
+"""
+
+import os
+
+from .face_index import make_index
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+ENCODING_SIZE = 128
+
+
+class FaceGallery:
+    """
+    Known face encodings as a matrix, with an incremental on-disk cache.
+    """
+    def __init__(self, faces_dir="data/faces", cache_path="data/face_encodings.npz", index="auto"):
+        """
+        Args:
+            faces_dir (str): Directory of reference photos.
+            cache_path (str): Encoding cache file (None to disable caching).
+            index (str): Search index: "brute", "ivf", "hnsw" or "auto" (by gallery size).
+        """
+        self.faces_dir = faces_dir
+        self.cache_path = cache_path
+        self.index_kind = index
+        self.encodings = np.empty((0, ENCODING_SIZE))
+        self.names = np.empty(0, dtype=str)
+        # Per row: stable id, source image and its (mtime, size) when it was encoded
+        self.ids = np.empty(0, dtype=np.int64)
+        self.paths = []
+        self.signatures = []
+        # Photos with no detectable face: path -> (mtime, size) when checked
+        self.no_face = {}
+        self.name_by_id = {}
+        self.index = make_index("brute")
+
+    def __len__(self):
+        return len(self.paths)
+
+    @staticmethod
+    def signature(path):
+        stat = os.stat(path)
+        return (stat.st_mtime, stat.st_size)
+
+    def name_for(self, path):
+        """Person name for a photo: its subdirectory, or its file name."""
+        parent = os.path.dirname(os.path.relpath(path, self.faces_dir))
+        if parent:
+            return parent.split(os.sep)[0]
+        return os.path.splitext(os.path.basename(path))[0]
+
+    def scan(self):
+        """Lists the reference photos currently in the faces directory."""
+        found = []
+        for root, _, files in os.walk(self.faces_dir):
+            for filename in sorted(files):
+                if filename.lower().endswith(IMAGE_EXTENSIONS):
+                    found.append(os.path.join(root, filename))
+        return sorted(found)
+
+    def load(self):
+        """
+        Loads the encoding cache.
+
+        Returns:
+            bool: True if a cache was loaded.
+        """
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return False
+        try:
+            with np.load(self.cache_path, allow_pickle=False) as data:
+                self.encodings = data["encodings"]
+                self.names = data["names"]
+                self.paths = data["paths"].tolist()
+                self.signatures = [tuple(sig) for sig in data["signatures"].tolist()]
+                self.ids = data["ids"] if "ids" in data else np.arange(len(self.paths), dtype=np.int64)
+                if "no_face_paths" in data:
+                    self.no_face = dict(zip(data["no_face_paths"].tolist(),
+                                            (tuple(sig) for sig in data["no_face_signatures"].tolist())))
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Vision: Ignoring unreadable face cache ({e})")
+            return False
+        self.build_index()
+        return True
+
+    def build_index(self):
+        """Rebuilds the search index from the current encodings."""
+        self.index = make_index(self.index_kind, len(self))
+        if len(self):
+            self.index.add(self.ids, self.encodings)
+        self.name_by_id = dict(zip(self.ids.tolist(), self.names.tolist()))
+
+    def save(self):
+        """Writes the encoding cache atomically."""
+        if not self.cache_path:
+            return
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.cache_path + ".tmp.npz"
+        np.savez(tmp_path, encodings=self.encodings, names=self.names, ids=self.ids,
+                 paths=np.array(self.paths, dtype=str),
+                 signatures=np.array(self.signatures, dtype=float).reshape(-1, 2),
+                 no_face_paths=np.array(list(self.no_face), dtype=str),
+                 no_face_signatures=np.array(list(self.no_face.values()), dtype=float).reshape(-1, 2))
+        os.replace(tmp_path, self.cache_path)
+
+    def _keep_rows(self, keep):
+        keep = np.asarray(keep, dtype=bool)
+        for id_ in self.ids[~keep].tolist():
+            self.index.remove(id_)
+            self.name_by_id.pop(id_, None)
+        self.ids = self.ids[keep]
+        self.encodings = self.encodings[keep]
+        self.names = self.names[keep]
+        self.paths = [p for p, k in zip(self.paths, keep) if k]
+        self.signatures = [s for s, k in zip(self.signatures, keep) if k]
+
+    def _append(self, path, name, encoding):
+        encoding = np.asarray(encoding, dtype=float)[None, :]
+        id_ = int(self.ids.max()) + 1 if len(self.ids) else 0
+        self.index.add([id_], encoding)
+        self.name_by_id[id_] = name
+        self.ids = np.append(self.ids, id_)
+        self.encodings = np.vstack([self.encodings, encoding])
+        self.names = np.append(self.names, name)
+        self.paths.append(path)
+        self.signatures.append(self.signature(path))
+
+    def sync(self, encode):
+        """
+        Brings the gallery up to date with the faces directory.
+
+        Args:
+            encode (callable): encode(path) -> 128-d encoding, or None if the
+                               photo contains no face.
+
+        Returns:
+            dict: Numbers of photos reused from the cache (with or without a
+                  face), encoded (new or changed) and removed from disk.
+        """
+        self.load()
+        on_disk = {path: self.signature(path) for path in self.scan()}
+        keep = [on_disk.get(path) == sig for path, sig in zip(self.paths, self.signatures)]
+        removed = len({path for path in self.paths if path not in on_disk})
+        self._keep_rows(keep)
+        no_face = {path: sig for path, sig in self.no_face.items() if on_disk.get(path) == sig}
+        stale = len(self.no_face) - len(no_face)
+        self.no_face = no_face
+
+        cached = set(self.paths) | set(self.no_face)
+        encoded = 0
+        for path, sig in on_disk.items():
+            if path in cached:
+                continue
+            encoding = encode(path)
+            encoded += 1
+            if encoding is None:
+                print(f"Vision: No face found in {os.path.basename(path)}, skipping")
+                self.no_face[path] = sig
+                continue
+            self._append(path, self.name_for(path), encoding)
+
+        if encoded or removed or stale:
+            # The best index type depends on the final gallery size
+            self.build_index()
+            self.save()
+        return {"cached": len(cached), "encoded": encoded, "removed": removed}
+
+    def add(self, path, encoding, name=None):
+        """
+        Adds (or replaces) one photo's encoding and updates the cache.
+
+        The photo should live in the faces directory, otherwise the next
+        `sync` drops it again.
+        """
+        self._keep_rows([p != path for p in self.paths])
+        self.no_face.pop(path, None)
+        self._append(path, name or self.name_for(path), encoding)
+        self.save()
+
+    def remove(self, name):
+        """
+        Forgets every encoding of a person and updates the cache.
+
+        Returns:
+            list: Paths of the photos whose encodings were removed. Unless
+                  they are deleted too, the next `sync` adds them again.
+        """
+        keep = self.names != name
+        removed = [p for p, k in zip(self.paths, keep) if not k]
+        if removed:
+            self._keep_rows(keep)
+            self.save()
+        return removed
+
+    def match(self, encodings, tolerance=0.6):
+        """
+        Finds the closest known person for each query encoding.
+
+        Args:
+            encodings (array-like): (k, 128) query encodings.
+            tolerance (float): Maximum distance for a match.
+
+        Returns:
+            list: A name (or "Unknown") per query.
+        """
+        queries = np.asarray(encodings, dtype=float).reshape(-1, ENCODING_SIZE)
+        if not len(self):
+            return ["Unknown"] * len(queries)
+        distances, ids = self.index.search(queries, k=1)
+        return [self.name_by_id[int(i[0])] if len(i) and i[0] >= 0 and d[0] <= tolerance else "Unknown"
+                for d, i in zip(distances, ids)]
@@ -0,0 +1,239 @@
+"""
+Vision Module - Face Encoding Index
+===================================
+
+Nearest-neighbour indexes over face encodings, behind one small interface:
+
+    add(ids, vectors)      insert encodings under integer ids
+    remove(id)             delete one encoding
+    search(queries, k)     (distances, ids) of the k nearest encodings
+
+- `BruteForceIndex`: exact scan with one matrix product; the reference
+  implementation and the best choice for small galleries.
+- `IVFIndex`: inverted file index in plain NumPy. Encodings are grouped
+  around k-means centroids and a query only scans the `nprobe` closest
+  groups. Retrains itself as the gallery grows.
+- `HNSWIndex`: graph index from the optional `hnswlib` package; fastest for
+  thousands of faces.
+
+`make_index("auto", size)` picks one based on the gallery size.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+# Below this many encodings an exact scan is as fast as any index
+BRUTE_FORCE_LIMIT = 1000
+
+
+def squared_distances(queries, vectors):
+    """(k, n) squared L2 distances, via |q|^2 + |v|^2 - 2 q.v (one BLAS call)."""
+    d = (queries ** 2).sum(axis=1)[:, None] + (vectors ** 2).sum(axis=1)[None, :] - 2 * queries @ vectors.T
+    return np.maximum(d, 0.0)
+
+
+def top_k(distances, ids, k):
+    """Picks the k smallest squared distances per row; returns (distances, ids)."""
+    k = min(k, distances.shape[1])
+    if k == 0:
+        return np.empty((len(distances), 0)), np.empty((len(distances), 0), dtype=np.int64)
+    nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    rows = np.arange(len(distances))[:, None]
+    order = np.argsort(distances[rows, nearest], axis=1)
+    nearest = nearest[rows, order]
+    return np.sqrt(distances[rows, nearest]), ids[nearest]
+
+
+class BruteForceIndex:
+    """
+    Exact nearest-neighbour search over all encodings.
+    """
+    def __init__(self, dim=128):
+        self.dim = dim
+        self.vectors = np.empty((0, dim))
+        self.ids = np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, ids, vectors):
+        vectors = np.asarray(vectors, dtype=float).reshape(-1, self.dim)
+        self.vectors = np.vstack([self.vectors, vectors])
+        self.ids = np.concatenate([self.ids, np.asarray(ids, dtype=np.int64)])
+
+    def remove(self, id_):
+        keep = self.ids != id_
+        self.vectors = self.vectors[keep]
+        self.ids = self.ids[keep]
+
+    def search(self, queries, k=1):
+        queries = np.asarray(queries, dtype=float).reshape(-1, self.dim)
+        return top_k(squared_distances(queries, self.vectors), self.ids, k)
+
+
+class IVFIndex:
+    """
+    Inverted file index: k-means clusters, probing only the closest few per query.
+    """
+    def __init__(self, dim=128, nprobe=4, min_train=256, iterations=10, seed=0):
+        """
+        Args:
+            dim (int): Encoding size.
+            nprobe (int): Clusters scanned per query (higher = better recall, slower).
+            min_train (int): Encodings needed before clustering; smaller
+                             galleries are searched exactly.
+            iterations (int): k-means iterations per (re)training.
+            seed (int): Random seed for the k-means initialization.
+        """
+        self.dim = dim
+        self.nprobe = nprobe
+        self.min_train = min_train
+        self.iterations = iterations
+        self.rng = np.random.default_rng(seed)
+        self.centroids = None
+        self.lists = [BruteForceIndex(dim)]
+        self.location = {}
+        self.trained_size = 0
+
+    def __len__(self):
+        return len(self.location)
+
+    def _all(self):
+        ids = np.concatenate([lst.ids for lst in self.lists])
+        vectors = np.vstack([lst.vectors for lst in self.lists])
+        return ids, vectors
+
+    def train(self):
+        """(Re)clusters all encodings into about sqrt(n) lists."""
+        ids, vectors = self._all()
+        nlist = max(1, int(np.sqrt(len(ids))))
+        centroids = vectors[self.rng.choice(len(vectors), nlist, replace=False)]
+        for _ in range(self.iterations):
+            assign = squared_distances(vectors, centroids).argmin(axis=1)
+            for c in range(nlist):
+                members = vectors[assign == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+        self.centroids = centroids
+        self.lists = [BruteForceIndex(self.dim) for _ in range(nlist)]
+        self.location = {}
+        self._insert(ids, vectors)
+        self.trained_size = len(ids)
+
+    def _insert(self, ids, vectors):
+        if self.centroids is None:
+            assign = np.zeros(len(ids), dtype=int)
+        else:
+            assign = squared_distances(vectors, self.centroids).argmin(axis=1)
+        for c in np.unique(assign):
+            members = assign == c
+            self.lists[c].add(ids[members], vectors[members])
+        self.location.update(zip(ids.tolist(), assign.tolist()))
+
+    def add(self, ids, vectors):
+        ids = np.asarray(ids, dtype=np.int64)
+        vectors = np.asarray(vectors, dtype=float).reshape(-1, self.dim)
+        self._insert(ids, vectors)
+        # Retrain once the gallery has doubled since the clusters were built
+        if len(self) >= max(self.min_train, 2 * self.trained_size):
+            self.train()
+
+    def remove(self, id_):
+        cluster = self.location.pop(int(id_), None)
+        if cluster is not None:
+            self.lists[cluster].remove(id_)
+
+    def search(self, queries, k=1):
+        queries = np.asarray(queries, dtype=float).reshape(-1, self.dim)
+        if self.centroids is None:
+            return self.lists[0].search(queries, k)
+        nprobe = min(self.nprobe, len(self.centroids))
+        probes = np.argsort(squared_distances(queries, self.centroids), axis=1)[:, :nprobe]
+        distances = np.full((len(queries), k), np.inf)
+        found = np.full((len(queries), k), -1, dtype=np.int64)
+        for row, query in enumerate(queries):
+            candidates = [self.lists[c] for c in probes[row] if len(self.lists[c])]
+            if not candidates:
+                continue
+            ids = np.concatenate([lst.ids for lst in candidates])
+            vectors = np.vstack([lst.vectors for lst in candidates])
+            d, i = top_k(squared_distances(query[None, :], vectors), ids, k)
+            distances[row, :d.shape[1]] = d[0]
+            found[row, :i.shape[1]] = i[0]
+        return distances, found
+
+
+class HNSWIndex:
+    """
+    Hierarchical navigable small world graph (requires `hnswlib`).
+    """
+    def __init__(self, dim=128, capacity=1024, ef=64, m=16):
+        self.dim = dim
+        self.capacity = capacity
+        self.index = hnswlib.Index(space="l2", dim=dim)
+        self.index.init_index(max_elements=capacity, ef_construction=200, M=m,
+                              allow_replace_deleted=True)
+        self.index.set_ef(ef)
+        self.ids = set()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, ids, vectors):
+        ids = np.asarray(ids, dtype=np.int64)
+        needed = self.index.get_current_count() + len(ids)
+        if needed > self.capacity:
+            self.capacity = max(needed, 2 * self.capacity)
+            self.index.resize_index(self.capacity)
+        self.index.add_items(np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim), ids,
+                             replace_deleted=True)
+        self.ids.update(ids.tolist())
+
+    def remove(self, id_):
+        if int(id_) in self.ids:
+            self.index.mark_deleted(int(id_))
+            self.ids.discard(int(id_))
+
+    def search(self, queries, k=1):
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        k = min(k, len(self))
+        if k == 0:
+            return np.empty((len(queries), 0)), np.empty((len(queries), 0), dtype=np.int64)
+        labels, distances = self.index.knn_query(queries, k=k)
+        # hnswlib reports squared L2 distances
+        return np.sqrt(distances), labels.astype(np.int64)
+
+
+def make_index(kind="auto", size=0, dim=128):
+    """
+    Creates an index.
+
+    Args:
+        kind (str): "brute", "ivf", "hnsw" or "auto" (brute force for small
+                    galleries, otherwise HNSW if hnswlib is installed, else IVF).
+        size (int): Expected number of encodings, used by "auto".
+        dim (int): Encoding size.
+
+    Returns:
+        An index object.
+    """
+    if kind == "auto":
+        if size < BRUTE_FORCE_LIMIT:
+            kind = "brute"
+        else:
+            kind = "hnsw" if hnswlib is not None else "ivf"
+    if kind == "hnsw":
+        if hnswlib is None:
+            print("Vision: hnswlib not installed, using the IVF index instead")
+            return IVFIndex(dim)
+        return HNSWIndex(dim, capacity=max(1024, 2 * size))
+    if kind == "ivf":
+        return IVFIndex(dim)
+    return BruteForceIndex(dim)
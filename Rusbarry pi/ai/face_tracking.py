@@ -0,0 +1,273 @@
+"""
+Vision Module - Detect-then-Track Faces
+=======================================
+
+Running face detection and recognition on every camera frame is far too slow
+on a Raspberry Pi. This module runs them only every N frames, or sooner when
+the scene changes or a track is lost. In between, each face is followed by a
+cheap template tracker on a downscaled grayscale frame, so names stay
+attached to faces while the per-frame cost stays low.
+
+Recognition (computing face encodings) only runs for new tracks, and retries
+unknown faces at a limited rate; detections that overlap an existing track
+keep that track's name.
+
+An outside scheduler (the activity gate) can take over the "when" through
+`update(frame, detect=...)`: it forces or suppresses detections, while the
+tracking step still runs on every frame it is given.
+
+Integration Note:
+    - `VisionSystem` feeds camera frames through `FaceTracker.update`.
+"""
+
+import itertools
+import time
+
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+except ImportError:
+    np = None
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+
+def downscale(frame, factor):
+    """Shrinks a frame by an integer factor (area averaging with OpenCV, subsampling without)."""
+    if factor == 1:
+        return frame
+    if cv2 is not None:
+        return cv2.resize(frame, (0, 0), fx=1 / factor, fy=1 / factor, interpolation=cv2.INTER_AREA)
+    return frame[::factor, ::factor]
+
+
+def to_gray(frame):
+    """Cheap grayscale: the green channel carries most of the luminance."""
+    return frame[..., 1] if frame.ndim == 3 else frame
+
+
+def iou(a, b):
+    """Intersection over union of two (top, right, bottom, left) boxes."""
+    top, bottom = max(a[0], b[0]), min(a[2], b[2])
+    left, right = max(a[3], b[3]), min(a[1], b[1])
+    inter = max(0, bottom - top) * max(0, right - left)
+    area = lambda box: (box[2] - box[0]) * (box[1] - box[3])
+    union = area(a) + area(b) - inter
+    return inter / union if union else 0.0
+
+
+class FaceTrack:
+    """
+    One face followed across frames by normalized template matching.
+    """
+    def __init__(self, track_id, box, gray, name=None):
+        self.id = track_id
+        self.name = name
+        self.score = 1.0
+        self.age = 0
+        self.retries = 0
+        self.created_at = time.monotonic()
+        self.set_box(box, gray)
+
+    def set_box(self, box, gray):
+        self.box = tuple(int(v) for v in box)
+        top, right, bottom, left = self.box
+        self.template = gray[top:bottom, left:right].astype(np.float32)
+
+    def update(self, gray, margin=0.5):
+        """
+        Finds the face again near its last position.
+
+        Args:
+            gray (numpy.ndarray): Downscaled grayscale frame.
+            margin (float): Search radius as a fraction of the face size.
+
+        Returns:
+            float: Match score in [-1, 1]; low values mean the track is lost.
+        """
+        top, right, bottom, left = self.box
+        h, w = self.template.shape
+        if h < 2 or w < 2:
+            self.score = 0.0
+            return self.score
+        pad = max(2, int(margin * max(h, w)))
+        y0, x0 = max(0, top - pad), max(0, left - pad)
+        window = gray[y0:min(gray.shape[0], bottom + pad), x0:min(gray.shape[1], right + pad)]
+        if window.shape[0] < h or window.shape[1] < w:
+            self.score = 0.0
+            return self.score
+
+        # Normalized cross-correlation at every offset inside the search window
+        patches = sliding_window_view(window.astype(np.float32), (h, w))
+        template = self.template - self.template.mean()
+        patches = patches - patches.mean(axis=(2, 3), keepdims=True)
+        numerator = np.einsum("ijkl,kl->ij", patches, template)
+        denominator = np.sqrt((patches ** 2).sum(axis=(2, 3)) * (template ** 2).sum()) + 1e-6
+        scores = numerator / denominator
+        dy, dx = np.unravel_index(np.argmax(scores), scores.shape)
+
+        self.score = float(scores[dy, dx])
+        self.box = (y0 + dy, x0 + dx + w, y0 + dy + h, x0 + dx)
+        self.age += 1
+        return self.score
+
+
+class FaceTracker:
+    """
+    Runs detection/recognition every N frames and tracking in between.
+    """
+    def __init__(self, recognizer, detect_every=10, scale=4, scene_threshold=12.0,
+                 min_score=0.5, retry_unknown_every=3):
+        """
+        Args:
+            recognizer: Object with `detect(rgb)` -> boxes and
+                        `recognize(rgb, boxes)` -> names (see `FaceRecognizer`).
+            detect_every (int): Frames between scheduled detections.
+            scale (int): Downscale factor applied before any processing.
+            scene_threshold (float): Mean absolute change (0-255) of a thumbnail
+                                     since the last detection that forces a new one.
+            min_score (float): Template match score below which a track is dropped.
+            retry_unknown_every (int): Detection rounds between recognition
+                                       attempts for faces that were not recognized.
+        """
+        self.recognizer = recognizer
+        self.detect_every = detect_every
+        self.scale = scale
+        self.scene_threshold = scene_threshold
+        self.min_score = min_score
+        self.retry_unknown_every = retry_unknown_every
+        self.tracks = []
+        self.ids = itertools.count(1)
+        self.frames_since_detect = None
+        self.scene_thumbnail = None
+        self.stats = {"frames": 0, "detections": 0, "scene_changes": 0, "recognitions": 0,
+                      "tracks_lost": 0, "frame_time": 0.0, "detect_time": 0.0,
+                      "recognize_time": 0.0, "max_frame_time": 0.0}
+
+    def _thumbnail(self, gray):
+        step_y, step_x = max(1, gray.shape[0] // 24), max(1, gray.shape[1] // 32)
+        return gray[::step_y, ::step_x].astype(np.int16)
+
+    def _needs_detection(self, gray):
+        if self.frames_since_detect is None or self.frames_since_detect >= self.detect_every:
+            return True
+        if any(track.score < self.min_score for track in self.tracks):
+            return True
+        thumbnail = self._thumbnail(gray)
+        if thumbnail.shape == self.scene_thumbnail.shape:
+            change = float(np.abs(thumbnail - self.scene_thumbnail).mean())
+            if change > self.scene_threshold:
+                self.stats["scene_changes"] += 1
+                return True
+        return False
+
+    def _detect(self, rgb, gray):
+        start = time.perf_counter()
+        boxes = self.recognizer.detect(rgb)
+        self.stats["detect_time"] += time.perf_counter() - start
+        self.stats["detections"] += 1
+
+        tracks, unnamed = [], []
+        for box in boxes:
+            match = max(self.tracks, key=lambda t: iou(t.box, box), default=None)
+            if match is not None and iou(match.box, box) > 0.3 and match not in tracks:
+                match.set_box(box, gray)
+                match.score = 1.0
+                tracks.append(match)
+            else:
+                tracks.append(FaceTrack(next(self.ids), box, gray))
+        self.stats["tracks_lost"] += len([t for t in self.tracks if t not in tracks])
+        self.tracks = tracks
+
+        # Only pay for encodings on new faces, and on unknown faces now and then
+        for track in tracks:
+            if track.name is None or (track.name == "Unknown" and
+                                      track.retries % self.retry_unknown_every == 0):
+                unnamed.append(track)
+            elif track.name == "Unknown":
+                track.retries += 1
+        if unnamed:
+            start = time.perf_counter()
+            names = self.recognizer.recognize(rgb, [t.box for t in unnamed])
+            self.stats["recognize_time"] += time.perf_counter() - start
+            self.stats["recognitions"] += len(unnamed)
+            for track, name in zip(unnamed, names):
+                track.name = name or "Unknown"
+                track.retries += 1
+
+        self.frames_since_detect = 0
+        self.scene_thumbnail = self._thumbnail(gray)
+
+    def update(self, frame, detect=None):
+        """
+        Processes one camera frame.
+
+        Args:
+            frame (numpy.ndarray): BGR image from the camera.
+            detect (bool, optional): True forces a detection, False only
+                                     tracks (lost tracks are dropped), None
+                                     lets the tracker decide.
+
+        Returns:
+            list: The current tracks (with `.name` and `.box` in full-frame
+                  coordinates via `full_box`).
+        """
+        start = time.perf_counter()
+        small = downscale(frame, self.scale)
+        gray = to_gray(small)
+
+        suppressed = detect is False
+        if detect is None:
+            detect = self._needs_detection(gray)
+        if detect:
+            rgb = np.ascontiguousarray(small[:, :, ::-1])
+            self._detect(rgb, gray)
+        elif self.frames_since_detect is not None:
+            for track in self.tracks:
+                track.update(gray)
+            self.frames_since_detect += 1
+            if suppressed:
+                # No detection is coming to re-find these: drop faces that left
+                kept = [t for t in self.tracks if t.score >= self.min_score]
+                self.stats["tracks_lost"] += len(self.tracks) - len(kept)
+                self.tracks = kept
+
+        elapsed = time.perf_counter() - start
+        self.stats["frames"] += 1
+        self.stats["frame_time"] += elapsed
+        self.stats["max_frame_time"] = max(self.stats["max_frame_time"], elapsed)
+        return self.tracks
+
+    def full_box(self, track):
+        """Returns a track's box scaled back to full-frame coordinates."""
+        return tuple(v * self.scale for v in track.box)
+
+    def names(self):
+        """Names of the recognized people currently in view."""
+        return [t.name for t in self.tracks if t.name and t.name != "Unknown"]
+
+    def report(self):
+        """
+        Returns per-frame cost figures.
+
+        Returns:
+            dict: Frames processed, frames/s the pipeline can sustain, share of
+                  frames that ran detection, and mean detection / recognition
+                  latency in milliseconds.
+        """
+        frames = self.stats["frames"]
+        detections = self.stats["detections"]
+        recognitions = self.stats["recognitions"]
+        return {
+            "frames": frames,
+            "fps": frames / self.stats["frame_time"] if self.stats["frame_time"] else 0.0,
+            "detect_ratio": detections / frames if frames else 0.0,
+            "scene_changes": self.stats["scene_changes"],
+            "tracks_lost": self.stats["tracks_lost"],
+            "detect_ms": 1000 * self.stats["detect_time"] / detections if detections else 0.0,
+            "recognize_ms": 1000 * self.stats["recognize_time"] / recognitions if recognitions else 0.0,
+            "max_frame_ms": 1000 * self.stats["max_frame_time"],
+        }
@@ -16,10 +16,15 @@ except ImportError:
     requests = None
 
 from .llm_handler import LocalLLMHandler
+from .intent_cache import IntentCache
+from .ollama_client import get_shared_client
 
 def check_ollama_status(api_url="http://localhost:11434"):
     """
     Checks if the local Ollama server is running.
+
+    The check goes through the shared pooled client, so the connection it
+    opens is reused by the first LLM query.
     
     Returns:
         bool: True if server is reachable, False otherwise.
@@ -28,16 +33,11 @@ def check_ollama_status(api_url="http://localhost:11434"):
         print("AI Init: Requests library not installed. Cannot check server status.")
         return False
 
-    try:
-        # Simple GET request to check availability (Ollama usually returns 404 on root or explicit message)
-        response = requests.get(api_url, timeout=2)
-        if response.status_code == 200:
-            return True
-    except requests.exceptions.RequestException:
-        pass
-    return False
+    return get_shared_client(api_url).ping()
 
-def initialize_ai_environment(model_name="llama3.2:3b"):
+def initialize_ai_environment(model_name="llama3.2:3b", warm_up=True, keep_alive="30m",
+                              connect_timeout=2.0, read_timeout=60.0,
+                              cache_path="data/intent_cache.json"):
     """
     Sets up the AI environment and initializes the LLM handler.
     
@@ -47,12 +47,21 @@ def initialize_ai_environment(model_name="llama3.2:3b"):
     
     Args:
         model_name (str): The name of the LLM model to use.
+        warm_up (bool): Load the model at startup so the first command is fast.
+        keep_alive (str|int): How long Ollama keeps the model resident between commands.
+        connect_timeout (float): Seconds to wait for a connection to Ollama.
+        read_timeout (float): Seconds to wait for Ollama to send data.
+        cache_path (str): File the intent cache is kept in across restarts (None for memory only).
         
     Returns:
         LocalLLMHandler: An initialized instance ready for processing commands.
         None: If initialization fails.
     """
     print("--- AI Environment Setup ---")
+
+    if requests is not None:
+        client = get_shared_client(keep_alive=keep_alive, connect_timeout=connect_timeout,
+                                   read_timeout=read_timeout)
     
     # Check Server
     if not check_ollama_status():
@@ -64,10 +73,15 @@ def initialize_ai_environment(model_name="llama3.2:3b"):
     
     # Initialize Handler
     try:
-        ai_handler = LocalLLMHandler(model_name=model_name)
-        # Optional: dry run query to ensure model is loaded
-        # print(" - Warming up model...")
-        # ai_handler.query_llm("hello") 
+        ai_handler = LocalLLMHandler(model_name=model_name, client=client,
+                                     cache=IntentCache(path=cache_path))
+        if warm_up:
+            print(" - Warming up model...")
+            elapsed = client.warm_up(model_name)
+            if elapsed is not None:
+                print(f" - Model loaded in {elapsed:.2f}s (keep_alive={keep_alive})")
+            if ai_handler.reuse_context:
+                ai_handler.prime_context()
         print(f" - Connection established to model: {model_name}")
         return ai_handler
         
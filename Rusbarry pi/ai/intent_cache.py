@@ -0,0 +1,189 @@
+"""
+AI Module - Intent Cache
+========================
+
+This module caches interpreted commands so repeated phrases ("come here",
+"play robot music") are answered instantly instead of going back to the LLM.
+
+Keys are normalized command text. Entries are evicted least-recently-used
+once the cache is full and expire after a time-to-live. The cache can be
+saved to a JSON file so a rebooted robot keeps its common commands. Saves
+are batched: a write is scheduled a few seconds after the first change and
+covers every change made meanwhile; `flush()` writes pending changes now.
+
+Conversational 'say' responses are never cached, since they should be fresh,
+and neither are actions the robot doesn't handle (LLM mistakes).
+
+Integration Note:
+    - Used by `LocalLLMHandler.interpret_command` in front of the LLM.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from .intent_matcher import normalize_command, ACTIONS
+
+# Actions whose responses must always come from the LLM
+UNCACHEABLE_ACTIONS = {"say"}
+
+
+class IntentCache:
+    """
+    Bounded LRU + TTL cache of command text -> intent dict.
+    """
+    def __init__(self, max_entries=256, ttl=7 * 24 * 3600, path=None, save_delay=5.0):
+        """
+        Initialize the cache and load saved entries.
+
+        Args:
+            max_entries (int): Maximum number of cached commands.
+            ttl (float): Seconds an entry stays valid.
+            path (str, optional): JSON file to persist the cache to. In-memory only if None.
+            save_delay (float): Seconds between a change and the background
+                                save that writes it (and any later changes).
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.save_delay = save_delay
+        self.entries = OrderedDict()  # key -> (intent, stored_at)
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.save_timer = None
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+
+        if self.path:
+            self.load()
+
+    def get(self, text):
+        """
+        Looks up a command.
+
+        Returns:
+            dict: A copy of the cached intent, or None on a miss.
+        """
+        key = normalize_command(text)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+
+            intent, stored_at = entry
+            if time.time() - stored_at > self.ttl:
+                del self.entries[key]
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return dict(intent)
+
+    def put(self, text, intent):
+        """
+        Stores an interpreted command, unless it is a conversational response
+        or an action the robot doesn't handle.
+
+        Returns:
+            bool: True if the intent was cached.
+        """
+        if not isinstance(intent, dict):
+            return False
+        action = intent.get("action")
+        if action not in ACTIONS or action in UNCACHEABLE_ACTIONS:
+            return False
+
+        key = normalize_command(text)
+        if not key:
+            return False
+
+        with self.lock:
+            self.entries[key] = (dict(intent), time.time())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.stats["evictions"] += 1
+            if self.path:
+                self._schedule_save()
+        return True
+
+    def clear(self):
+        """Removes all entries."""
+        with self.lock:
+            self.entries.clear()
+            self.dirty = True
+        if self.path:
+            self.flush()
+
+    def _schedule_save(self):
+        """Marks the cache changed and starts a delayed save if none is pending. Caller holds the lock."""
+        self.dirty = True
+        if self.save_timer is None:
+            self.save_timer = threading.Timer(self.save_delay, self.flush)
+            self.save_timer.daemon = True
+            self.save_timer.start()
+
+    def flush(self):
+        """Writes pending changes to `path` now (call before shutting down)."""
+        with self.lock:
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+                self.save_timer = None
+            dirty = self.dirty
+        if dirty and self.path:
+            self.save()
+
+    def load(self):
+        """Loads unexpired entries from `path`, oldest first so LRU order is kept."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"AI: Ignoring unreadable intent cache {self.path}: {e}")
+            return
+        if not self.is_valid(saved):
+            print(f"AI: Ignoring malformed intent cache {self.path}")
+            return
+
+        now = time.time()
+        with self.lock:
+            for key, intent, stored_at in saved[-self.max_entries:]:
+                if now - stored_at <= self.ttl:
+                    self.entries[key] = (intent, stored_at)
+        print(f"AI: Loaded {len(self.entries)} cached intents from {self.path}")
+
+    @staticmethod
+    def is_valid(saved):
+        """True if `saved` is a list of [key, intent, stored_at] entries."""
+        return isinstance(saved, list) and all(
+            isinstance(entry, list) and len(entry) == 3 and isinstance(entry[0], str)
+            and isinstance(entry[1], dict) and isinstance(entry[2], (int, float))
+            for entry in saved)
+
+    def save(self):
+        """Writes the cache to `path` atomically."""
+        with self.lock:
+            saved = [[key, intent, stored_at] for key, (intent, stored_at) in self.entries.items()]
+            self.dirty = False
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(saved, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"AI: Could not save intent cache: {e}")
+
+    def hit_rate(self):
+        """Fraction of lookups answered from the cache."""
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
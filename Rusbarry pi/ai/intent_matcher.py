@@ -0,0 +1,147 @@
+"""
+AI Module - Fast Intent Matcher
+===============================
+
+This module resolves the most common robot commands ("stop", "go forward",
+"turn left", "play <song>") locally with precompiled patterns, without a
+round trip to the LLM.
+
+It produces the same `{"action", "value"}` dictionaries as
+`LocalLLMHandler.interpret_command`, together with a confidence score. Commands
+that match only loosely (extra words, negations) fall back to the LLM.
+
+Integration Note:
+    - Used by `LocalLLMHandler` as a fast path in front of the LLM.
+"""
+
+import re
+import time
+
+# Every action the robot handles (the LLM is told to pick one of these)
+ACTIONS = ("move_forward", "move_backward", "turn_left", "turn_right", "stop", "say",
+           "play_music", "open_youtube", "come_here")
+
+# Words that carry no meaning for the command when they surround it
+# ("hey robot, can you stop please")
+FILLER_WORDS = {
+    "hey", "hi", "hello", "ok", "okay", "robot", "robo", "please", "can", "could",
+    "would", "will", "you", "kindly", "now", "just", "pls",
+}
+# Only these are dropped from the end, so titles like "Shape of You" stay whole
+TRAILING_FILLER_WORDS = {"please", "pls", "now", "robot", "robo", "thanks"}
+
+NEGATION_WORDS = {"don't", "dont", "not", "never", "no"}
+
+# Values that just mean "some music" and should use the default playlist
+GENERIC_MUSIC = {"music", "some music", "a song", "something", "songs", "a tune"}
+
+# Ordered rules: (action, pattern). A named group 'value' is used as the slot.
+INTENT_RULES = [
+    ("stop", r"(?:emergency )?stop(?: moving| now| there)?|halt|freeze|stay|hold on|wait"),
+    ("open_youtube", r"(?:open|search|launch) youtube(?: for)?(?: (?P<value>.+))?"),
+    ("play_music", r"play(?: me)?(?: some)? (?P<value>.+?)(?: on youtube)?|play music"),
+    ("move_forward", r"(?:(?:go|move|drive|walk|head|roll) )?(?:forward|forwards|ahead|straight(?: ahead)?)"),
+    ("move_backward", r"(?:(?:go|move|drive|walk|roll) )?(?:back|backward|backwards)|reverse|back up"),
+    ("turn_left", r"(?:(?:turn|go|rotate|spin|steer) )?(?:to the )?left"),
+    ("turn_right", r"(?:(?:turn|go|rotate|spin|steer) )?(?:to the )?right"),
+    ("come_here", r"come(?: over)? (?:here|to me)|come over|over here"),
+]
+
+
+def normalize_command(text):
+    """
+    Normalizes a spoken command for matching.
+
+    Lowercases, drops punctuation and trims filler words from both ends
+    ("Hey robot, stop please!" -> "stop"). Words in the middle are kept so that
+    song titles and other values survive untouched.
+    """
+    words = re.sub(r"[^\w\s']", " ", text.lower()).split()
+    while words and words[0] in FILLER_WORDS:
+        words.pop(0)
+    while words and words[-1] in TRAILING_FILLER_WORDS:
+        words.pop()
+    return " ".join(words)
+
+
+class IntentMatcher:
+    """
+    Deterministic matcher for common commands, used before asking the LLM.
+    """
+    def __init__(self, threshold=0.75):
+        """
+        Compile the intent patterns.
+
+        Args:
+            threshold (float): Minimum confidence (0-1) to accept a local match.
+        """
+        self.threshold = threshold
+        self.rules = [
+            (action, re.compile(rf"(?:{pattern})"), re.compile(rf"\b(?:{pattern})\b"))
+            for action, pattern in INTENT_RULES
+        ]
+        self.stats = {"hits": 0, "misses": 0, "match_time": 0.0, "time_saved": 0.0}
+
+    def match(self, text):
+        """
+        Finds the best matching intent for the text.
+
+        A match covering the whole normalized command scores 1.0. A match
+        inside a longer sentence scores by how much of the sentence it covers,
+        and negations halve the score so "don't stop" goes to the LLM.
+
+        Args:
+            text (str): The raw command text.
+
+        Returns:
+            tuple: (intent dict or None, confidence float).
+        """
+        command = normalize_command(text)
+        if not command:
+            return None, 0.0
+
+        best, best_score = None, 0.0
+        for action, full_re, search_re in self.rules:
+            match = full_re.fullmatch(command)
+            score = 1.0
+            if match is None:
+                match = search_re.search(command)
+                if match is None:
+                    continue
+                score = (match.end() - match.start()) / len(command)
+            if score > best_score:
+                best, best_score = self._to_intent(action, match), score
+            if score == 1.0:
+                break
+
+        words = set(command.split())
+        if best is not None and words & NEGATION_WORDS:
+            best_score *= 0.5
+        return best, best_score
+
+    def _to_intent(self, action, match):
+        value = match.groupdict().get("value")
+        if value and action == "play_music" and value in GENERIC_MUSIC:
+            value = None
+        return {"action": action, "value": value}
+
+    def resolve(self, text):
+        """
+        Returns the intent if it is confident enough, otherwise None.
+
+        Updates hit/miss counters and the time spent matching.
+        """
+        start = time.perf_counter()
+        intent, confidence = self.match(text)
+        self.stats["match_time"] += time.perf_counter() - start
+
+        if intent is not None and confidence >= self.threshold:
+            self.stats["hits"] += 1
+            return intent
+        self.stats["misses"] += 1
+        return None
+
+    def hit_rate(self):
+        """Fraction of commands resolved without the LLM."""
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
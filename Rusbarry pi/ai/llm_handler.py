@@ -9,32 +9,167 @@ It handles:
 1.  Initialization of the connection to the LLM service.
 2.  Processing user inputs (natural language) into actionable robot commands.
 3.  Generating conversational responses.
+4.  Streaming responses so actions can start before the full reply arrives.
 
 Integration Note:
     - Inputs come from the `interface` module (voice/text).
     - Structured commands (actions) are sent to the `control` module.
 """
 
-try:
-    import requests
-except ImportError:
-    requests = None
 import json
+import re
+import time
+
+from .ollama_client import get_shared_client, RequestError
+from .intent_matcher import IntentMatcher, ACTIONS
+from .intent_cache import IntentCache
+
+# Fixed instructions sent ahead of every command. With context reuse these are
+# evaluated once and only the user's words are processed per command.
+SYSTEM_PROMPT = (
+    "You are a robot assistant. Translate the following user command into a JSON response. "
+    f"Available actions: {', '.join(ACTIONS)}. "
+    "Format: {\"action\": \"<action_name>\", \"value\": <optional_value>}. "
+    "If it's just chat, use action 'say'. "
+)
+
+# The system prompt is cached as one complete exchange: the instructions as
+# the system message and a worked example with its full answer, so later
+# commands continue a consistent conversation
+PRIME_EXAMPLE = "User Command: stop"
+
+# After a failed priming attempt the full prompt is sent until this many
+# seconds have passed, instead of retrying on every command
+PRIME_RETRY_SECONDS = 30.0
+
+
+class StreamingIntentParser:
+    """
+    Incrementally extracts the intent JSON from a streamed LLM response.
+
+    The LLM is asked for `{"action": "...", "value": ...}`. Instead of waiting
+    for the closing brace, this parser reports the action as soon as its string
+    is complete and hands out the `value` string piece by piece as it arrives.
+    """
+    _ACTION_RE = re.compile(r'"action"\s*:\s*"((?:[^"\\]|\\.)*)"')
+    _VALUE_RE = re.compile(r'"value"\s*:\s*"')
+    _ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', '"': '"', '\\': '\\', '/': '/'}
+
+    def __init__(self):
+        self.buffer = ""
+        self.action = None
+        self.value_text = ""
+        self.value_done = False
+        self._value_pos = None
+
+    def feed(self, chunk):
+        """
+        Adds a chunk of streamed text.
+
+        Args:
+            chunk (str): The next piece of the LLM response.
+
+        Returns:
+            tuple: (action, value_text) where `action` is the action name if it
+                   completed in this chunk (else None) and `value_text` is the
+                   newly decoded part of a string `value` (may be empty).
+        """
+        self.buffer += chunk
+        new_action = None
+
+        if self.action is None:
+            match = self._ACTION_RE.search(self.buffer)
+            if match:
+                self.action = match.group(1)
+                new_action = self.action
+
+        if self._value_pos is None:
+            match = self._VALUE_RE.search(self.buffer)
+            if match:
+                self._value_pos = match.end()
+
+        new_text = ""
+        if self._value_pos is not None and not self.value_done:
+            new_text = self._scan_value()
+            self.value_text += new_text
+
+        return new_action, new_text
+
+    def _scan_value(self):
+        """Decodes the string value from the last scanned position up to the closing quote."""
+        out = []
+        pos = self._value_pos
+        buf = self.buffer
+        while pos < len(buf):
+            ch = buf[pos]
+            if ch == '"':
+                self.value_done = True
+                pos += 1
+                break
+            if ch == '\\':
+                # Wait for the rest of the escape sequence
+                if pos + 1 >= len(buf):
+                    break
+                esc = buf[pos + 1]
+                if esc == 'u':
+                    if pos + 6 > len(buf):
+                        break
+                    try:
+                        out.append(chr(int(buf[pos + 2:pos + 6], 16)))
+                    except ValueError:
+                        pass
+                    pos += 6
+                    continue
+                out.append(self._ESCAPES.get(esc, esc))
+                pos += 2
+                continue
+            out.append(ch)
+            pos += 1
+        self._value_pos = pos
+        return "".join(out)
+
 
 class LocalLLMHandler:
     """
     Interface for interacting with a locally running LLM (e.g., via Ollama API).
     """
-    def __init__(self, model_name="llama3", api_url="http://localhost:11434/api/generate"):
+    def __init__(self, model_name="llama3", api_url="http://localhost:11434/api/generate", client=None,
+                 reuse_context=True, use_fast_path=True, cache=None):
         """
         Initialize the LLM handler.
         
         Args:
             model_name (str): The name of the model to use (default: "llama3").
             api_url (str): The endpoint for the local LLM API.
+            client (OllamaClient, optional): Client to send requests through.
+                                             Defaults to the shared pooled client.
+            reuse_context (bool): Evaluate the system prompt once and send only
+                                  the user's words with the cached context.
+            use_fast_path (bool): Resolve common commands locally without the LLM.
+            cache (IntentCache, optional): Cache of interpreted commands. Defaults
+                                           to an in-memory cache; pass one with a
+                                           path to keep it across restarts.
         """
         self.model_name = model_name
         self.api_url = api_url
+        self.client = client or get_shared_client(api_url.split("/api/")[0])
+        self.reuse_context = reuse_context
+        # Ollama token context of the evaluated system prompt
+        self.prefix_context = None
+        self.prime_retry_at = 0.0
+        # Ollama timing counters of the last query (prompt_eval_count, ...)
+        self.last_stats = {}
+        self.matcher = IntentMatcher() if use_fast_path else None
+        self.cache = cache if cache is not None else IntentCache()
+        # Moving average of full LLM round trips, used to estimate time saved
+        self.avg_llm_latency = None
+        # Latency metrics of the last streamed command (seconds)
+        self.metrics = {
+            "time_to_first_token": None,
+            "time_to_first_action": None,
+            "total_time": None,
+            "streamed_commands": 0,
+        }
         print(f"AI Module Initialized: Connected to {api_url} using model '{model_name}'")
 
     def query_llm(self, prompt, context=None):
@@ -51,49 +186,133 @@ class LocalLLMHandler:
         # Payload structure for Ollama API
         payload = {
             "model": self.model_name,
-            "prompt": prompt,
-            "stream": False 
+            "prompt": prompt
         }
         
-        # If context is provided, you might append it to prompt or use API specifics
-        # For simplicity, we strictly send the prompt here.
+        # Ollama continues from the token context returned by an earlier call
+        if context:
+            payload["context"] = context
         
         try:
             print(f"AI: Querying LLM with '{prompt}'...")
-            response = requests.post(self.api_url, json=payload)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self.client.generate(payload)
+            self._record_stats(data)
             return data.get("response", "")
             
-        except requests.exceptions.RequestException as e:
+        except RequestError as e:
             print(f"AI Error: Failed to connect to LLM. Is Ollama running? Error: {e}")
             return "Error: I cannot reach my brain right now."
 
-    def interpret_command(self, user_input):
+    def query_llm_stream(self, prompt, context=None):
         """
-        Process a user command and determine the intent for the robot.
-        
-        This function uses prompt engineering to force the LLM to output 
-        structured commands that the 'control' module can understand.
-        
+        Sends a prompt to the LLM and yields the response as it is generated.
+
+        Ollama streams newline-delimited JSON objects, each carrying a piece of
+        the response in its 'response' field until 'done' is true.
+
         Args:
-            user_input (str): Natural language input (e.g., "Go forward a bit").
-            
+            prompt (str): The input text to process.
+            context (list, optional): Conversation history/context for stateful interactions.
+
+        Yields:
+            str: Successive chunks of the generated response.
+        """
+        payload = {
+            "model": self.model_name,
+            "prompt": prompt
+        }
+        if context:
+            payload["context"] = context
+
+        try:
+            print(f"AI: Streaming LLM query '{prompt}'...")
+            for data in self.client.generate_stream(payload):
+                if data.get("done"):
+                    self._record_stats(data)
+                yield data.get("response", "")
+
+        except RequestError as e:
+            print(f"AI Error: Failed to connect to LLM. Is Ollama running? Error: {e}")
+            yield "Error: I cannot reach my brain right now."
+
+    def _record_stats(self, data):
+        """Keeps Ollama's token counts and durations (converted to seconds) for the last query."""
+        self.last_stats = {
+            "prompt_eval_count": data.get("prompt_eval_count", 0),
+            "prompt_eval_duration": data.get("prompt_eval_duration", 0) / 1e9,
+            "eval_count": data.get("eval_count", 0),
+            "total_duration": data.get("total_duration", 0) / 1e9,
+        }
+
+    def prime_context(self):
+        """
+        Evaluates the system prompt once and keeps the token context Ollama returns.
+
         Returns:
-            dict: A dictionary containing 'action' and 'parameter', or 'response'.
-                  Example: {'action': 'move_forward', 'speed': 0.8}
+            list: The context token array, or None if the LLM could not be reached.
+        """
+        try:
+            data = self.client.generate(self.prime_payload())
+        except RequestError as e:
+            print(f"AI Error: Could not prime prompt context: {e}")
+            data = {}
+        return self._store_prime(data)
+
+    def prime_payload(self):
+        """Request that evaluates the instructions and one example exchange."""
+        return {
+            "model": self.model_name,
+            "system": SYSTEM_PROMPT.strip(),
+            "prompt": PRIME_EXAMPLE,
+            # A short, complete JSON answer rather than a cut-off turn
+            "format": "json",
+            "options": {"num_predict": 32},
+        }
+
+    def _store_prime(self, data):
+        self.prefix_context = data.get("context") or None
+        if self.prefix_context:
+            print(f"AI: System prompt cached ({len(self.prefix_context)} context tokens)")
+        else:
+            self.prime_retry_at = time.monotonic() + PRIME_RETRY_SECONDS
+        return self.prefix_context
+
+    def should_prime(self):
+        """True if the context isn't cached and no recent attempt failed."""
+        return self.reuse_context and self.prefix_context is None and time.monotonic() >= self.prime_retry_at
+
+    def build_prompt(self, user_input, prime=True):
+        """
+        Builds the prompt for intent extraction.
+
+        Args:
+            user_input (str): The user's command.
+            prime (bool): Prime the context first if it isn't cached yet. This
+                          is a blocking HTTP call; async callers prime with
+                          `prime_context_async` and pass False.
+
+        Returns:
+            tuple: (prompt, context). With context reuse only the user command is
+                   sent along with the cached system prompt context; otherwise
+                   the full instructions are included and context is None.
+        """
+        if self.reuse_context:
+            if prime and self.should_prime():
+                self.prime_context()
+            if self.prefix_context:
+                return f"User Command: {user_input}", self.prefix_context
+        return SYSTEM_PROMPT + f"User Command: {user_input}", None
+
+    def parse_intent(self, llm_response):
+        """
+        Extracts the intent dictionary from a raw LLM response.
+
+        Args:
+            llm_response (str): The full text generated by the LLM.
+
+        Returns:
+            dict: The parsed intent, or a 'say' intent wrapping the raw text.
         """
-        system_prompt = (
-            "You are a robot assistant. Translate the following user command into a JSON response. "
-            "Available actions: move_forward, move_backward, turn_left, turn_right, stop, say, play_music, open_youtube, come_here. "
-            "Format: {\"action\": \"<action_name>\", \"value\": <optional_value>}. "
-            "If it's just chat, use action 'say'. "
-            f"User Command: {user_input}"
-        )
-        
-        llm_response = self.query_llm(system_prompt)
-        
         # Simple parsing logic to extract JSON from potential conversational wrapper
         # In a real scenario, you'd use a more robust parser or structured output mode.
         try:
@@ -109,6 +328,115 @@ class LocalLLMHandler:
         except json.JSONDecodeError:
             return {"action": "say", "value": llm_response}
 
+    def interpret_command(self, user_input):
+        """
+        Process a user command and determine the intent for the robot.
+        
+        This function uses prompt engineering to force the LLM to output 
+        structured commands that the 'control' module can understand.
+        
+        Args:
+            user_input (str): Natural language input (e.g., "Go forward a bit").
+            
+        Returns:
+            dict: A dictionary containing 'action' and 'parameter', or 'response'.
+                  Example: {'action': 'move_forward', 'speed': 0.8}
+        """
+        intent = self.fast_path(user_input)
+        if intent is not None:
+            return intent
+
+        start = time.monotonic()
+        prompt, context = self.build_prompt(user_input)
+        llm_response = self.query_llm(prompt, context=context)
+        self._record_llm_latency(time.monotonic() - start)
+        intent = self.parse_intent(llm_response)
+        self.cache.put(user_input, intent)
+        return intent
+
+    def fast_path(self, user_input):
+        """
+        Resolves a command without asking the LLM.
+
+        Tries the local intent matcher first, then the cache of earlier
+        LLM answers.
+
+        Returns:
+            dict: The intent if it could be resolved locally, otherwise None.
+        """
+        if self.matcher is not None:
+            intent = self.matcher.resolve(user_input)
+            if intent is not None:
+                if self.avg_llm_latency is not None:
+                    self.matcher.stats["time_saved"] += self.avg_llm_latency
+                print(f"AI: Fast path resolved '{user_input}' -> {intent}")
+                return intent
+
+        intent = self.cache.get(user_input)
+        if intent is not None:
+            print(f"AI: Cache hit for '{user_input}' -> {intent}")
+        return intent
+
+    def _record_llm_latency(self, elapsed):
+        if self.avg_llm_latency is None:
+            self.avg_llm_latency = elapsed
+        else:
+            self.avg_llm_latency = 0.8 * self.avg_llm_latency + 0.2 * elapsed
+
+    def interpret_command_stream(self, user_input, on_action=None, on_say=None):
+        """
+        Streaming variant of `interpret_command`.
+
+        The action is reported through `on_action` as soon as the "action"
+        field is complete, so the robot can start moving while the LLM is
+        still generating. Text of a 'say' value is passed to `on_say` as it
+        arrives.
+
+        Args:
+            user_input (str): Natural language input (e.g., "Turn left").
+            on_action (callable, optional): Called once with the action name.
+            on_say (callable, optional): Called with each new piece of a 'say' value.
+
+        Returns:
+            dict: The final intent, same shape as `interpret_command`.
+        """
+        intent = self.fast_path(user_input)
+        if intent is not None:
+            if on_action:
+                on_action(intent["action"])
+            return intent
+
+        parser = StreamingIntentParser()
+        pending_say = ""
+        start = time.monotonic()
+        self.metrics["time_to_first_token"] = None
+        self.metrics["time_to_first_action"] = None
+
+        prompt, context = self.build_prompt(user_input)
+        for chunk in self.query_llm_stream(prompt, context=context):
+            if chunk and self.metrics["time_to_first_token"] is None:
+                self.metrics["time_to_first_token"] = time.monotonic() - start
+
+            action, text = parser.feed(chunk)
+            if action is not None:
+                self.metrics["time_to_first_action"] = time.monotonic() - start
+                print(f"AI: Action '{action}' ready after {self.metrics['time_to_first_action']:.2f}s")
+                if on_action:
+                    on_action(action)
+
+            # The value may start streaming before we know it belongs to 'say'
+            pending_say += text
+            if pending_say and parser.action == "say" and on_say:
+                on_say(pending_say)
+                pending_say = ""
+
+        self.metrics["total_time"] = time.monotonic() - start
+        self.metrics["streamed_commands"] += 1
+        self._record_llm_latency(self.metrics["total_time"])
+        intent = self.parse_intent(parser.buffer)
+        self.cache.put(user_input, intent)
+        return intent
+
 if __name__ == "__main__":
     # Test the AI module independently
     ai = LocalLLMHandler(model_name="llama3.2:3b")
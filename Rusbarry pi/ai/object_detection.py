@@ -0,0 +1,266 @@
+"""
+Vision Module - Object Detection
+================================
+
+This module finds obstacles ("is there a box, person or chair in the way")
+in camera frames with a small quantized SSD model run on the CPU through
+OpenCV's DNN module, and places them on the floor in front of the robot.
+
+Models:
+    Any SSD-style network OpenCV can load whose output is the DetectionOutput
+    layout [.., 7] = (image, class, score, x1, y1, x2, y2), e.g. an int8
+    quantized MobileNet-SSD (COCO) exported to ONNX:
+        models/ssd_mobilenet_int8.onnx
+        models/coco_labels.txt        (one class name per line, id = line number)
+
+Frames are cropped to one or more regions of interest (by default the lower
+part of the image, where the floor in front of the robot is) and all crops
+of a call are run as one batch.
+
+Integration Note:
+    - `VisionSystem.scan_for_obstacles` runs the detector on the same frame
+      buffer as face recognition and returns obstacles with floor positions;
+      `Navigator.add_obstacles` marks the static ones on the map, while
+      people and pets (`MOVING_CLASSES`) only trigger obstacle alerts.
+"""
+
+import math
+import os
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+# Classes that block the robot's way (COCO names; a custom model can add "box")
+OBSTACLE_CLASSES = {"person", "chair", "couch", "bench", "bed", "dining table", "potted plant",
+                    "suitcase", "backpack", "dog", "cat", "bicycle", "box"}
+
+# Obstacles that move on their own. Marking them on the map would leave
+# permanent ghosts where they once stood, so they only feed the safety path.
+MOVING_CLASSES = {"person", "dog", "cat"}
+
+
+def load_labels(path):
+    """Reads one class name per line (line number = class id)."""
+    with open(path) as f:
+        return [line.strip() for line in f]
+
+
+def crop_box(shape, roi):
+    """
+    Converts a fractional region of interest into pixel bounds.
+
+    Args:
+        shape (tuple): Frame shape (height, width, ...).
+        roi (tuple): (top, right, bottom, left) as fractions of the frame.
+
+    Returns:
+        tuple: (top, right, bottom, left) in pixels.
+    """
+    height, width = shape[:2]
+    top, right, bottom, left = roi
+    return (int(top * height), int(right * width), int(bottom * height), int(left * width))
+
+
+def resize(image, size):
+    """Resizes to (size, size) (OpenCV area interpolation, nearest neighbour without)."""
+    if cv2 is not None:
+        return cv2.resize(image, (size, size), interpolation=cv2.INTER_AREA)
+    rows = (np.arange(size) * image.shape[0] / size).astype(int)
+    cols = (np.arange(size) * image.shape[1] / size).astype(int)
+    return image[rows][:, cols]
+
+
+class ObjectDetector:
+    """
+    Batched SSD object detection on regions of interest.
+    """
+    def __init__(self, model_path="models/ssd_mobilenet_int8.onnx", labels_path="models/coco_labels.txt",
+                 input_size=300, score_threshold=0.5, classes=OBSTACLE_CLASSES,
+                 rois=((0.3, 1.0, 1.0, 0.0),), batch_size=4, mean=127.5, scale=1 / 127.5,
+                 swap_rb=True, threads=None, net=None, labels=None):
+        """
+        Args:
+            model_path (str): Network file for `cv2.dnn.readNet`.
+            labels_path (str): Class names, one per line.
+            input_size (int): Square network input size in pixels.
+            score_threshold (float): Minimum detection confidence.
+            classes (set, optional): Class names to report; None reports all.
+            rois (tuple): Regions of interest, (top, right, bottom, left) fractions.
+            batch_size (int): Most crops run through the network at once.
+            mean (float): Subtracted from pixel values before scaling.
+            scale (float): Pixel scale factor.
+            swap_rb (bool): Convert OpenCV's BGR frames to RGB.
+            threads (int, optional): OpenCV worker threads (default: all cores).
+            net (optional): An already loaded network (anything with
+                            setInput/forward).
+            labels (list, optional): Class names, instead of `labels_path`.
+        """
+        self.input_size = input_size
+        self.score_threshold = score_threshold
+        self.classes = classes
+        self.rois = tuple(rois)
+        self.batch_size = batch_size
+        self.mean = mean
+        self.scale = scale
+        self.swap_rb = swap_rb
+        self.net = net
+        self.labels = labels
+        self.stats = {"frames": 0, "crops": 0, "batches": 0, "detections": 0, "total_time": 0.0}
+
+        if self.labels is None and labels_path and os.path.exists(labels_path):
+            self.labels = load_labels(labels_path)
+        if self.net is None:
+            if cv2 is None:
+                print("WARNING: 'opencv' not found. Object detection disabled.")
+            elif not os.path.exists(model_path):
+                print(f"Vision: No object detection model at {model_path}")
+            else:
+                if threads:
+                    cv2.setNumThreads(threads)
+                self.net = cv2.dnn.readNet(model_path)
+                self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+                self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+                print(f"Vision: Loaded object detection model {model_path}")
+
+    @property
+    def available(self):
+        return self.net is not None
+
+    def label(self, class_id):
+        if self.labels and 0 <= class_id < len(self.labels):
+            return self.labels[class_id]
+        return str(class_id)
+
+    def preprocess(self, crops):
+        """Stacks crops into an NCHW float32 blob."""
+        batch = np.stack([resize(crop, self.input_size) for crop in crops]).astype(np.float32)
+        if self.swap_rb:
+            batch = batch[..., ::-1]
+        batch = (batch - self.mean) * self.scale
+        return np.ascontiguousarray(batch.transpose(0, 3, 1, 2))
+
+    def detect(self, frame, rois=None):
+        """
+        Finds objects in one frame.
+
+        Returns:
+            list: Detections (see `detect_batch`).
+        """
+        return self.detect_batch([frame], rois)[0]
+
+    def detect_batch(self, frames, rois=None):
+        """
+        Finds objects in several frames, running all crops in batches.
+
+        Args:
+            frames (list): Frames (H x W x 3, BGR). Read in place, not copied.
+            rois (tuple, optional): Regions of interest instead of `self.rois`.
+
+        Returns:
+            list: Per frame, a list of dicts with "label", "score" and "box"
+                  as (top, right, bottom, left) pixels in the full frame.
+        """
+        results = [[] for _ in frames]
+        if not self.available or not frames:
+            return results
+        start = time.monotonic()
+        rois = self.rois if rois is None else rois
+
+        crops = []  # (frame index, pixel bounds, view)
+        for i, frame in enumerate(frames):
+            for roi in rois:
+                top, right, bottom, left = crop_box(frame.shape, roi)
+                crops.append((i, (top, right, bottom, left), frame[top:bottom, left:right]))
+
+        for first in range(0, len(crops), self.batch_size):
+            chunk = crops[first:first + self.batch_size]
+            self.net.setInput(self.preprocess([view for _, _, view in chunk]))
+            output = np.asarray(self.net.forward()).reshape(-1, 7)
+            self.stats["batches"] += 1
+            for image_id, class_id, score, x1, y1, x2, y2 in output:
+                if score < self.score_threshold or not 0 <= image_id < len(chunk):
+                    continue
+                label = self.label(int(class_id))
+                if self.classes is not None and label not in self.classes:
+                    continue
+                frame_index, (top, right, bottom, left), _ = chunk[int(image_id)]
+                width, height = right - left, bottom - top
+                box = (top + int(max(0.0, y1) * height), left + int(min(1.0, x2) * width),
+                       top + int(min(1.0, y2) * height), left + int(max(0.0, x1) * width))
+                results[frame_index].append({"label": label, "score": float(score), "box": box})
+
+        self.stats["frames"] += len(frames)
+        self.stats["crops"] += len(crops)
+        self.stats["detections"] += sum(len(found) for found in results)
+        self.stats["total_time"] += time.monotonic() - start
+        return results
+
+    def report(self):
+        """
+        Returns detection statistics.
+
+        Returns:
+            dict: Frames, crops and batches processed, detections, frames per
+                  second and mean milliseconds per frame.
+        """
+        frames, total = self.stats["frames"], self.stats["total_time"]
+        return {
+            "frames": frames,
+            "crops": self.stats["crops"],
+            "batches": self.stats["batches"],
+            "detections": self.stats["detections"],
+            "fps": frames / total if total else 0.0,
+            "frame_ms": 1000 * total / frames if frames else 0.0,
+        }
+
+
+class GroundProjector:
+    """
+    Places image boxes on the floor using the camera's mounting geometry.
+
+    Positions are relative to the robot: `forward` along its heading and
+    `lateral` positive to its left, both in cm.
+    """
+    def __init__(self, camera_height=15.0, tilt=10.0, hfov=62.2, vfov=48.8, max_range=300.0):
+        """
+        Args:
+            camera_height (float): Lens height above the floor in cm.
+            tilt (float): Downward tilt of the camera in degrees.
+            hfov (float): Horizontal field of view in degrees (Pi Camera v2 default).
+            vfov (float): Vertical field of view in degrees.
+            max_range (float): Farther objects are ignored (too imprecise).
+        """
+        self.camera_height = camera_height
+        self.tilt = math.radians(tilt)
+        self.hfov = math.radians(hfov)
+        self.vfov = math.radians(vfov)
+        self.max_range = max_range
+
+    def to_ground(self, box, frame_shape):
+        """
+        Projects the bottom centre of a box (where the object meets the floor).
+
+        Returns:
+            tuple: (forward, lateral) in cm, or None if the point is at or
+                   above the horizon or out of range.
+        """
+        height, width = frame_shape[:2]
+        top, right, bottom, left = box
+        fy = (height / 2) / math.tan(self.vfov / 2)
+        fx = (width / 2) / math.tan(self.hfov / 2)
+        below_horizon = self.tilt + math.atan((bottom - height / 2) / fy)
+        if below_horizon <= 0:
+            return None
+        forward = self.camera_height / math.tan(below_horizon)
+        if forward > self.max_range:
+            return None
+        lateral = -forward * ((left + right) / 2 - width / 2) / fx
+        return forward, lateral
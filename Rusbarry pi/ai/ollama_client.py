@@ -0,0 +1,209 @@
+"""
+AI Module - Ollama Client
+=========================
+
+This module provides a shared HTTP client for the local Ollama server.
+
+It keeps a pooled keep-alive session so every query reuses the same TCP
+connection, applies bounded connect/read timeouts, and asks Ollama to keep the
+model resident in memory between voice commands (`keep_alive`). It also
+records connection reuse and cold-vs-warm latency so the gain can be observed.
+
+Integration Note:
+    - Used by `LocalLLMHandler` for all requests to the LLM.
+    - `initialize_ai_environment` uses it to warm the model up at startup.
+"""
+
+import json
+import time
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+if requests is not None:
+    RequestError = requests.exceptions.RequestException
+else:
+    class RequestError(Exception):
+        """Raised by the client instead of requests' errors when requests is missing."""
+
+# Ollama reports model load time in nanoseconds. A request that had to load
+# the model for longer than this is counted as a cold start.
+COLD_LOAD_THRESHOLD = 0.5  # seconds
+
+
+class OllamaClient:
+    """
+    Pooled, keep-alive client for the Ollama REST API.
+    """
+    def __init__(self, base_url="http://localhost:11434", connect_timeout=2.0,
+                 read_timeout=60.0, keep_alive="30m", pool_size=4, ping_timeout=2.0):
+        """
+        Initialize the client and its connection pool.
+
+        Args:
+            base_url (str): Root URL of the Ollama server.
+            connect_timeout (float): Seconds to wait for the TCP connection.
+            read_timeout (float): Seconds to wait between bytes of the response.
+            keep_alive (str|int): How long Ollama keeps the model loaded after a request
+                                  (e.g. "30m", or -1 to keep it forever).
+            pool_size (int): Maximum number of pooled connections.
+            ping_timeout (float): Seconds `ping()` waits for the server.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.generate_url = f"{self.base_url}/api/generate"
+        self.timeout = (connect_timeout, read_timeout)
+        self.keep_alive = keep_alive
+        self.ping_timeout = ping_timeout
+
+        # Without requests every call fails with RequestError instead
+        self.session = None
+        if requests is not None:
+            self.session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+
+        self.request_count = 0
+        self.cold_latencies = []
+        self.warm_latencies = []
+
+    def _payload(self, payload, stream):
+        body = dict(payload)
+        body["stream"] = stream
+        body.setdefault("keep_alive", self.keep_alive)
+        return body
+
+    def _require_session(self):
+        if self.session is None:
+            raise RequestError("requests library missing")
+
+    def _record(self, elapsed, data):
+        """Files the request latency as cold or warm using Ollama's load_duration."""
+        load_seconds = data.get("load_duration", 0) / 1e9
+        if load_seconds > COLD_LOAD_THRESHOLD:
+            self.cold_latencies.append(elapsed)
+        else:
+            self.warm_latencies.append(elapsed)
+
+    def generate(self, payload):
+        """
+        Runs a non-streaming generation.
+
+        Args:
+            payload (dict): Ollama /api/generate body (model, prompt, ...).
+
+        Returns:
+            dict: The decoded JSON response.
+        """
+        self._require_session()
+        start = time.monotonic()
+        self.request_count += 1
+        response = self.session.post(self.generate_url, json=self._payload(payload, False), timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json()
+        self._record(time.monotonic() - start, data)
+        return data
+
+    def generate_stream(self, payload):
+        """
+        Runs a streaming generation.
+
+        Args:
+            payload (dict): Ollama /api/generate body (model, prompt, ...).
+
+        Yields:
+            dict: Each decoded NDJSON chunk, ending with the 'done' chunk.
+        """
+        self._require_session()
+        start = time.monotonic()
+        self.request_count += 1
+        response = self.session.post(self.generate_url, json=self._payload(payload, True),
+                                     timeout=self.timeout, stream=True)
+        response.raise_for_status()
+        try:
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                yield data
+                if data.get("done"):
+                    self._record(time.monotonic() - start, data)
+                    break
+        finally:
+            # Closing early tells Ollama to stop generating
+            response.close()
+
+    def ping(self):
+        """
+        Checks if the Ollama server is reachable.
+
+        Returns:
+            bool: True if the server answered with HTTP 200.
+        """
+        if self.session is None:
+            return False
+        self.request_count += 1
+        try:
+            response = self.session.get(self.base_url, timeout=self.ping_timeout)
+            return response.status_code == 200
+        except RequestError:
+            return False
+
+    def warm_up(self, model_name):
+        """
+        Loads the model into memory so the first voice command is not a cold start.
+
+        An empty prompt makes Ollama load the model without generating anything.
+
+        Returns:
+            float: Seconds the warm-up took, or None if it failed.
+        """
+        start = time.monotonic()
+        try:
+            self.generate({"model": model_name, "prompt": ""})
+        except RequestError as e:
+            print(f"AI Error: Model warm-up failed: {e}")
+            return None
+        return time.monotonic() - start
+
+    def stats(self):
+        """
+        Reports connection reuse and latency figures.
+
+        Returns:
+            dict: Request counts, new vs reused connections and average
+                  cold/warm latency in seconds.
+        """
+        new_connections = 0
+        if self.session is not None:
+            pools = self.session.get_adapter(self.base_url).poolmanager.pools
+            new_connections = sum(pools[key].num_connections for key in pools.keys())
+
+        def average(values):
+            return sum(values) / len(values) if values else None
+
+        return {
+            "requests": self.request_count,
+            "new_connections": new_connections,
+            "reused_connections": max(self.request_count - new_connections, 0),
+            "cold_requests": len(self.cold_latencies),
+            "warm_requests": len(self.warm_latencies),
+            "avg_cold_latency": average(self.cold_latencies),
+            "avg_warm_latency": average(self.warm_latencies),
+        }
+
+
+_shared_clients = {}
+
+def get_shared_client(base_url="http://localhost:11434", **kwargs):
+    """
+    Returns the process-wide client for `base_url`, creating it on first use.
+
+    Extra keyword arguments are passed to `OllamaClient` when it is created.
+    """
+    base_url = base_url.rstrip("/")
+    if base_url not in _shared_clients:
+        _shared_clients[base_url] = OllamaClient(base_url, **kwargs)
+    return _shared_clients[base_url]
@@ -6,9 +6,14 @@ This module handles high-level computer vision tasks using Machine Learning.
 It integrates with cameras to perform face recognition and object detection.
 """
 
+import contextlib
 import time
 import os
 
+from .face_gallery import FaceGallery
+from .face_tracking import FaceTracker
+from .object_detection import ObjectDetector, GroundProjector, MOVING_CLASSES
+
 try:
     import face_recognition
     import cv2
@@ -22,40 +27,106 @@ class FaceRecognizer:
     """
     Manages face recognition identities and detection.
     """
-    def __init__(self, known_faces_dir="data/faces"):
-        self.known_face_encodings = []
-        self.known_face_names = []
+    def __init__(self, known_faces_dir="data/faces", cache_path="data/face_encodings.npz", index="auto"):
         self.known_faces_dir = known_faces_dir
+        self.gallery = None
         
         if face_recognition is None:
             print("WARNING: 'face_recognition' library not found. Vision disabled.")
             return
 
+        self.gallery = FaceGallery(known_faces_dir, cache_path, index=index)
         self.load_known_faces()
 
+    @property
+    def known_face_names(self):
+        return self.gallery.names.tolist() if self.gallery else []
+
+    def encode_image(self, path):
+        """Returns the encoding of the first face in an image file, or None."""
+        image = face_recognition.load_image_file(path)
+        encodings = face_recognition.face_encodings(image)
+        return encodings[0] if encodings else None
+
     def load_known_faces(self):
         """
-        Loads and encodes faces from the data directory.
+        Loads known face encodings, encoding only photos that are new or
+        changed since the last run.
         """
         if not os.path.exists(self.known_faces_dir):
             print(f"Vision: No known faces directory found at {self.known_faces_dir}")
             return
 
         print("Vision: Loading known faces...")
-        # Mock loading logic
-        # For filename in os.listdir...
-        # image = face_recognition.load_image_file(path)
-        # encoding = face_recognition.face_encodings(image)[0]
-        # self.known_face_encodings.append(encoding)
-        # self.known_face_names.append(name)
-        
-        # Simulating a known user
-        self.known_face_names.append("User")
-        
+        result = self.gallery.sync(self.encode_image)
+        print(f"Vision: {len(self.gallery)} known faces loaded "
+              f"({result['encoded']} encoded, {result['removed']} removed)")
+
+    def add_face(self, path, name=None):
+        """
+        Enrolls a person from a photo in the faces directory.
+
+        Returns:
+            bool: True if a face was found and added.
+        """
+        encoding = self.encode_image(path)
+        if encoding is None:
+            return False
+        self.gallery.add(path, encoding, name)
+        return True
+
+    def remove_face(self, name, delete_photos=False):
+        """
+        Forgets a person for this run.
+
+        Their reference photos stay on disk (and are enrolled again at the
+        next start) unless the caller asks for them to be deleted.
+
+        Args:
+            name (str): The person to remove.
+            delete_photos (bool): Also delete their reference photos from disk.
+
+        Returns:
+            int: Number of encodings removed.
+        """
+        paths = self.gallery.remove(name)
+        if delete_photos:
+            for path in paths:
+                # Already deleted or moved: the encoding is gone either way
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(path)
+        return len(paths)
+
+    def detect(self, rgb_frame):
+        """
+        Finds faces in an RGB frame.
+
+        Returns:
+            list: (top, right, bottom, left) boxes.
+        """
+        return face_recognition.face_locations(rgb_frame)
+
+    def recognize(self, rgb_frame, face_locations, tolerance=0.6):
+        """
+        Names the faces at the given locations.
+
+        Args:
+            rgb_frame: RGB image the locations refer to.
+            face_locations (list): (top, right, bottom, left) boxes.
+            tolerance (float): Maximum encoding distance for a match.
+
+        Returns:
+            list: A name (or "Unknown") per location.
+        """
+        encodings = face_recognition.face_encodings(rgb_frame, face_locations)
+        return self.gallery.match(encodings, tolerance)
+
     def identify_face(self, frame):
         """
         Processes a video frame to find known faces.
         
+        Runs full detection and recognition; use `FaceTracker` for video.
+
         Args:
             frame: A numpy array representing the image (from OpenCV).
             
@@ -66,23 +137,68 @@ class FaceRecognizer:
             return None
 
         # Optimization: Resize frame of video to 1/4 size for faster face recognition processing
-        # small_frame = cv2.resize(frame, (0, 0), fx=0.25, fy=0.25)
-        # rgb_small_frame = small_frame[:, :, ::-1]
-        
-        # Find faces
-        # face_locations = face_recognition.face_locations(rgb_frame)
-        # face_encodings = face_recognition.face_encodings(rgb_frame, face_locations)
+        small_frame = cv2.resize(frame, (0, 0), fx=0.25, fy=0.25)
+        rgb_small_frame = np.ascontiguousarray(small_frame[:, :, ::-1])
 
-        # For simulation, just return a success randomly or None
-        return "User"
+        face_locations = self.detect(rgb_small_frame)
+        for name in self.recognize(rgb_small_frame, face_locations):
+            if name != "Unknown":
+                return name
+        return None
 
 class VisionSystem:
-    def __init__(self):
+    def __init__(self, detect_every=10, object_detector=None, projector=None):
+        """
+        Args:
+            detect_every (int): Frames between full face detections.
+            object_detector (ObjectDetector, optional): Obstacle detector
+                                                        (default: the quantized SSD model).
+            projector (GroundProjector, optional): Camera mounting geometry.
+        """
         self.recognizer = FaceRecognizer()
+        # Detect/recognize every few frames, track faces in between
+        self.tracker = FaceTracker(self.recognizer, detect_every=detect_every)
+        self.last_name = None
+        self.objects = object_detector or ObjectDetector()
+        self.projector = projector or GroundProjector()
     
-    def scan_for_people(self, camera_frame):
-        name = self.recognizer.identify_face(camera_frame)
-        if name:
+    def scan_for_people(self, camera_frame, detect=None):
+        """
+        Tracks faces in a frame and returns the first recognized name.
+
+        Args:
+            camera_frame (numpy.ndarray): BGR image from the camera.
+            detect (bool, optional): Passed to `FaceTracker.update` (force or
+                                     suppress detection; None = tracker's schedule).
+        """
+        if face_recognition is None:
+            return None
+        self.tracker.update(camera_frame, detect=detect)
+        names = self.tracker.names()
+        name = names[0] if names else None
+        # Tracks keep their name on every frame: log only when it changes
+        if name and name != self.last_name:
             print(f"Vision: Recognized {name}")
-            return name
-        return None
+        self.last_name = name
+        return name
+
+    def scan_for_obstacles(self, camera_frame):
+        """
+        Detects obstacles in the same frame used for face recognition.
+
+        Returns:
+            list: Detections with a "position" (forward, lateral) in cm
+                  relative to the robot, for those that touch the floor in view,
+                  and "moving" set for people and pets.
+        """
+        if not self.objects.available:
+            return []
+        obstacles = []
+        for detection in self.objects.detect(camera_frame):
+            position = self.projector.to_ground(detection["box"], camera_frame.shape)
+            if position is not None:
+                obstacles.append(dict(detection, position=position,
+                                      moving=detection["label"] in MOVING_CLASSES))
+        for obstacle in obstacles:
+            print(f"Vision: {obstacle['label']} ahead at {obstacle['position'][0]:.0f} cm")
+        return obstacles
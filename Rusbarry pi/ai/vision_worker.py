@@ -0,0 +1,267 @@
+"""
+Vision Module - Vision Worker Process
+=====================================
+
+Face detection and recognition are CPU-bound (dlib/OpenCV) and, run in a
+thread, compete with voice capture and motor timing for the GIL. This module
+runs `VisionSystem` in its own process instead:
+
+    Camera capture thread --frames--> SharedFrameRing (shared memory)
+    worker process: read newest frame -> scan_for_people (face tracking)
+                    (+ scan_for_obstacles on the same buffer) -> result queue
+    main process: VisionProcess.get_result()
+
+Every frame goes through the face tracker, which needs consecutive frames to
+follow faces. The activity gate (`activity_gate.py`) only decides which
+frames also run the expensive detection/recognition and obstacle detection:
+rarely while the scene is static, sooner when something moves.
+
+A supervisor thread restarts the worker if it exits or stops sending
+heartbeats (e.g. hangs in native code), backing off between restarts.
+
+Integration Note:
+    - `RobotApp` starts a `VisionProcess` on its camera and turns results
+      into "greet" commands.
+"""
+
+import multiprocessing
+import queue
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from interface.shared_frames import SharedFrameRing
+from ai.activity_gate import ActivityGate
+
+
+def create_vision_system():
+    """Default processor factory, called inside the worker process."""
+    from ai.vision import VisionSystem
+    return VisionSystem()
+
+
+def vision_worker_main(ring_spec, results, stop_event, factory, gate_options=None, poll_interval=0.01):
+    """
+    Worker process entry point: recognizes people in the newest frames.
+
+    Args:
+        ring_spec (tuple): `SharedFrameRing.spec()` of the frame ring.
+        results (multiprocessing.Queue): Receives (seq, captured_at, name, seconds,
+                                         gate report, obstacles).
+        stop_event (multiprocessing.Event): Set by the main process to stop.
+        factory (callable): Returns an object with `scan_for_people(frame)` and
+                            optionally `scan_for_obstacles(frame)`.
+        gate_options (dict, optional): `ActivityGate` settings (min_rate, max_rate, ...).
+        poll_interval (float): Sleep between checks for a new frame.
+    """
+    shape, slots, dtype, name = ring_spec
+    ring = SharedFrameRing(shape, slots, dtype, name=name)
+
+    # Loading libraries and known faces can take a while: keep beating meanwhile
+    loading = threading.Event()
+    def beat_while_loading():
+        while not loading.wait(1.0):
+            ring.beat()
+    threading.Thread(target=beat_while_loading, daemon=True).start()
+    try:
+        processor = factory()
+    finally:
+        loading.set()
+    scan_for_obstacles = getattr(processor, "scan_for_obstacles", None)
+    gate = ActivityGate(**(gate_options or {}))
+    frame = np.empty(shape, dtype=dtype)
+    last_seq = 0
+    last_person = None
+    try:
+        while not stop_event.is_set():
+            ring.beat()
+            got = ring.read_latest(frame, last_seq)
+            if got is None:
+                time.sleep(poll_interval)
+                continue
+            last_seq, captured_at = got
+            detect = gate.should_process(frame)
+            start = time.monotonic()
+            person = processor.scan_for_people(frame, detect=detect)
+            obstacles = scan_for_obstacles(frame) if detect and scan_for_obstacles else []
+            processing = time.monotonic() - start
+            if detect:
+                gate.record_processing(processing)
+            elif person == last_person:
+                # Tracked frame with nothing new to report
+                continue
+            last_person = person
+            try:
+                results.put_nowait((last_seq, captured_at, person, processing, gate.report(), obstacles))
+            except queue.Full:
+                pass
+    finally:
+        ring.close()
+
+
+class VisionProcess:
+    """
+    Runs vision in a supervised worker process fed from shared memory.
+    """
+    def __init__(self, camera, factory=create_vision_system, slots=4,
+                 hang_timeout=15.0, max_backoff=30.0, gate_options=None, on_obstacles=None):
+        """
+        Args:
+            camera (Camera): The capture to read frames from.
+            factory (callable): Module-level function creating the processor
+                                inside the worker (must be picklable).
+            slots (int): Frames in the shared ring.
+            hang_timeout (float): Seconds without a heartbeat before the
+                                  worker is considered hung and restarted.
+            max_backoff (float): Longest wait between restarts.
+            gate_options (dict, optional): `ActivityGate` settings, e.g.
+                                           {"min_rate": 0.2, "max_rate": 10.0}.
+            on_obstacles (callable, optional): Called with the obstacles
+                                               detected in each processed frame.
+        """
+        self.camera = camera
+        self.on_obstacles = on_obstacles
+        self.gate_options = gate_options
+        self.gate_report = {}
+        self.factory = factory
+        self.slots = slots
+        self.hang_timeout = hang_timeout
+        self.max_backoff = max_backoff
+        # Spawn: never fork a process that has audio/camera threads running
+        self.context = multiprocessing.get_context("spawn")
+        self.results = None
+        self.stop_event = self.context.Event()
+        self.ring = None
+        self.process = None
+        self.supervisor = None
+        self.running = False
+        self.started_at = None
+        self.stats = {"starts": 0, "restarts": 0, "hangs": 0, "results": 0,
+                      "total_latency": 0.0, "total_processing": 0.0}
+
+    def start(self, shape=None):
+        """
+        Creates the shared ring, hooks it to the camera and starts the worker.
+
+        Args:
+            shape (tuple, optional): Frame shape; by default taken from the
+                                     camera's first frame.
+
+        Returns:
+            bool: False if no frame shape could be determined.
+        """
+        if shape is None:
+            frame = self.camera.latest(timeout=5.0)
+            if frame is None:
+                print("Vision: No camera frames, worker process not started")
+                return False
+            shape = frame.image.shape
+            frame.release()
+        self.ring = SharedFrameRing(shape, self.slots)
+        self.camera.add_sink(self.ring.write)
+        self.running = True
+        self._spawn()
+        self.supervisor = threading.Thread(target=self._supervise, name="vision-supervisor", daemon=True)
+        self.supervisor.start()
+        return True
+
+    def _spawn(self):
+        # A killed worker can leave the queue's lock held: start each worker with a fresh one
+        self.results = self.context.Queue(maxsize=16)
+        self.stop_event.clear()
+        self.process = self.context.Process(
+            target=vision_worker_main, name="vision-worker", daemon=True,
+            args=(self.ring.spec(), self.results, self.stop_event, self.factory, self.gate_options))
+        self.process.start()
+        self.started_at = time.monotonic()
+        self.stats["starts"] += 1
+        print(f"Vision: Worker process started (pid {self.process.pid})")
+
+    def _hung(self):
+        # Give the worker time to import libraries and load faces first
+        beat = max(self.ring.last_heartbeat, self.started_at)
+        return time.monotonic() - beat > self.hang_timeout
+
+    def _supervise(self):
+        backoff = min(1.0, self.max_backoff)
+        while self.running:
+            time.sleep(0.5)
+            if not self.running:
+                break
+            alive = self.process.is_alive()
+            if alive and not self._hung():
+                if time.monotonic() - self.started_at > 60:
+                    backoff = min(1.0, self.max_backoff)
+                continue
+            if alive:
+                print("Vision: Worker stopped responding, restarting")
+                self.stats["hangs"] += 1
+                self.process.terminate()
+            else:
+                print(f"Vision: Worker exited (code {self.process.exitcode}), restarting in {backoff:.0f}s")
+            self.process.join(timeout=2)
+            time.sleep(backoff)
+            backoff = min(self.max_backoff, backoff * 2)
+            if self.running:
+                self.stats["restarts"] += 1
+                self._spawn()
+
+    def get_result(self, timeout=1.0):
+        """
+        Waits for the next recognition result.
+
+        Returns:
+            tuple: (frame seq, name or None), or None on timeout.
+        """
+        if self.results is None:
+            return None
+        try:
+            seq, captured_at, name, processing, self.gate_report, obstacles = self.results.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if obstacles and self.on_obstacles:
+            self.on_obstacles(obstacles)
+        self.stats["results"] += 1
+        self.stats["total_latency"] += time.monotonic() - captured_at
+        self.stats["total_processing"] += processing
+        return seq, name
+
+    def stop(self):
+        """Stops the worker and frees the shared memory."""
+        self.running = False
+        if self.supervisor:
+            self.supervisor.join(timeout=2)
+        if self.process:
+            self.stop_event.set()
+            self.process.join(timeout=2)
+            if self.process.is_alive():
+                self.process.terminate()
+        if self.ring:
+            if self.ring.write in self.camera.sinks:
+                self.camera.sinks.remove(self.ring.write)
+            self.ring.close()
+            self.ring = None
+
+    def report(self):
+        """
+        Returns worker statistics.
+
+        Returns:
+            dict: Results received, restarts, hangs, frames written to the
+                  ring, and mean capture-to-result latency / processing time
+                  in milliseconds.
+        """
+        results = self.stats["results"]
+        return {
+            "results": results,
+            "restarts": self.stats["restarts"],
+            "hangs": self.stats["hangs"],
+            "frames_shared": self.ring.stats["written"] if self.ring else 0,
+            "latency_ms": 1000 * self.stats["total_latency"] / results if results else 0.0,
+            "processing_ms": 1000 * self.stats["total_processing"] / results if results else 0.0,
+            "gate": self.gate_report,
+        }
@@ -0,0 +1,81 @@
+"""
+Benchmark - Offline Streaming Speech Recognition
+================================================
+
+Decodes recorded WAV files with `StreamingRecognizer` in live-sized chunks and
+reports real-time factor, CPU use and how early the first partial transcript
+arrives.
+
+Record fixtures on the robot's own microphone (16-bit mono WAV), e.g.:
+    arecord -f S16_LE -r 16000 -c 1 benchmarks/fixtures/audio/stop.wav
+
+Usage:
+    python benchmarks/bench_asr.py --model models/vosk-model-small-en-us-0.15 \\
+        benchmarks/fixtures/audio/*.wav
+"""
+
+import argparse
+import os
+import sys
+import time
+import wave
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from interface.streaming_asr import StreamingRecognizer, DEFAULT_MODEL_PATH
+
+def bench_file(asr, path, chunk_seconds):
+    """Decodes one WAV file; returns (audio seconds, first partial at, transcript)."""
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2 or wav.getnchannels() != 1:
+            raise ValueError(f"{path}: expected 16-bit mono audio")
+        rate = wav.getframerate()
+        asr.reset(rate)
+        frames_per_chunk = int(rate * chunk_seconds)
+        audio_pos = 0.0
+        first_partial = None
+        finals = []
+        while True:
+            pcm = wav.readframes(frames_per_chunk)
+            if not pcm:
+                break
+            audio_pos += len(pcm) / (2 * rate)
+            event = asr.accept_chunk(pcm)
+            if event and event[0] == "partial" and first_partial is None:
+                first_partial = audio_pos
+            elif event and event[0] == "final" and event[1]:
+                finals.append(event[1])
+        tail = asr.finish()
+        if tail:
+            finals.append(tail)
+    return audio_pos, first_partial, " ".join(finals)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("wavs", nargs="+")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--chunk", type=float, default=0.1, help="seconds of audio per chunk")
+    args = parser.parse_args()
+
+    asr = StreamingRecognizer(args.model)
+    if not asr.available:
+        sys.exit("Offline ASR not available (install vosk and download a model).")
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    for path in args.wavs:
+        audio, first_partial, text = bench_file(asr, path, args.chunk)
+        partial = f"{first_partial:.2f}s" if first_partial is not None else "-"
+        print(f"{os.path.basename(path):<24} {audio:6.2f}s audio  first partial at {partial:>6}  '{text}'")
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    report = asr.report()
+    print("\n=== Offline ASR ===")
+    print(f"audio decoded: {report['audio_seconds']:.1f}s")
+    print(f"real-time factor: {report['real_time_factor']:.3f}")
+    print(f"CPU per audio second: {report['cpu_per_audio_second']:.3f} core-seconds")
+    print(f"process CPU while decoding: {100 * cpu / wall:.0f}% of one core")
+
+if __name__ == "__main__":
+    main()
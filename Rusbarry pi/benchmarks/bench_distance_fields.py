@@ -0,0 +1,82 @@
+"""
+Benchmark - Distance Fields for Frequent Destinations
+=====================================================
+
+Simulates a day of errands on a random map: routes from random starts to a
+few registered destinations (home, docks), with small obstacles appearing
+on the map every `--change-every` routes. Compares:
+
+    astar:   `PathPlanner` (4-connected) searching every route
+    field:   `DistanceFieldCache` gradient descent, with new obstacles
+             repaired in the fields they affect
+
+It reports the field build time, mean query time of each (field queries
+include their share of repairs), the cache's hit rate (queries answered
+without a rebuild) and the number of repairs.
+
+Usage:
+    python benchmarks/bench_distance_fields.py --sizes 100 300 --queries 500 --change-every 20
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from control.distance_field import DistanceFieldCache
+from control.navigation import PathPlanner
+from bench_path_planning import random_map
+
+def free_cell(grid, rng):
+    while True:
+        x, y = rng.integers(0, grid.width), rng.integers(0, grid.height)
+        if not grid.is_blocked(x, y):
+            return (int(x), int(y))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300])
+    parser.add_argument("--density", type=float, default=0.1, help="share of blocked cells")
+    parser.add_argument("--destinations", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--change-every", type=int, default=20, help="routes between map changes")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'map':>10} {'build ms':>9} {'astar ms':>9} {'field ms':>9} {'hit rate':>9} {'repairs':>8} {'field MB':>9}")
+    for size in args.sizes:
+        rng = np.random.default_rng(args.seed)
+        grid = random_map(size, args.density, args.seed)
+        planner = PathPlanner(grid)
+        with contextlib.redirect_stdout(io.StringIO()):
+            cache = DistanceFieldCache(grid)
+            goals = [free_cell(grid, rng) for _ in range(args.destinations)]
+            for i, goal in enumerate(goals):
+                cache.register(f"dock{i}", goal)
+        build_ms = cache.stats["build_ms"] / len(goals)
+
+        astar_ms = 0.0
+        for query in range(args.queries):
+            if query and query % args.change_every == 0:
+                x, y = free_cell(grid, rng)
+                grid.set_cells([x, x + 1, x], [y, y, y + 1])
+            start, goal = free_cell(grid, rng), goals[query % len(goals)]
+            path = cache.path(start, goal)
+            planner._blocked()  # the padded grid copy is shared with plain queries
+            began = time.perf_counter()
+            expected = planner.find_cells(start, goal)
+            astar_ms += 1000 * (time.perf_counter() - began)
+            assert (path is None) == (expected is None) and (path is None or len(path) == len(expected))
+
+        report = cache.report()
+        print(f"{size:>4}x{size:<5} {build_ms:>9.2f} {astar_ms / args.queries:>9.2f} "
+              f"{report['avg_query_ms']:>9.3f} {report['hit_rate']:>9.2f} {report['repairs']:>8} {report['nbytes'] / 1e6:>9.2f}")
+
+if __name__ == "__main__":
+    main()
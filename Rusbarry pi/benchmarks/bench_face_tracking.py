@@ -0,0 +1,92 @@
+"""
+Benchmark - Detect-then-Track Face Pipeline
+===========================================
+
+Plays recorded video clips through two face pipelines and compares them:
+
+    full:    `FaceRecognizer.identify_face` (detect + encode) on every frame
+    tracked: `FaceTracker`, detecting every N frames or on scene change and
+             tracking faces in between
+
+For each mode it reports the sustainable frames/s, mean and worst per-frame
+time, how long after the start of the clip a known person was first named,
+and the mean recognition (encoding) latency.
+
+Put reference photos in `data/faces/<name>.jpg` and record clips on the robot:
+    ffmpeg -f v4l2 -i /dev/video0 -t 20 benchmarks/fixtures/video/walk_in.mp4
+
+Usage:
+    python benchmarks/bench_face_tracking.py benchmarks/fixtures/video/*.mp4 --detect-every 10
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import cv2
+
+from ai.face_tracking import FaceTracker
+from ai.vision import FaceRecognizer
+
+def read_clip(path):
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frames = []
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames, fps
+
+def run_full(recognizer, frames, clip_fps):
+    times, first_named = [], None
+    for i, frame in enumerate(frames):
+        start = time.perf_counter()
+        name = recognizer.identify_face(frame)
+        times.append(time.perf_counter() - start)
+        if name and first_named is None:
+            first_named = i / clip_fps
+    # Every frame is a full detection + recognition here
+    return times, first_named, 1000 * sum(times) / len(times)
+
+def run_tracked(recognizer, frames, clip_fps, detect_every):
+    tracker = FaceTracker(recognizer, detect_every=detect_every)
+    times, first_named = [], None
+    for i, frame in enumerate(frames):
+        start = time.perf_counter()
+        tracker.update(frame)
+        times.append(time.perf_counter() - start)
+        if tracker.names() and first_named is None:
+            first_named = i / clip_fps
+    return times, first_named, tracker.report()["recognize_ms"]
+
+def summarize(label, times, first_named, recognize_ms):
+    total = sum(times)
+    named = f"{first_named:.2f}s" if first_named is not None else "never"
+    print(f"  {label:<8} {len(times) / total:7.1f} fps  mean {1000 * total / len(times):6.1f} ms  "
+          f"max {1000 * max(times):6.1f} ms  first named at {named:>6}  recognition {recognize_ms:6.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("clips", nargs="+")
+    parser.add_argument("--faces", default="data/faces")
+    parser.add_argument("--detect-every", type=int, default=10)
+    args = parser.parse_args()
+
+    recognizer = FaceRecognizer(args.faces)
+    for path in args.clips:
+        frames, clip_fps = read_clip(path)
+        if not frames:
+            print(f"{path}: no frames")
+            continue
+        print(f"{os.path.basename(path)} ({len(frames)} frames at {clip_fps:.0f} fps)")
+        summarize("full", *run_full(recognizer, frames, clip_fps))
+        summarize("tracked", *run_tracked(recognizer, frames, clip_fps, args.detect_every))
+
+if __name__ == "__main__":
+    main()
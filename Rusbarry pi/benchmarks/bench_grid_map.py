@@ -0,0 +1,74 @@
+"""
+Benchmark - Occupancy Grid Memory and Update Throughput
+=======================================================
+
+Compares the NumPy `GridMap` with the previous list-of-lists grid at
+several map sizes:
+
+    memory:      bytes for the cells (lists: measured with sys.getsizeof,
+                 NumPy: obstacle + blocked layers, and the bit-packed form)
+    insert:      points/s marking a random point cloud (lists: one
+                 `update_obstacle`-style call per point; NumPy: one `add_points`,
+                 including inflation of the new obstacles)
+    inflate:     time for a full robot-radius inflation pass
+
+Usage:
+    python benchmarks/bench_grid_map.py --sizes 100 1000 2000 --points 100000 --radius 20
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from control.navigation import GridMap
+
+def list_grid_bytes(grid):
+    # Outer list, row lists and the (shared, cached) small int objects
+    return sys.getsizeof(grid) + sum(sys.getsizeof(row) for row in grid)
+
+def list_insert(size, resolution, points):
+    grid = [[0 for _ in range(size)] for _ in range(size)]
+    start = time.perf_counter()
+    for x, y in points:
+        grid_x, grid_y = int(x / resolution), int(y / resolution)
+        if 0 <= grid_x < size and 0 <= grid_y < size:
+            grid[grid_y][grid_x] = 1
+    return grid, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 2000])
+    parser.add_argument("--points", type=int, default=100000)
+    parser.add_argument("--resolution", type=float, default=10)
+    parser.add_argument("--radius", type=float, default=20, help="robot radius in cm")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'cells':>11} {'list MB':>8} {'numpy MB':>9} {'packed MB':>10} "
+          f"{'list pts/s':>11} {'numpy pts/s':>12} {'inflate ms':>11}")
+    for size in args.sizes:
+        points = rng.uniform(0, size * args.resolution, size=(args.points, 2))
+        legacy, list_time = list_insert(size, args.resolution, points.tolist())
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            grid = GridMap(width=size, height=size, resolution=args.resolution, robot_radius=args.radius)
+        start = time.perf_counter()
+        grid.add_points(points)
+        numpy_time = time.perf_counter() - start
+        start = time.perf_counter()
+        grid.inflate()
+        inflate_time = time.perf_counter() - start
+
+        print(f"{size}x{size:<6} {list_grid_bytes(legacy) / 1e6:8.1f} {grid.nbytes / 1e6:9.1f} "
+              f"{grid.packed().nbytes / 1e6:10.2f} {args.points / list_time:11.0f} "
+              f"{args.points / numpy_time:12.0f} {1000 * inflate_time:11.1f}")
+
+if __name__ == "__main__":
+    main()
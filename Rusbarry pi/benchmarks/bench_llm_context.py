@@ -0,0 +1,83 @@
+"""
+Benchmark - LLM Prompt Context Reuse
+====================================
+
+Compares prompt evaluation cost per command with and without reusing the
+cached system prompt context (`LocalLLMHandler.reuse_context`).
+
+The fast path and the intent cache are turned off so every command goes to
+the LLM; commands that still didn't reach it are left out of the averages.
+
+Requires a running Ollama server with the model pulled.
+
+Usage:
+    python benchmarks/bench_llm_context.py --model llama3.2:3b --runs 3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.llm_handler import LocalLLMHandler
+from ai.intent_cache import IntentCache
+
+COMMANDS = [
+    "stop",
+    "go forward a little",
+    "turn left",
+    "play some robot music",
+    "come here please",
+    "tell me a joke",
+]
+
+def run(model, reuse, runs):
+    """Runs every command `runs` times and averages Ollama's counters."""
+    # No fast path, and a cache that evicts every entry as soon as it is stored
+    handler = LocalLLMHandler(model_name=model, reuse_context=reuse, use_fast_path=False,
+                              cache=IntentCache(max_entries=0))
+    if reuse:
+        handler.prime_context()
+    else:
+        # Load the model so the first measured command is not a cold start
+        handler.query_llm("Reply with OK.")
+
+    tokens, eval_time, latency = [], [], []
+    for _ in range(runs):
+        for command in COMMANDS:
+            handler.last_stats = {}
+            start = time.monotonic()
+            handler.interpret_command(command)
+            elapsed = time.monotonic() - start
+            if not handler.last_stats:
+                # Answered without an LLM call: nothing to compare
+                continue
+            latency.append(elapsed)
+            tokens.append(handler.last_stats.get("prompt_eval_count", 0))
+            eval_time.append(handler.last_stats.get("prompt_eval_duration", 0))
+
+    n = len(latency)
+    if not n:
+        return float("nan"), float("nan"), float("nan")
+    return sum(tokens) / n, sum(eval_time) / n, sum(latency) / n
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="llama3.2:3b")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    results = {}
+    for reuse in (False, True):
+        results[reuse] = run(args.model, reuse, args.runs)
+
+    print("\n=== Prompt context reuse ===")
+    print(f"{'mode':<12}{'prompt tokens':>15}{'prompt eval (s)':>18}{'latency (s)':>14}")
+    for reuse, (tokens, eval_time, latency) in results.items():
+        label = "reuse" if reuse else "full prompt"
+        print(f"{label:<12}{tokens:>15.1f}{eval_time:>18.3f}{latency:>14.3f}")
+
+if __name__ == "__main__":
+    main()
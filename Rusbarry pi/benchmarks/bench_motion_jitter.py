@@ -0,0 +1,48 @@
+"""
+Benchmark - Motion Timing Jitter
+================================
+
+Runs a series of short timed moves through `MotionExecutor` and reports how
+late each move ended compared to its planned duration.
+
+Run it on the robot (optionally with a CPU load running) to check the control
+thread keeps moves accurate.
+
+Usage:
+    python benchmarks/bench_motion_jitter.py --moves 50 --duration 0.1
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from control.motor_driver import RobotMover
+from control.motion_executor import MotionExecutor
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--moves", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=0.1)
+    parser.add_argument("--tick", type=float, default=0.02)
+    args = parser.parse_args()
+
+    # Motor drivers print every speed change; keep the output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        mover = RobotMover()
+        executor = MotionExecutor(mover, tick=args.tick)
+        executor.start()
+        tasks = executor.chain([("move", mover.move_forward, args.duration)] * args.moves)
+        tasks[-1].wait(args.moves * args.duration + 5)
+        executor.stop()
+
+    report = executor.report()
+    print("=== Motion timing jitter ===")
+    print(f"moves: {report['moves']}  tick: {args.tick * 1000:.0f} ms")
+    print(f"mean: {report['mean_ms']:.2f} ms  p95: {report['p95_ms']:.2f} ms  max: {report['max_ms']:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark - Path Planning: Node Expansions and Wall Time
+========================================================
+
+Plans corner-to-corner routes on random maps of several sizes (scattered
+rectangular obstacles, like furniture) and compares:
+
+    legacy:  the previous A* (tuple neighbour lists, `is_blocked` per
+             neighbour, no closed set, duplicate heap entries)
+    astar4:  `PathPlanner` 4-connected, Manhattan heuristic
+    astar8:  `PathPlanner(connectivity=8)`, octile heuristic
+    jps:     `PathPlanner(jump_points=True)`, Jump Point Search
+
+For each it reports nodes expanded, wall time and path length in cells.
+
+Usage:
+    python benchmarks/bench_path_planning.py --sizes 100 300 1000 --density 0.1
+"""
+
+import argparse
+import contextlib
+import heapq
+import io
+import math
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from control.navigation import GridMap, PathPlanner
+
+def random_map(size, density, seed):
+    rng = np.random.default_rng(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        grid = GridMap(width=size, height=size, resolution=10)
+    mask = np.zeros((size, size), dtype=bool)
+    while mask.mean() < density:
+        x, y = rng.integers(0, size, 2)
+        w, h = rng.integers(2, max(3, size // 15), 2)
+        mask[y:y + h, x:x + w] = True
+    # Keep the corners free for start and goal
+    mask[:5, :5] = mask[-5:, -5:] = False
+    ys, xs = np.nonzero(mask)
+    grid.set_cells(xs, ys)
+    return grid
+
+def legacy_find_path(grid, start_node, goal_node):
+    """The A* loop as it was before flat indices (expansions = heap pops)."""
+    heuristic = lambda a, b: abs(a[0] - b[0]) + abs(a[1] - b[1])
+    frontier = [(0, start_node)]
+    came_from, cost_so_far = {start_node: None}, {start_node: 0}
+    expanded = 0
+    while frontier:
+        current = heapq.heappop(frontier)[1]
+        expanded += 1
+        if current == goal_node:
+            break
+        neighbors = [(current[0]+1, current[1]), (current[0]-1, current[1]),
+                     (current[0], current[1]+1), (current[0], current[1]-1)]
+        for next_node in neighbors:
+            if not grid.is_blocked(next_node[0], next_node[1]):
+                new_cost = cost_so_far[current] + 1
+                if next_node not in cost_so_far or new_cost < cost_so_far[next_node]:
+                    cost_so_far[next_node] = new_cost
+                    heapq.heappush(frontier, (new_cost + heuristic(goal_node, next_node), next_node))
+                    came_from[next_node] = current
+    if goal_node not in came_from:
+        return None, expanded
+    path, current = [], goal_node
+    while current is not None:
+        path.append(current)
+        current = came_from[current]
+    return path[::-1], expanded
+
+def length(path):
+    return sum(math.hypot(b[0] - a[0], b[1] - a[1]) for a, b in zip(path, path[1:])) if path else float("nan")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300, 1000])
+    parser.add_argument("--density", type=float, default=0.1, help="share of blocked cells")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-legacy-above", type=int, default=1000,
+                        help="don't run the legacy planner on larger maps")
+    args = parser.parse_args()
+
+    print(f"{'map':>10} {'planner':<8} {'expanded':>9} {'ms':>9} {'length':>8}")
+    for size in args.sizes:
+        grid = random_map(size, args.density, args.seed)
+        start, goal = (1, 1), (size - 2, size - 2)
+        planners = {"astar4": PathPlanner(grid), "astar8": PathPlanner(grid, connectivity=8),
+                    "jps": PathPlanner(grid, jump_points=True)}
+        runs = []
+        if size <= args.skip_legacy_above:
+            runs.append(("legacy", lambda: legacy_find_path(grid, start, goal)))
+        for name, planner in planners.items():
+            planner._blocked()  # build the padded grid outside the timing
+            def plan(planner=planner):
+                path = planner.find_cells(start, goal)
+                return path, planner.stats["last_expanded"]
+            runs.append((name, plan))
+        for name, plan in runs:
+            began = time.perf_counter()
+            path, expanded = plan()
+            elapsed = 1000 * (time.perf_counter() - began)
+            print(f"{size:>4}x{size:<5} {name:<8} {expanded:>9} {elapsed:>9.1f} {length(path):>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark - Replanning Latency When the Map Changes Mid-Route
+=============================================================
+
+Drives a simulated robot corner to corner over a random map. Every few steps
+a small obstacle appears on the route just ahead (like a person stepping
+into the corridor) and the route is replanned from the current cell with:
+
+    astar:   `PathPlanner(connectivity=8)`, a full search each time
+    dstar:   `DStarLite`, repairing the previous search
+
+Both drive the same route (D* Lite follows the same optimal costs; ties may
+differ, so the dstar route is the one driven and A* replans from it). For
+each number of obstacle updates it reports the mean and worst replan time
+and the nodes expanded per replan.
+
+Usage:
+    python benchmarks/bench_replanning.py --size 300 --updates 10 50 200
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from control.dstar_lite import DStarLite
+from control.navigation import PathPlanner
+from bench_path_planning import random_map
+
+def drive(size, density, updates, seed):
+    grid = random_map(size, density, seed)
+    rng = np.random.default_rng(seed)
+    replanner = DStarLite(grid)
+    planner = PathPlanner(grid, connectivity=8)
+    goal = (size - 2, size - 2)
+    path = replanner.plan((1, 1), goal)
+    times = {"astar": [], "dstar": []}
+    expanded = {"astar": 0, "dstar": 0}
+    # Spread the updates over the route
+    every = max(1, len(path) // (updates + 1))
+    done = 0
+    while path and len(path) > 1 and done < updates:
+        steps = min(every, len(path) - 1)
+        cell, path = path[steps], path[steps:]
+        if len(path) < 4:
+            break
+        ahead = path[int(rng.integers(2, min(len(path) - 1, 12) + 1))]
+        if ahead == goal:
+            continue
+        grid.set_cells([ahead[0], ahead[0] + 1, ahead[0]], [ahead[1], ahead[1], ahead[1] + 1])
+        done += 1
+
+        planner._blocked()  # the padded grid copy is shared with plain queries
+        began = time.perf_counter()
+        planner.find_cells(cell, goal)
+        times["astar"].append(1000 * (time.perf_counter() - began))
+        expanded["astar"] += planner.stats["last_expanded"]
+
+        began = time.perf_counter()
+        path = replanner.plan(cell, goal)
+        times["dstar"].append(1000 * (time.perf_counter() - began))
+        expanded["dstar"] += replanner.stats["last_expanded"]
+    return done, times, expanded
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=300)
+    parser.add_argument("--density", type=float, default=0.1, help="share of blocked cells")
+    parser.add_argument("--updates", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'updates':>8} {'planner':<8} {'mean ms':>9} {'max ms':>9} {'expanded':>10}")
+    for updates in args.updates:
+        with contextlib.redirect_stdout(io.StringIO()):
+            done, times, expanded = drive(args.size, args.density, updates, args.seed)
+        for name in ("astar", "dstar"):
+            if not times[name]:
+                continue
+            print(f"{done:>8} {name:<8} {np.mean(times[name]):>9.2f} {np.max(times[name]):>9.2f} "
+                  f"{expanded[name] // len(times[name]):>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark - Perception Pipeline on a Recording
+==============================================
+
+Replays a recording made with `python main.py --record DIR` through the
+perception path and reports per-stage cost, so changes can be compared on
+the same input on a dev machine:
+
+    camera -> activity gate -> face recognition -> object detection
+    sonar  -> EnvironmentalAwareness.check_path_clear
+
+Unthrottled (default) every frame is processed as fast as possible and the
+run is deterministic; `--realtime` replays at the recorded pace, like on the
+robot, and shows how many frames the pipeline keeps up with.
+
+`--save` writes the results to JSON and `--baseline` compares against such a
+file, flagging stages that got slower by more than `--tolerance`.
+
+Usage:
+    python benchmarks/bench_replay.py recordings/hallway
+    python benchmarks/bench_replay.py recordings/hallway --save baseline.json
+    python benchmarks/bench_replay.py recordings/hallway --baseline baseline.json --tolerance 0.1
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.activity_gate import ActivityGate
+from ai.vision import VisionSystem
+from control.sensors import EnvironmentalAwareness
+from interface.camera import Camera
+from utilities.recording import Replay
+
+def timed(totals, stage, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    totals[stage] = totals.get(stage, 0.0) + time.perf_counter() - start
+    return result
+
+def run(path, speed):
+    replay = Replay(path, speed=speed)
+    camera = Camera(capture=replay.capture())
+    vision = VisionSystem()
+    gate = ActivityGate()
+    totals, frames, processed = {}, 0, 0
+
+    start = time.perf_counter()
+    while camera.capture_once():
+        frame = camera.latest(timeout=0)
+        with frame:
+            frames += 1
+            # Gate on recording time so unthrottled runs make the same decisions
+            detect = timed(totals, "gate", gate.should_process, frame.image, replay.clock.now())
+            # Faces are tracked on every frame; detection only when the gate says so
+            timed(totals, "faces", vision.scan_for_people, frame.image, detect)
+            if not detect:
+                continue
+            processed += 1
+            timed(totals, "objects", vision.scan_for_obstacles, frame.image)
+    elapsed = time.perf_counter() - start
+    camera.release()
+
+    sonar = replay.sensor()
+    readings = len(sonar.channel) if sonar else 0
+    if sonar:
+        sensors = EnvironmentalAwareness(front_sonar=sonar)
+        for _ in range(readings):
+            timed(totals, "sonar", sensors.check_path_clear)
+
+    results = {"frames": frames, "processed": processed, "fps": frames / elapsed if elapsed else 0.0}
+    for stage, total in totals.items():
+        count = readings if stage == "sonar" else (frames if stage in ("gate", "faces") else processed)
+        results[f"{stage}_ms"] = 1000 * total / count if count else 0.0
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recording")
+    parser.add_argument("--realtime", action="store_true")
+    parser.add_argument("--save")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown per stage")
+    args = parser.parse_args()
+
+    results = run(args.recording, 1.0 if args.realtime else None)
+    print(f"{results['frames']} frames, {results['processed']} processed, {results['fps']:.1f} fps")
+    for key, value in results.items():
+        if key.endswith("_ms"):
+            print(f"  {key[:-3]:<8} {value:8.2f} ms")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = [key for key, value in results.items() if key.endswith("_ms") and baseline.get(key)
+                       and value > baseline[key] * (1 + args.tolerance)]
+        for key in regressions:
+            print(f"REGRESSION {key[:-3]}: {baseline[key]:.2f} -> {results[key]:.2f} ms")
+        sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark - Tiled Map vs. Dense Grid on Large Floors
+====================================================
+
+Builds a floor plan of square rooms (walls with doors, some furniture) on a
+large floor, of which only the `--explored` share has been mapped so far,
+and stores it both in a dense `GridMap` sized for the whole floor and in a
+`TiledMap` that only allocates the tiles something was marked in. Reports:
+
+    memory:  bytes of each map
+    plan:    mean time, nodes expanded and route length for routes between
+             random free cells of the explored area, with `PathPlanner` on
+             the dense grid and `HierarchicalPlanner` on the tiles
+    ratio:   tiled route length over the optimal dense route, mean and worst
+             case (a coarse route through the wrong door can be much longer)
+
+Usage:
+    python benchmarks/bench_tiled_map.py --sizes 1000 2000 --explored 0.25 --queries 10
+"""
+
+import argparse
+import contextlib
+import io
+import math
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from control.navigation import GridMap, PathPlanner
+from control.tiled_map import TiledMap, HierarchicalPlanner
+
+def floor_plan(size, explored, room, door, rng):
+    """Wall and furniture cells of the explored corner of the floor."""
+    extent = int(size * math.sqrt(explored))
+    mask = np.zeros((extent, extent), dtype=bool)
+    for line in range(0, extent, room):
+        mask[line, :] = True
+        mask[:, line] = True
+        # A door in the middle of each wall segment
+        for start in range(0, extent, room):
+            mask[line, start + room // 2 - door // 2:start + room // 2 + door // 2] = False
+            mask[start + room // 2 - door // 2:start + room // 2 + door // 2, line] = False
+    for _ in range((extent // room) ** 2 * 3):
+        x, y = rng.integers(0, extent, 2)
+        w, h = rng.integers(3, room // 4, 2)
+        mask[y:y + h, x:x + w] = True
+    ys, xs = np.nonzero(mask)
+    return xs, ys, extent
+
+def length(path):
+    return sum(math.hypot(b[0] - a[0], b[1] - a[1]) for a, b in zip(path, path[1:])) if path else float("nan")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000], help="floor side in cells")
+    parser.add_argument("--explored", type=float, default=0.25, help="share of the floor mapped so far")
+    parser.add_argument("--room", type=int, default=80, help="room side in cells")
+    parser.add_argument("--door", type=int, default=10, help="door width in cells")
+    parser.add_argument("--tile-size", type=int, default=32)
+    parser.add_argument("--window", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'floor':>11} {'map':<6} {'MB':>7} {'plan ms':>9} {'expanded':>9} {'length':>8} "
+          f"{'mean ratio':>10} {'max ratio':>9}")
+    for size in args.sizes:
+        rng = np.random.default_rng(args.seed)
+        xs, ys, extent = floor_plan(size, args.explored, args.room, args.door, rng)
+        with contextlib.redirect_stdout(io.StringIO()):
+            dense = GridMap(width=size, height=size)
+            tiled = TiledMap(tile_size=args.tile_size)
+        dense.set_cells(xs, ys)
+        tiled.set_cells(xs, ys)
+        planners = {"dense": PathPlanner(dense), "tiled": HierarchicalPlanner(tiled, window=args.window)}
+        sizes = {"dense": dense.nbytes, "tiled": tiled.nbytes}
+
+        queries = []
+        while len(queries) < args.queries:
+            start, goal = [tuple(int(v) for v in rng.integers(0, extent, 2)) for _ in range(2)]
+            if not dense.is_blocked(*start) and not dense.is_blocked(*goal):
+                queries.append((start, goal))
+        planners["dense"]._blocked()  # build the padded grid outside the timing
+        lengths = {}
+        for name, planner in planners.items():
+            elapsed, expanded, lengths[name] = 0.0, 0, []
+            for start, goal in queries:
+                before = planner.stats.get("expanded", 0) + planner.stats.get("coarse_expanded", 0) \
+                    + planner.stats.get("fine_expanded", 0)
+                began = time.perf_counter()
+                path = planner.find_cells(start, goal)
+                elapsed += time.perf_counter() - began
+                expanded += planner.stats.get("expanded", 0) + planner.stats.get("coarse_expanded", 0) \
+                    + planner.stats.get("fine_expanded", 0) - before
+                lengths[name].append(length(path))
+            ratios = np.array(lengths[name]) / np.array(lengths["dense"])
+            # Start == goal gives 0 / 0; an unreachable pair nan for both
+            ratios = ratios[np.isfinite(ratios)]
+            mean_ratio, max_ratio = (ratios.mean(), ratios.max()) if len(ratios) else (float("nan"),) * 2
+            print(f"{size:>5}x{size:<5} {name:<6} {sizes[name] / 1e6:>7.2f} {1000 * elapsed / len(queries):>9.1f} "
+                  f"{expanded // len(queries):>9} {np.nanmean(lengths[name]):>8.1f} "
+                  f"{mean_ratio:>10.2f} {max_ratio:>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Benchmark - Control Loop Jitter with In-Thread vs. Process Vision
+=================================================================
+
+Runs a 100 Hz control loop (like the robot's safety and motion loops) in the
+main process while vision processes camera frames, and reports how late the
+loop wakes up:
+
+    none:    no vision running (baseline)
+    thread:  vision in a thread of the same process (the old vision_loop)
+    process: vision in a `VisionProcess` worker fed through shared memory
+
+The default workload is a stand-in for dlib face detection that holds the GIL
+for ~`--work-ms` per frame; `--workload faces` runs the real `VisionSystem`
+(needs face_recognition) on the frames of `--clip` or on random frames.
+
+Usage:
+    python benchmarks/bench_vision_jitter.py --seconds 10
+    python benchmarks/bench_vision_jitter.py --workload faces --clip benchmarks/fixtures/video/walk_in.mp4
+"""
+
+import argparse
+import functools
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from ai.vision_worker import VisionProcess, create_vision_system
+from interface.camera import Camera
+from utilities.loop_timer import LoopTimer
+
+class BusyVision:
+    """Holds the GIL like a native detector that doesn't release it."""
+    def __init__(self, work_ms):
+        self.work_ms = work_ms
+
+    def scan_for_people(self, frame):
+        end = time.perf_counter() + self.work_ms / 1000
+        total = 0
+        while time.perf_counter() < end:
+            total += int(frame[0, 0, 0])
+        return None
+
+def create_busy_vision(work_ms):
+    return BusyVision(work_ms)
+
+class PacedCapture:
+    """Camera stand-in delivering frames at a fixed rate (from a clip or random)."""
+    def __init__(self, fps=15, clip=None, shape=(480, 640, 3)):
+        self.interval = 1 / fps
+        self.frames = self.load_clip(clip) if clip else [
+            np.random.default_rng(i).integers(0, 255, shape, dtype=np.uint8) for i in range(8)]
+        self.index = 0
+        self.next_time = time.monotonic()
+
+    @staticmethod
+    def load_clip(path):
+        import cv2
+        cap, frames = cv2.VideoCapture(path), []
+        while len(frames) < 300:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            frames.append(frame)
+        cap.release()
+        return frames
+
+    def read(self, image=None):
+        self.next_time += self.interval
+        time.sleep(max(0.0, self.next_time - time.monotonic()))
+        frame = self.frames[self.index % len(self.frames)]
+        self.index += 1
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame.copy()
+
+    def release(self):
+        pass
+
+def control_loop(seconds, interval=0.01):
+    timer = LoopTimer(interval)
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        timer.wait()
+    return timer.report()
+
+def run(mode, factory, args):
+    camera = Camera(capture=PacedCapture(clip=args.clip))
+    camera.start()
+    running = True
+    worker = None
+    processed = [0]
+
+    if mode == "thread":
+        vision = factory()
+        feed = camera.subscribe("vision")
+        def vision_loop():
+            while running:
+                frame = feed.get(timeout=0.5)
+                if frame is not None:
+                    with frame:
+                        vision.scan_for_people(frame.image)
+                    processed[0] += 1
+        thread = threading.Thread(target=vision_loop, daemon=True)
+        thread.start()
+    elif mode == "process":
+        worker = VisionProcess(camera, factory=factory)
+        worker.start()
+        time.sleep(args.warmup)
+        def result_loop():
+            # Like RobotApp.vision_loop: only results cross into this process
+            while running:
+                if worker.get_result(timeout=0.5) is not None:
+                    processed[0] += 1
+        threading.Thread(target=result_loop, daemon=True).start()
+
+    report = control_loop(args.seconds)
+    running = False
+    if worker:
+        worker.stop()
+    camera.release()
+    return report, processed[0]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--workload", choices=["busy", "faces"], default="busy")
+    parser.add_argument("--work-ms", type=float, default=50)
+    parser.add_argument("--clip")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds for the worker to start")
+    args = parser.parse_args()
+    if args.workload == "busy":
+        factory = functools.partial(create_busy_vision, args.work_ms)
+    else:
+        factory = create_vision_system
+
+    print(f"{'vision':<8} {'frames':>7} {'mean ms':>8} {'p95 ms':>7} {'max ms':>7} {'overruns':>9}")
+    for mode in ("none", "thread", "process"):
+        report, frames = run(mode, factory, args)
+        print(f"{mode:<8} {frames:>7} {report['mean_ms']:>8.2f} {report['p95_ms']:>7.2f} "
+              f"{report['max_ms']:>7.2f} {report['overruns']:>9}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark - Wake Word Gating
+============================
+
+Replays a long recording of the robot's surroundings (background chatter,
+machines, a few addressed commands) through the voice activity detector and
+compares the CPU cost of:
+
+    ungated: every detected utterance goes through full offline recognition
+    gated:   every utterance goes through the wake word spotter, and only the
+             speech after the wake phrase goes through full recognition
+
+CPU load is reported as core-seconds per second of audio, i.e. the average
+share of one core the voice path uses while the robot is idle and listening.
+
+Record a fixture on the robot, e.g. ten minutes of a normal working day:
+    arecord -f S16_LE -r 16000 -c 1 -d 600 benchmarks/fixtures/audio/ambient.wav
+
+Usage:
+    python benchmarks/bench_wake_word.py benchmarks/fixtures/audio/ambient.wav \\
+        --wake-word "hey robot"
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import wave
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from interface.audio_capture import MicrophoneStream
+from interface.streaming_asr import StreamingRecognizer, DEFAULT_MODEL_PATH
+from interface.wake_word import WakeWordDetector
+
+def load_wav(path):
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2 or wav.getnchannels() != 1:
+            raise ValueError(f"{path}: expected 16-bit mono audio")
+        return wav.getframerate(), np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+
+def utterances(samples, rate, chunk=1024):
+    """Runs the VAD over the recording and yields each utterance it cuts."""
+    with tempfile.TemporaryDirectory() as tmp:
+        mic = MicrophoneStream(sample_rate=rate, chunk=chunk, buffer_seconds=60,
+                               calibration_path=os.path.join(tmp, "calibration.json"))
+        for i in range(0, len(samples), chunk):
+            mic.feed(samples[i:i + chunk])
+            utterance = mic.next_utterance(timeout=0)
+            if utterance is not None:
+                yield utterance
+
+def transcribe(asr, pcm):
+    return " ".join(text for kind, text in asr.transcribe_stream([pcm]) if kind == "final" and text)
+
+def run(samples, rate, asr, wake=None):
+    """Returns (process CPU seconds, utterances sent to full recognition, transcripts)."""
+    cpu_start = time.process_time()
+    recognized = []
+    for utterance in utterances(samples, rate):
+        pcm = utterance.tobytes()
+        if wake is not None:
+            end = wake.detect(pcm)
+            if end is None:
+                continue
+            pcm = utterance[int(end * rate):].tobytes()
+            if not pcm:
+                continue
+        asr.reset(rate)
+        recognized.append(transcribe(asr, pcm))
+    return time.process_time() - cpu_start, recognized
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("wav")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--wake-word", default="hey robot")
+    args = parser.parse_args()
+
+    rate, samples = load_wav(args.wav)
+    audio_seconds = len(samples) / rate
+    asr = StreamingRecognizer(args.model, sample_rate=rate)
+    if not asr.available:
+        sys.exit("Offline ASR not available (install vosk and download a model).")
+    wake = WakeWordDetector((args.wake_word,), model=asr.model, sample_rate=rate)
+
+    # The VAD runs in both modes; measure it on its own as the baseline
+    cpu_start = time.process_time()
+    total = sum(1 for _ in utterances(samples, rate))
+    vad_cpu = time.process_time() - cpu_start
+
+    ungated_cpu, ungated = run(samples, rate, asr)
+    gated_cpu, gated = run(samples, rate, asr, wake)
+
+    print(f"=== Wake word gating ({audio_seconds:.0f}s of audio, {total} utterances) ===")
+    print(f"{'mode':<10} {'to ASR':>7} {'CPU s':>8} {'core load':>10}")
+    print(f"{'VAD only':<10} {0:>7} {vad_cpu:>8.2f} {100 * vad_cpu / audio_seconds:>9.1f}%")
+    print(f"{'ungated':<10} {len(ungated):>7} {ungated_cpu:>8.2f} {100 * ungated_cpu / audio_seconds:>9.1f}%")
+    print(f"{'gated':<10} {len(gated):>7} {gated_cpu:>8.2f} {100 * gated_cpu / audio_seconds:>9.1f}%")
+    print(f"spotter CPU per audio second: {wake.report()['cpu_per_audio_second']:.3f} core-seconds")
+    for text in gated:
+        print(f"  passed: '{text}'")
+
+if __name__ == "__main__":
+    main()
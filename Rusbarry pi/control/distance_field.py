@@ -0,0 +1,297 @@
+"""
+Navigation Module - Distance Fields for Frequent Destinations
+=============================================================
+
+The robot drives to the same few places all day (the `come_here` target,
+home, docking spots). For each registered destination this module keeps a
+distance field: the number of 4-connected steps from every cell to the
+destination, computed with a breadth-first wavefront that grows one ring
+per NumPy operation instead of expanding cells one at a time.
+
+With the field in place, a route from any start is a gradient descent: step
+to the neighbour one closer to the goal until it is reached, with no search.
+
+Fields listen to `GridMap` changes and are brought up to date on their
+next query. Changes that don't touch the reachable area are ignored. New
+obstacles are repaired in place: only the cells whose distance depended on
+them are re-flooded from the intact cells around them. Cells that became
+free (e.g. a smaller inflation radius) invalidate the field, which is then
+rebuilt.
+
+Integration Note:
+    - `Navigator.register_destination(name, x, y)` precomputes a field;
+      `Navigator.go_to` uses it whenever the target is a registered cell.
+    - `report()` gives the hit rate (queries answered without a rebuild)
+      and the query time.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+UNREACHABLE = np.iinfo(np.int32).max
+
+
+class DistanceField:
+    """
+    Steps-to-goal for every cell of a `GridMap`, 4-connected.
+
+    Cells are flat indices into the map padded with a one-cell blocked
+    border, as in `PathPlanner`.
+    """
+    def __init__(self, grid_map, goal_cell):
+        """
+        Args:
+            grid_map (GridMap): The map the field is computed on.
+            goal_cell (tuple): Destination (x, y) grid cell.
+        """
+        self.map = grid_map
+        self.goal_cell = (int(goal_cell[0]), int(goal_cell[1]))
+        self.width = grid_map.width + 2
+        self.offsets = np.array([1, -1, self.width, -self.width])
+        self.goal = (self.goal_cell[1] + 1) * self.width + self.goal_cell[0] + 1
+        self.distance = None
+        self.valid = False
+
+    def build(self):
+        """Runs the wavefront from the goal over the current map."""
+        free = ~np.pad(self.map.view(), 1, constant_values=True).ravel()
+        distance = np.full(free.size, UNREACHABLE, dtype=np.int32)
+        # Scratch array to drop repeats from each ring without sorting
+        stamp = np.zeros(free.size, dtype=np.intp)
+        if free[self.goal]:
+            distance[self.goal] = 0
+            ring = np.array([self.goal])
+            level = 0
+            while len(ring):
+                level += 1
+                cells = (ring[:, None] + self.offsets[None, :]).ravel()
+                cells = cells[free[cells] & (distance[cells] == UNREACHABLE)]
+                order = np.arange(len(cells))
+                stamp[cells] = order
+                ring = cells[stamp[cells] == order]
+                distance[ring] = level
+        self.distance = distance
+        self.valid = True
+
+    def apply_changes(self, xs, ys):
+        """
+        Brings the field up to date with changed cells (xs, ys).
+
+        Newly blocked cells are repaired in place; cells that became free can
+        shorten routes anywhere, so they invalidate the field instead.
+
+        Args:
+            xs, ys: Grid cells whose blocked state changed (repeats allowed).
+
+        Returns:
+            str: "unchanged", "repaired" or "invalid".
+        """
+        if not self.valid:
+            return "invalid"
+        xs, ys = np.asarray(xs, dtype=np.intp), np.asarray(ys, dtype=np.intp)
+        cells = (ys + 1) * self.width + xs + 1
+        blocked = self.map.view()[ys, xs]
+        reached = self.distance[cells] != UNREACHABLE
+        # A freed cell matters only if it is the goal or touches the reachable area
+        freed = cells[~blocked & ~reached]
+        if len(freed):
+            around = self.distance[(freed[:, None] + self.offsets[None, :]).ravel()]
+            if np.any(freed == self.goal) or np.any(around != UNREACHABLE):
+                self.valid = False
+                return "invalid"
+        lost = np.unique(cells[blocked & reached])
+        if not len(lost):
+            return "unchanged"
+        self._repair(lost)
+        return "repaired"
+
+    def _repair(self, cells):
+        """Raises the distances that depended on `cells`, which became blocked."""
+        distance, offsets = self.distance, self.offsets
+        # 1. Level by level, cells whose every neighbour one step closer was
+        #    lost lose their distance too
+        lost = np.zeros(distance.size, dtype=bool)
+        lost[cells] = True
+        found = [cells]
+        pending = cells
+        while len(pending):
+            level = distance[pending].min()
+            current = pending[distance[pending] == level]
+            pending = pending[distance[pending] != level]
+            children = np.unique((current[:, None] + offsets[None, :]).ravel())
+            children = children[(distance[children] == level + 1) & ~lost[children]]
+            if not len(children):
+                continue
+            parents = children[:, None] + offsets[None, :]
+            supported = ((distance[parents] == level) & ~lost[parents]).any(axis=1)
+            orphans = children[~supported]
+            lost[orphans] = True
+            found.append(orphans)
+            pending = np.concatenate([pending, orphans])
+        region = np.concatenate(found)
+        distance[region] = UNREACHABLE
+
+        # 2. Re-flood the lost cells (minus the blocked ones) from the intact
+        #    cells around them, lowest distance first
+        lost[cells] = False
+        seeds = np.unique((region[:, None] + offsets[None, :]).ravel())
+        seeds = seeds[distance[seeds] != UNREACHABLE]
+        seeds = seeds[np.argsort(distance[seeds], kind="stable")]
+        seed_levels = distance[seeds]
+        ring, taken = seeds[:0], 0
+        while len(ring) or taken < len(seeds):
+            if not len(ring):
+                level = seed_levels[taken]
+            joining = int(np.searchsorted(seed_levels, level, side="right"))
+            ring = np.concatenate([ring, seeds[taken:joining]])
+            taken = joining
+            ring = np.unique((ring[:, None] + offsets[None, :]).ravel())
+            ring = ring[lost[ring] & (distance[ring] == UNREACHABLE)]
+            level += 1
+            distance[ring] = level
+
+    def steps(self, cell):
+        """Steps from `cell` to the goal, or None if it can't reach it."""
+        value = self.distance[(int(cell[1]) + 1) * self.width + int(cell[0]) + 1]
+        return None if value == UNREACHABLE else int(value)
+
+    def path(self, start_cell):
+        """
+        Descends the field from `start_cell` to the goal.
+
+        Returns:
+            list: (x, y) cells from start to goal, or None if unreachable.
+        """
+        distance = self.distance
+        if distance[self.goal] == UNREACHABLE:
+            # The goal itself is blocked
+            return None
+        current = (int(start_cell[1]) + 1) * self.width + int(start_cell[0]) + 1
+        path = [current]
+        offsets = self.offsets.tolist()
+        if distance[current] == UNREACHABLE and current != self.goal:
+            # The robot may leave a cell that became blocked (e.g. inflation) under it
+            closest = min(offsets, key=lambda offset: distance[current + offset])
+            if distance[current + closest] == UNREACHABLE:
+                return None
+            current += closest
+            path.append(current)
+        while current != self.goal:
+            closer = distance[current] - 1
+            for offset in offsets:
+                if distance[current + offset] == closer:
+                    current += offset
+                    break
+            path.append(current)
+        return [(index % self.width - 1, index // self.width - 1) for index in path]
+
+    @property
+    def nbytes(self):
+        return self.distance.nbytes if self.distance is not None else 0
+
+
+class DistanceFieldCache:
+    """
+    Distance fields for registered destinations, kept valid as the map changes.
+    """
+    def __init__(self, grid_map):
+        """
+        Args:
+            grid_map (GridMap): The map to compute fields on (registers a change listener).
+        """
+        self.map = grid_map
+        self.fields = {}
+        self.names = {}
+        self.pending = []
+        self.lock = threading.Lock()
+        self.stats = {"queries": 0, "hits": 0, "builds": 0, "repairs": 0, "invalidations": 0,
+                      "query_ms": 0.0, "build_ms": 0.0}
+        grid_map.add_listener(self.cells_changed)
+
+    def cells_changed(self, xs, ys):
+        """GridMap listener: queues changed cells, checked on the next query."""
+        with self.lock:
+            self.pending.append((np.asarray(xs).copy(), np.asarray(ys).copy()))
+
+    def register(self, name, goal_cell):
+        """
+        Adds a destination and precomputes its field.
+
+        Args:
+            name (str): Destination name, e.g. "home".
+            goal_cell (tuple): Destination (x, y) grid cell.
+        """
+        goal_cell = (int(goal_cell[0]), int(goal_cell[1]))
+        self.names[name] = goal_cell
+        if goal_cell not in self.fields:
+            self._invalidate()
+            field = DistanceField(self.map, goal_cell)
+            self._build(field)
+            self.fields[goal_cell] = field
+        print(f"Navigation: Registered destination '{name}' at cell {goal_cell}")
+
+    def __contains__(self, goal_cell):
+        return (int(goal_cell[0]), int(goal_cell[1])) in self.fields
+
+    def _build(self, field):
+        began = time.perf_counter()
+        field.build()
+        self.stats["builds"] += 1
+        self.stats["build_ms"] += 1000 * (time.perf_counter() - began)
+
+    def _invalidate(self):
+        """Applies queued map changes to the fields (repairing or invalidating them)."""
+        with self.lock:
+            pending, self.pending = self.pending, []
+        if not pending:
+            return
+        xs = np.concatenate([p[0] for p in pending])
+        ys = np.concatenate([p[1] for p in pending])
+        for field in self.fields.values():
+            if not field.valid:
+                continue
+            outcome = field.apply_changes(xs, ys)
+            if outcome == "repaired":
+                self.stats["repairs"] += 1
+            elif outcome == "invalid":
+                self.stats["invalidations"] += 1
+
+    def path(self, start_cell, goal_cell):
+        """
+        Route from `start_cell` to a registered destination.
+
+        Args:
+            start_cell (tuple): Current (x, y) grid cell.
+            goal_cell (tuple): A registered destination cell.
+
+        Returns:
+            list: (x, y) cells from start to goal, or None if unreachable.
+        """
+        began = time.perf_counter()
+        self._invalidate()
+        field = self.fields[(int(goal_cell[0]), int(goal_cell[1]))]
+        self.stats["queries"] += 1
+        if field.valid:
+            self.stats["hits"] += 1
+        else:
+            self._build(field)
+        inside = 0 <= start_cell[0] < self.map.width and 0 <= start_cell[1] < self.map.height
+        path = field.path(start_cell) if inside else None
+        self.stats["query_ms"] += 1000 * (time.perf_counter() - began)
+        return path
+
+    def report(self):
+        """Returns hit rate and average query time."""
+        queries = self.stats["queries"]
+        return {
+            "destinations": dict(self.names),
+            "queries": queries,
+            "hit_rate": self.stats["hits"] / queries if queries else 0.0,
+            "avg_query_ms": self.stats["query_ms"] / queries if queries else 0.0,
+            "builds": self.stats["builds"],
+            "repairs": self.stats["repairs"],
+            "invalidations": self.stats["invalidations"],
+            "nbytes": sum(field.nbytes for field in self.fields.values()),
+        }
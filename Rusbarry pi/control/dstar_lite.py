@@ -0,0 +1,252 @@
+"""
+Navigation Module - Incremental Replanning (D* Lite)
+====================================================
+
+This module keeps a route up to date while the robot drives and the map
+changes, without planning from scratch each time.
+
+D* Lite (Koenig & Likhachev) searches backwards from the goal and keeps its
+cost-to-goal estimates (g / rhs) between calls. When `GridMap` reports
+changed cells, only the vertices around them are updated, and the next
+`plan()` repairs the part of the search those changes invalidated. Moving
+the start (the robot driving along the route) is handled by the key
+modifier `km` instead of a restart.
+
+Cells are flat indices into the map's blocked grid padded with a one-cell
+blocked border, as in `PathPlanner`.
+
+Integration Note:
+    - `Navigator.go_to` plans with this and repairs the route after every
+      step on which the map changed.
+"""
+
+import heapq
+import math
+import threading
+import time
+
+import numpy as np
+
+SQRT2 = math.sqrt(2)
+INF = float("inf")
+
+
+class DStarLite:
+    """
+    D* Lite planner that listens to a `GridMap` and repairs its search.
+    """
+    def __init__(self, grid_map, connectivity=8):
+        """
+        Args:
+            grid_map (GridMap): The map to plan on (registers a change listener).
+            connectivity (int): 4 or 8 neighbours per cell.
+        """
+        self.map = grid_map
+        self.connectivity = connectivity
+        self.width = grid_map.width + 2
+        self.blocked = None
+        w = self.width
+        self.moves = [(1, 1.0, 0, 0), (-1, 1.0, 0, 0), (w, 1.0, 0, 0), (-w, 1.0, 0, 0)]
+        if connectivity == 8:
+            for dx in (1, -1):
+                for dy in (w, -w):
+                    self.moves.append((dx + dy, SQRT2, dx, dy))
+        self.offsets = {offset for offset, _, _, _ in self.moves}
+        self.pending = []
+        self.lock = threading.Lock()
+        self._sync()
+        self.goal = None
+        self.start = None
+        self.stats = {"plans": 0, "repairs": 0, "expanded": 0, "last_expanded": 0,
+                      "last_ms": 0.0, "cells_changed": 0}
+        grid_map.add_listener(self.cells_changed)
+
+    def cells_changed(self, xs, ys):
+        """GridMap listener: queues changed cells for the next `plan()`."""
+        with self.lock:
+            self.pending.append((np.asarray(xs).copy(), np.asarray(ys).copy()))
+
+    @property
+    def has_changes(self):
+        return bool(self.pending)
+
+    def _index(self, cell):
+        return (int(cell[1]) + 1) * self.width + int(cell[0]) + 1
+
+    def _cell(self, index):
+        y, x = divmod(index, self.width)
+        return (x - 1, y - 1)
+
+    def _h(self, a, b):
+        ay, ax = divmod(a, self.width)
+        by, bx = divmod(b, self.width)
+        dx, dy = abs(ax - bx), abs(ay - by)
+        if self.connectivity == 8:
+            return dx + dy + (SQRT2 - 2) * min(dx, dy)
+        return dx + dy
+
+    def _key(self, index):
+        best = min(self.g.get(index, INF), self.rhs.get(index, INF))
+        # Diagonal costs are irrational: round so equal keys compare equal and
+        # ties fall through to the second component
+        return (round(best + self._h(self.start, index) + self.km, 9), round(best, 9))
+
+    def _push(self, index):
+        key = self._key(index)
+        self.open[index] = key
+        heapq.heappush(self.queue, (key, index))
+
+    def _neighbours(self, index):
+        """(neighbour, step cost) pairs for moves that aren't blocked."""
+        blocked = self.blocked
+        if blocked[index] and index != self.start:
+            # The robot may leave a cell that became blocked (e.g. inflation) under it
+            return
+        for offset, step, side_a, side_b in self.moves:
+            other = index + offset
+            if blocked[other]:
+                continue
+            if side_a and (blocked[index + side_a] or blocked[index + side_b]):
+                continue
+            yield other, step
+
+    def _update_vertex(self, index):
+        if index != self.goal:
+            g = self.g
+            self.rhs[index] = min((step + g.get(other, INF) for other, step in self._neighbours(index)),
+                                  default=INF)
+        self.open.pop(index, None)
+        if self.g.get(index, INF) != self.rhs.get(index, INF):
+            self._push(index)
+
+    def _compute(self):
+        expanded = 0
+        g, rhs, open_keys, queue = self.g, self.rhs, self.open, self.queue
+        # A blocked start can be left but not entered, so its neighbours don't
+        # list it: update it by hand when one of them changes
+        start_blocked = self.blocked[self.start]
+        while queue:
+            key, index = queue[0]
+            if open_keys.get(index) != key:
+                # Stale entry (updated or removed since it was pushed)
+                heapq.heappop(queue)
+                continue
+            start_key = self._key(self.start)
+            if key >= start_key and rhs.get(self.start, INF) == g.get(self.start, INF):
+                break
+            heapq.heappop(queue)
+            del open_keys[index]
+            expanded += 1
+            new_key = self._key(index)
+            if key < new_key:
+                self._push(index)
+            elif g.get(index, INF) > rhs.get(index, INF):
+                g[index] = rhs[index]
+                for other, _ in self._neighbours(index):
+                    self._update_vertex(other)
+            else:
+                g[index] = INF
+                self._update_vertex(index)
+                for other, _ in self._neighbours(index):
+                    self._update_vertex(other)
+            if start_blocked and self.start - index in self.offsets:
+                self._update_vertex(self.start)
+        return expanded
+
+    def _apply_changes(self):
+        """Copies changed cells from the map and updates the vertices around them."""
+        with self.lock:
+            pending, self.pending = self.pending, []
+        if not pending:
+            return 0
+        xs = np.concatenate([p[0] for p in pending]).astype(np.intp)
+        ys = np.concatenate([p[1] for p in pending]).astype(np.intp)
+        indices = np.unique((ys + 1) * self.width + xs + 1)
+        rows, cols = np.divmod(indices, self.width)
+        values = self.map.view()[rows - 1, cols - 1]
+        for index, value in zip(indices.tolist(), values.tolist()):
+            self.blocked[index] = value
+        # Edges into each cell and diagonal edges passing its corners all
+        # start at the cell or one of its neighbours
+        offsets = np.array([0] + [offset for offset, _, _, _ in self.moves])
+        touched = np.unique((indices[:, None] + offsets[None, :]).ravel())
+        for index in touched.tolist():
+            self._update_vertex(index)
+        self.stats["cells_changed"] += len(indices)
+        return len(indices)
+
+    def _sync(self):
+        """Copies the whole blocked grid from the map (before a fresh search)."""
+        with self.lock:
+            self.pending = []
+        padded = np.pad(self.map.view(), 1, constant_values=True)
+        self.blocked = bytearray(padded.ravel().tobytes())
+
+    def _reset(self, start, goal):
+        self.goal = goal
+        self.start = start
+        self.last_start = start
+        self.km = 0.0
+        self.g = {}
+        self.rhs = {goal: 0.0}
+        self.open = {}
+        self.queue = []
+        self._push(goal)
+
+    def plan(self, start_cell, goal_cell):
+        """
+        Returns a path, reusing the previous search when the goal is the same.
+
+        Args:
+            start_cell (tuple): Current (x, y) grid cell of the robot.
+            goal_cell (tuple): Target (x, y) grid cell.
+
+        Returns:
+            list: (x, y) cells from start to goal, or None if unreachable.
+        """
+        began = time.perf_counter()
+        inside = lambda c: 0 <= c[0] < self.map.width and 0 <= c[1] < self.map.height
+        if not inside(start_cell) or not inside(goal_cell):
+            return None
+        start, goal = self._index(start_cell), self._index(goal_cell)
+        if goal != self.goal:
+            self._sync()
+            self._reset(start, goal)
+            self.stats["plans"] += 1
+        else:
+            if start != self.start:
+                # The robot moved: raise all keys instead of re-sorting the queue
+                self.km += self._h(self.last_start, start)
+                self.last_start = start
+                previous, self.start = self.start, start
+                if self.blocked[previous] or self.blocked[start]:
+                    self._update_vertex(previous)
+                    self._update_vertex(start)
+            if self._apply_changes():
+                self.stats["repairs"] += 1
+        expanded = self._compute()
+        self.stats["expanded"] += expanded
+        self.stats["last_expanded"] = expanded
+        path = self._extract()
+        self.stats["last_ms"] = 1000 * (time.perf_counter() - began)
+        return path
+
+    def _extract(self):
+        """Follows the cheapest neighbour (step + g) from the start to the goal."""
+        g = self.g
+        if self.blocked[self.goal] or self.rhs.get(self.start, INF) == INF:
+            return None
+        path = [self._cell(self.start)]
+        current = self.start
+        limit = len(self.blocked)
+        while current != self.goal and len(path) < limit:
+            best, best_cost = None, INF
+            for other, step in self._neighbours(current):
+                cost = step + g.get(other, INF)
+                if cost < best_cost:
+                    best, best_cost = other, cost
+            if best is None or best_cost == INF:
+                return None
+            current = best
+            path.append(self._cell(current))
+        return path
@@ -0,0 +1,183 @@
+"""
+Motion Executor Module
+======================
+
+This module runs timed moves ("forward for 2 seconds", "turn left for 1
+second") on a dedicated control thread, so the main thread never sleeps
+while the robot is moving.
+
+- Moves are queued and can be chained; each one starts as soon as the
+  previous one ends.
+- `cancel_all()` stops the motors immediately from the calling thread and
+  clears the queue, so a stop is honored within one control tick at most.
+- The difference between the planned and actual end of every move
+  (timing jitter) is recorded and reported.
+
+Integration Note:
+    - `RobotApp.process_action` submits moves here instead of calling `time.sleep`.
+"""
+
+import collections
+import threading
+import time
+
+
+class MotionTask:
+    """
+    A single timed move: start the motors, run for `duration`, then stop.
+    """
+    def __init__(self, name, start_fn, duration):
+        self.name = name
+        self.start_fn = start_fn
+        self.duration = duration
+        self.started_at = None
+        self.ends_at = None
+        self.cancelled = False
+        self.done = threading.Event()
+
+    def wait(self, timeout=None):
+        """Blocks until the move finished or was cancelled."""
+        return self.done.wait(timeout)
+
+    def __repr__(self):
+        return f"<MotionTask {self.name} {self.duration}s>"
+
+
+class MotionExecutor:
+    """
+    Executes timed moves on a control thread with a fixed maximum tick.
+    """
+    def __init__(self, mover, tick=0.02):
+        """
+        Initialize the executor.
+
+        Args:
+            mover (RobotMover): The motor controller.
+            tick (float): Longest time in seconds between control checks.
+        """
+        self.mover = mover
+        self.tick = tick
+        self.pending = collections.deque()
+        self.current = None
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.running = False
+        self.thread = None
+        self.jitter_samples = collections.deque(maxlen=500)
+
+    def submit(self, name, start_fn, duration, replace=False):
+        """
+        Queues a timed move.
+
+        Args:
+            name (str): Label for logging (e.g. "move_forward").
+            start_fn (callable): Starts the motors (e.g. `mover.turn_left`).
+            duration (float): Seconds to keep moving.
+            replace (bool): Cancel the current and queued moves first.
+
+        Returns:
+            MotionTask: Handle to wait for or inspect the move.
+        """
+        task = MotionTask(name, start_fn, duration)
+        with self.lock:
+            if replace:
+                self._cancel_locked(stop_motors=False)
+            self.pending.append(task)
+        self.wake.set()
+        return task
+
+    def chain(self, steps):
+        """
+        Queues several moves to run back to back.
+
+        Args:
+            steps (list): (name, start_fn, duration) tuples.
+
+        Returns:
+            list: The MotionTask handles in order.
+        """
+        return [self.submit(name, start_fn, duration) for name, start_fn, duration in steps]
+
+    def _cancel_locked(self, stop_motors=True):
+        for task in list(self.pending) + ([self.current] if self.current else []):
+            task.cancelled = True
+            task.done.set()
+        self.pending.clear()
+        self.current = None
+        if stop_motors:
+            self.mover.stop()
+
+    def cancel_all(self):
+        """Stops the motors now and drops the current and queued moves."""
+        with self.lock:
+            self._cancel_locked()
+        self.wake.set()
+
+    def is_busy(self):
+        with self.lock:
+            return self.current is not None or bool(self.pending)
+
+    def step(self, now=None):
+        """
+        Runs one control tick: ends the current move when due and starts the next.
+
+        Returns:
+            float: Seconds until the next check is needed.
+        """
+        now = now if now is not None else time.monotonic()
+        with self.lock:
+            task = self.current
+            if task is not None and now >= task.ends_at:
+                self.jitter_samples.append(now - task.ends_at)
+                self.current = None
+                task.done.set()
+                if not self.pending:
+                    self.mover.stop()
+
+            if self.current is None and self.pending:
+                task = self.pending.popleft()
+                task.start_fn()
+                task.started_at = now
+                task.ends_at = now + task.duration
+                self.current = task
+
+            if self.current is None:
+                return self.tick
+            return max(0.0, min(self.tick, self.current.ends_at - now))
+
+    def _loop(self):
+        while self.running:
+            delay = self.step()
+            self.wake.wait(delay)
+            self.wake.clear()
+
+    def start(self):
+        """Starts the control thread."""
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Cancels all moves and stops the control thread."""
+        self.cancel_all()
+        self.running = False
+        self.wake.set()
+        if self.thread:
+            self.thread.join(timeout=1)
+
+    def report(self):
+        """
+        Returns timing jitter statistics of completed moves.
+
+        Returns:
+            dict: Number of samples and mean / 95th percentile / max jitter in milliseconds.
+        """
+        samples = sorted(self.jitter_samples)
+        if not samples:
+            return {"moves": 0, "mean_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        return {
+            "moves": len(samples),
+            "mean_ms": 1000 * sum(samples) / len(samples),
+            "p95_ms": 1000 * samples[int(0.95 * (len(samples) - 1))],
+            "max_ms": 1000 * samples[-1],
+        }
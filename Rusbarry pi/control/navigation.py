@@ -3,104 +3,489 @@ Navigation Module - Mapping and Path Planning
 =============================================
 
 This module handles environment mapping and path planning.
-It uses a simplified Grid Map representation and A* (A-Star) algorithm
+It uses a NumPy occupancy grid and A* (A-Star) algorithm
 to calculate routes around obstacles.
 """
 
 import math
 import heapq
+import time
+
+import numpy as np
+
+from .distance_field import DistanceFieldCache
+from .dstar_lite import DStarLite
+
+FREE = 0
+OBSTACLE = 1
+
+SQRT2 = math.sqrt(2)
+INF = float("inf")
+
+
+def disk_offsets(radius):
+    """(dy, dx) offsets of all cells within `radius` cells of the centre."""
+    r = int(math.ceil(radius))
+    dy, dx = np.mgrid[-r:r + 1, -r:r + 1]
+    inside = dy * dy + dx * dx <= radius * radius
+    return dy[inside], dx[inside]
+
+
+def dilate(mask, radius):
+    """
+    Grows the True cells of a boolean mask by a disk of `radius` cells.
+
+    Each row of the disk is a horizontal dilation (a windowed prefix-sum
+    test, computed once per half-width) shifted vertically, so the cost is
+    O(radius) whole-array operations rather than one per cell or offset.
+    """
+    r = int(math.ceil(radius))
+    if r <= 0:
+        return mask.copy()
+    height, width = mask.shape
+    # Prefix sums along x with r cells of padding on both sides
+    prefix = np.zeros((height, width + 2 * r + 1), dtype=np.int32)
+    np.cumsum(mask, axis=1, out=prefix[:, r + 1:width + r + 1])
+    prefix[:, width + r + 1:] = prefix[:, width + r:width + r + 1]
+    rows = {}
+    result = np.zeros_like(mask, dtype=bool)
+    for dy in range(-r, r + 1):
+        if dy * dy > radius * radius:
+            continue
+        half = int(math.floor(math.sqrt(radius * radius - dy * dy)))
+        if half not in rows:
+            # Any obstacle within `half` cells along the row
+            rows[half] = prefix[:, r + half + 1:r + half + 1 + width] > prefix[:, r - half:r - half + width]
+        src = rows[half]
+        if dy >= 0:
+            result[dy:] |= src[:height - dy]
+        else:
+            result[:dy] |= src[-dy:]
+    return result
+
 
 class GridMap:
     """
     Represents the environment as a 2D grid.
     0 = Free space
     1 = Obstacle
+
+    Cells are a uint8 NumPy array (1 byte per cell; `packed()` gives 1 bit).
+    With a robot radius set, cells closer than that to an obstacle are also
+    blocked (inflation), so planners can treat the robot as a point.
     """
-    def __init__(self, key="default", width=20, height=20, resolution=10):
+    def __init__(self, key="default", width=20, height=20, resolution=10, robot_radius=0):
+        """
+        Args:
+            width (int): Cells along x.
+            height (int): Cells along y.
+            resolution (float): cm per cell.
+            robot_radius (float): Robot radius in cm used to inflate obstacles.
+        """
         self.width = width
         self.height = height
         self.resolution = resolution # cm per cell
-        self.grid = [[0 for _ in range(width)] for _ in range(height)]
+        self.robot_radius = robot_radius
+        self.grid = np.zeros((height, width), dtype=np.uint8)
+        # Obstacles plus inflation; what planners see
+        self.blocked = np.zeros((height, width), dtype=bool)
+        # Bumped on every change so planners can cache derived data
+        self.version = 0
+        self.listeners = []
         print(f"Navigation: Initialized GridMap {width}x{height} ({resolution} cm/cell)")
 
+    @property
+    def inflation_cells(self):
+        return self.robot_radius / self.resolution
+
+    def to_cells(self, points):
+        """
+        Converts world coordinates (cm) to in-bounds grid cells.
+
+        Args:
+            points: (N, 2) array-like of (x, y).
+
+        Returns:
+            tuple: (xs, ys) integer arrays of the cells inside the map.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        xs = np.floor(points[:, 0] / self.resolution).astype(np.intp)
+        ys = np.floor(points[:, 1] / self.resolution).astype(np.intp)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        return xs[inside], ys[inside]
+
+    def add_points(self, points):
+        """
+        Marks obstacles from a point cloud (e.g. a sonar sweep or camera detections).
+
+        Args:
+            points: (N, 2) array-like of world coordinates (x, y) in cm.
+
+        Returns:
+            int: Number of cells that became obstacles.
+        """
+        xs, ys = self.to_cells(points)
+        return self.set_cells(xs, ys)
+
+    def set_cells(self, xs, ys):
+        """
+        Marks grid cells as obstacles and inflates around them.
+
+        Returns:
+            int: Number of cells that became obstacles.
+        """
+        cells = np.asarray(ys, dtype=np.intp) * self.width + np.asarray(xs, dtype=np.intp)
+        if len(cells) > self.grid.size // 16:
+            # Large cloud: deduplicate with a scatter instead of a sort
+            touched = np.zeros(self.grid.size, dtype=bool)
+            touched[cells] = True
+            cells = np.flatnonzero(touched & (self.grid.ravel() == FREE))
+        else:
+            cells = np.sort(cells)
+            keep = np.ones(len(cells), dtype=bool)
+            keep[1:] = cells[1:] != cells[:-1]
+            cells = cells[keep & (self.grid.ravel()[cells] == FREE)]
+        if not len(cells):
+            return 0
+        self.grid.ravel()[cells] = OBSTACLE
+        dy, dx = disk_offsets(self.inflation_cells)
+        if len(cells) * len(dy) > self.grid.size:
+            # Dense cloud: one dilation pass over the map is cheaper than stamping
+            new = np.zeros(self.grid.size, dtype=bool)
+            new[cells] = True
+            grown = dilate(new.reshape(self.grid.shape), self.inflation_cells)
+            changed_ys, changed_xs = np.nonzero(grown & ~self.blocked)
+            self.blocked |= grown
+            self._changed(changed_xs, changed_ys)
+            return len(cells)
+        ys, xs = np.divmod(cells, self.width)
+        # Stamp the robot-sized disk around every new obstacle at once
+        cy = (ys[:, None] + dy[None, :]).ravel()
+        cx = (xs[:, None] + dx[None, :]).ravel()
+        inside = (cx >= 0) & (cx < self.width) & (cy >= 0) & (cy < self.height)
+        cx, cy = cx[inside], cy[inside]
+        fresh = ~self.blocked[cy, cx]
+        self.blocked[cy, cx] = True
+        self._changed(cx[fresh], cy[fresh])
+        return len(cells)
+
+    def add_listener(self, listener):
+        """
+        Registers a function called after each change with the cells whose
+        blocked state changed: listener(xs, ys). May contain repeats. Used by
+        incremental planners to repair their search instead of starting over.
+        """
+        self.listeners.append(listener)
+
+    def _changed(self, xs, ys):
+        self.version += 1
+        if len(xs):
+            for listener in self.listeners:
+                listener(xs, ys)
+
     def update_obstacle(self, x, y):
         """Marks a cell as an obstacle given world coordinates."""
-        grid_x = int(x / self.resolution)
-        grid_y = int(y / self.resolution)
-        if 0 <= grid_x < self.width and 0 <= grid_y < self.height:
-            self.grid[grid_y][grid_x] = 1
-            print(f"Map: Obstacle detected at ({x}, {y}) -> Grid[{grid_x}, {grid_y}]")
+        if self.add_points([(x, y)]):
+            print(f"Map: Obstacle detected at ({x}, {y}) -> Grid[{int(x / self.resolution)}, {int(y / self.resolution)}]")
+
+    def inflate(self, robot_radius=None):
+        """
+        Recomputes the blocked layer from all obstacles in one pass.
+
+        Args:
+            robot_radius (float, optional): New robot radius in cm.
+        """
+        if robot_radius is not None:
+            self.robot_radius = robot_radius
+        blocked = dilate(self.grid == OBSTACLE, self.inflation_cells)
+        changed_ys, changed_xs = np.nonzero(blocked != self.blocked)
+        self.blocked = blocked
+        self._changed(changed_xs, changed_ys)
 
     def is_blocked(self, grid_x, grid_y):
         if 0 <= grid_x < self.width and 0 <= grid_y < self.height:
-            return self.grid[grid_y][grid_x] == 1
+            return bool(self.blocked[grid_y, grid_x])
         return True # Out of bounds is blocked
 
+    def view(self):
+        """Read-only view of the blocked cells (obstacles plus inflation) for planners."""
+        view = self.blocked.view()
+        view.flags.writeable = False
+        return view
+
+    def packed(self):
+        """Obstacle cells packed 8 per byte (for saving or sending the map)."""
+        return np.packbits(self.grid, axis=None)
+
+    def load_packed(self, packed):
+        """Restores obstacles saved with `packed()` and re-inflates."""
+        bits = np.unpackbits(np.asarray(packed, dtype=np.uint8), count=self.width * self.height)
+        self.grid = bits.reshape(self.height, self.width)
+        self.inflate()
+
+    @property
+    def nbytes(self):
+        return self.grid.nbytes + self.blocked.nbytes
+
+
 class PathPlanner:
     """
     Implements A* Pathfinding logic.
+
+    Cells are flat indices into the blocked grid padded with a one-cell
+    blocked border, so a neighbour is `index + offset` with no bounds checks.
+    Modes:
+        4-connected A* with the Manhattan heuristic (default)
+        8-connected A* with the octile heuristic (`connectivity=8`)
+        Jump Point Search (`jump_points=True`, 8-connected), which skips
+        over open space instead of expanding every cell of it
+    Diagonal moves never cut the corner of a blocked cell.
     """
-    def __init__(self, grid_map):
+    def __init__(self, grid_map, connectivity=4, jump_points=False):
+        """
+        Args:
+            grid_map (GridMap): The map to plan on.
+            connectivity (int): 4 or 8 neighbours per cell.
+            jump_points (bool): Use Jump Point Search (implies 8-connectivity).
+        """
         self.map = grid_map
+        self.connectivity = 8 if jump_points else connectivity
+        self.jump_points = jump_points
+        self.padded = None
+        self.padded_version = None
+        self.stats = {"searches": 0, "expanded": 0, "last_expanded": 0, "last_ms": 0.0}
 
     def heuristic(self, a, b):
-        return abs(a[0] - b[0]) + abs(a[1] - b[1]) # Manhattan distance
+        dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+        if self.connectivity == 8:
+            return dx + dy + (SQRT2 - 2) * min(dx, dy) # Octile distance
+        return dx + dy # Manhattan distance
+
+    def _blocked(self):
+        """Padded, flattened blocked grid as a bytes-like list, cached per map version."""
+        if self.padded is None or self.padded_version != self.map.version:
+            padded = np.pad(self.map.view(), 1, constant_values=True)
+            self.padded = bytearray(padded.ravel().tobytes())
+            self.padded_version = self.map.version
+        return self.padded
 
     def find_path(self, start, goal):
         """
         Calculates a path from start (x, y) to goal (x, y) in world coords.
-        Returns a list of waypoints.
+        Returns a list of waypoints (grid cells).
         """
         # Convert to grid coords
         start_node = (int(start[0]/self.map.resolution), int(start[1]/self.map.resolution))
         goal_node = (int(goal[0]/self.map.resolution), int(goal[1]/self.map.resolution))
-        
+
         print(f"Navigation: Planning path from {start_node} to {goal_node}...")
-        
-        frontier = []
-        heapq.heappush(frontier, (0, start_node))
-        came_from = {}
-        cost_so_far = {}
-        came_from[start_node] = None
-        cost_so_far[start_node] = 0
-        
-        while frontier:
-            current = heapq.heappop(frontier)[1]
-            
-            if current == goal_node:
-                break
-            
-            # Neighbors (Up, Down, Left, Right)
-            neighbors = [
-                (current[0]+1, current[1]), (current[0]-1, current[1]),
-                (current[0], current[1]+1), (current[0], current[1]-1)
-            ]
-            
-            for next_node in neighbors:
-                if not self.map.is_blocked(next_node[0], next_node[1]):
-                    new_cost = cost_so_far[current] + 1
-                    if next_node not in cost_so_far or new_cost < cost_so_far[next_node]:
-                        cost_so_far[next_node] = new_cost
-                        priority = new_cost + self.heuristic(goal_node, next_node)
-                        heapq.heappush(frontier, (priority, next_node))
-                        came_from[next_node] = current
-                        
-        if goal_node not in came_from:
+        began = time.perf_counter()
+        path = self.find_cells(start_node, goal_node)
+        self.stats["last_ms"] = 1000 * (time.perf_counter() - began)
+
+        if path is None:
             print("Navigation: No path found!")
             return None
-            
-        # Reconstruct path
+        print(f"Navigation: Path found with {len(path)} steps.")
+        return path
+
+    def find_cells(self, start_node, goal_node):
+        """
+        Plans between two grid cells.
+
+        Returns:
+            list: (x, y) cells from start to goal, or None if unreachable.
+        """
+        start_node = (int(start_node[0]), int(start_node[1]))
+        goal_node = (int(goal_node[0]), int(goal_node[1]))
+        blocked = self._blocked()
+        width = self.map.width + 2
+        start = (start_node[1] + 1) * width + start_node[0] + 1
+        goal = (goal_node[1] + 1) * width + goal_node[0] + 1
+        if not (0 <= start_node[0] < self.map.width and 0 <= start_node[1] < self.map.height) \
+                or not (0 <= goal_node[0] < self.map.width and 0 <= goal_node[1] < self.map.height) \
+                or blocked[goal]:
+            return None
+
+        if self.jump_points:
+            came_from, expanded = self._search_jps(blocked, width, start, goal)
+        else:
+            came_from, expanded = self._search(blocked, width, start, goal)
+        self.stats["searches"] += 1
+        self.stats["expanded"] += expanded
+        self.stats["last_expanded"] = expanded
+        if goal not in came_from:
+            return None
+
+        # Reconstruct path, filling in the cells between jump points
         path = []
-        curr = goal_node
-        while curr != start_node:
-            path.append(curr)
-            curr = came_from[curr]
-        path.append(start_node)
+        current = goal
+        while current != start:
+            parent = came_from[current]
+            cy, cx = divmod(current, width)
+            py, px = divmod(parent, width)
+            dx, dy = (cx > px) - (cx < px), (cy > py) - (cy < py)
+            while (cx, cy) != (px, py):
+                path.append((cx - 1, cy - 1))
+                cx, cy = cx - dx, cy - dy
+            current = parent
+        path.append((start_node[0], start_node[1]))
         path.reverse()
-        
-        print(f"Navigation: Path found with {len(path)} steps.")
         return path
 
+    def _octile(self, index, goal_x, goal_y, width):
+        y, x = divmod(index, width)
+        dx, dy = abs(x - goal_x), abs(y - goal_y)
+        if self.connectivity == 8:
+            return dx + dy + (SQRT2 - 2) * min(dx, dy)
+        return dx + dy
+
+    def _search(self, blocked, width, start, goal):
+        """Plain A* over flat indices with a closed set and lazy heap deletion."""
+        straight = (1, -1, width, -width)
+        # (offset, cost, the two orthogonal cells a diagonal move passes)
+        moves = [(offset, 1.0, None, None) for offset in straight]
+        if self.connectivity == 8:
+            for dx in (1, -1):
+                for dy in (width, -width):
+                    moves.append((dx + dy, SQRT2, dx, dy))
+        goal_y, goal_x = divmod(goal, width)
+        heuristic = self._octile
+        closed = bytearray(len(blocked))
+        cost_so_far = {start: 0.0}
+        came_from = {start: None}
+        h = heuristic(start, goal_x, goal_y, width)
+        # Ties on f go to the node with the smaller h (closer to the goal)
+        frontier = [(h, h, start)]
+        expanded = 0
+
+        while frontier:
+            _, _, current = heapq.heappop(frontier)
+            if closed[current]:
+                continue
+            if current == goal:
+                break
+            closed[current] = 1
+            expanded += 1
+            base = cost_so_far[current]
+            for offset, step, side_a, side_b in moves:
+                next_node = current + offset
+                if blocked[next_node] or closed[next_node]:
+                    continue
+                if side_a is not None and (blocked[current + side_a] or blocked[current + side_b]):
+                    continue
+                new_cost = base + step
+                if new_cost < cost_so_far.get(next_node, INF):
+                    cost_so_far[next_node] = new_cost
+                    came_from[next_node] = current
+                    h = heuristic(next_node, goal_x, goal_y, width)
+                    heapq.heappush(frontier, (new_cost + h, h, next_node))
+        return came_from, expanded
+
+    def _jump(self, blocked, width, index, dx, dy, goal):
+        """
+        Moves from `index` in direction (dx, dy) until a jump point.
+
+        Returns:
+            int: The jump point's index, or None if the way is blocked.
+        """
+        step = dx + dy * width
+        while True:
+            if blocked[index]:
+                return None
+            if index == goal:
+                return index
+            if dx and dy:
+                # A straight jump from here finding something makes this a jump point
+                if self._jump(blocked, width, index + dx, dx, 0, goal) is not None or \
+                        self._jump(blocked, width, index + dy * width, 0, dy, goal) is not None:
+                    return index
+                if blocked[index + dx] or blocked[index + dy * width]:
+                    return None
+            elif dx:
+                # Forced neighbour: a wall ends beside us
+                if (not blocked[index - width] and blocked[index - dx - width]) or \
+                        (not blocked[index + width] and blocked[index - dx + width]):
+                    return index
+            else:
+                if (not blocked[index - 1] and blocked[index - 1 - dy * width]) or \
+                        (not blocked[index + 1] and blocked[index + 1 - dy * width]):
+                    return index
+            index += step
+
+    def _jps_directions(self, blocked, width, index, parent):
+        """Directions worth jumping in from `index`, pruned by the arrival direction."""
+        if parent is None:
+            return [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                    if (dx or dy) and not blocked[index + dx + dy * width]
+                    and not (dx and dy and (blocked[index + dx] or blocked[index + dy * width]))]
+        y, x = divmod(index, width)
+        py, px = divmod(parent, width)
+        dx, dy = (x > px) - (x < px), (y > py) - (y < py)
+        directions = []
+        if dx and dy:
+            open_x, open_y = not blocked[index + dx], not blocked[index + dy * width]
+            if open_y:
+                directions.append((0, dy))
+            if open_x:
+                directions.append((dx, 0))
+            if open_x and open_y:
+                directions.append((dx, dy))
+        elif dx:
+            if not blocked[index + dx]:
+                directions.append((dx, 0))
+            for side in (1, -1):
+                if not blocked[index + side * width]:
+                    directions.append((0, side))
+                    if not blocked[index + dx]:
+                        directions.append((dx, side))
+        else:
+            if not blocked[index + dy * width]:
+                directions.append((0, dy))
+            for side in (1, -1):
+                if not blocked[index + side]:
+                    directions.append((side, 0))
+                    if not blocked[index + dy * width]:
+                        directions.append((side, dy))
+        return directions
+
+    def _search_jps(self, blocked, width, start, goal):
+        """A* over jump points only."""
+        goal_y, goal_x = divmod(goal, width)
+        heuristic = self._octile
+        closed = set()
+        cost_so_far = {start: 0.0}
+        came_from = {start: None}
+        h = heuristic(start, goal_x, goal_y, width)
+        frontier = [(h, h, start)]
+        expanded = 0
+
+        while frontier:
+            _, _, current = heapq.heappop(frontier)
+            if current in closed:
+                continue
+            if current == goal:
+                break
+            closed.add(current)
+            expanded += 1
+            y, x = divmod(current, width)
+            for dx, dy in self._jps_directions(blocked, width, current, came_from[current]):
+                jump_point = self._jump(blocked, width, current + dx + dy * width, dx, dy, goal)
+                if jump_point is None or jump_point in closed:
+                    continue
+                jy, jx = divmod(jump_point, width)
+                new_cost = cost_so_far[current] + self._octile_steps(abs(jx - x), abs(jy - y))
+                if new_cost < cost_so_far.get(jump_point, INF):
+                    cost_so_far[jump_point] = new_cost
+                    came_from[jump_point] = current
+                    h = heuristic(jump_point, goal_x, goal_y, width)
+                    heapq.heappush(frontier, (new_cost + h, h, jump_point))
+        return came_from, expanded
+
+    @staticmethod
+    def _octile_steps(dx, dy):
+        return dx + dy + (SQRT2 - 2) * min(dx, dy)
+
 class Navigator:
     """
     High-level navigation manager.
@@ -111,6 +496,10 @@ class Navigator:
         self.sensors = sensors
         self.map = GridMap()
         self.planner = PathPlanner(self.map)
+        # Keeps its search between calls and repairs it when the map changes
+        self.replanner = DStarLite(self.map, connectivity=4)
+        # Precomputed routes to registered destinations (home, docks, ...)
+        self.destinations = DistanceFieldCache(self.map)
         self.current_pos = (0, 0) # Assuming start at 0,0
         
     def scan_and_map(self):
@@ -125,18 +514,86 @@ class Navigator:
             obs_y = self.current_pos[1]
             self.map.update_obstacle(obs_x, obs_y)
 
-    def go_to(self, x, y):
+    def add_obstacles(self, obstacles):
+        """
+        Marks obstacles seen by the camera on the map.
+
+        Obstacles flagged "moving" (people, pets) are skipped: the map has no
+        way to forget them once they walk away. The safety path handles them.
+
+        Args:
+            obstacles (list): Dicts with a "position" (forward, lateral) in cm
+                              relative to the robot (see `VisionSystem.scan_for_obstacles`).
+
+        Returns:
+            int: Number of obstacles marked.
+        """
+        obstacles = [obstacle for obstacle in obstacles if not obstacle.get("moving")]
+        if not obstacles:
+            return 0
+        # Same convention as scan_and_map: the robot faces +x
+        points = np.array([obstacle["position"] for obstacle in obstacles], dtype=np.float64)
+        self.map.add_points(points + self.current_pos)
+        return len(obstacles)
+
+    def register_destination(self, name, x, y):
+        """
+        Precomputes routes to a place the robot often goes to.
+
+        Args:
+            name (str): Destination name, e.g. "home".
+            x, y (float): World coordinates in cm.
+        """
+        resolution = self.map.resolution
+        self.destinations.register(name, (int(x / resolution), int(y / resolution)))
+
+    def _plan(self, start, goal):
+        if goal in self.destinations:
+            return self.destinations.path(start, goal)
+        return self.replanner.plan(start, goal)
+
+    def go_to(self, x, y, cancel_event=None):
         """
         Plans and executes movement to target (x, y).
+
+        The map is updated from the sensors after every step; if it changed,
+        the route is repaired incrementally from the current cell. Routes to
+        registered destinations are read from their distance fields.
+
+        Args:
+            cancel_event (threading.Event, optional): Aborts the route when set.
         """
-        path = self.planner.find_path(self.current_pos, (x, y))
-        if path:
-            # Execute path (mock execution)
-            for node in path:
-                print(f"Navigating to grid cell {node}...")
-                self.mover.move_forward(speed=0.5)
-                # In real code: wait for odometry/encoder feedback
-                # self.current_pos = (node[0]*resolution, node[1]*resolution)
-        else:
+        resolution = self.map.resolution
+        goal = (int(x / resolution), int(y / resolution))
+        start = (int(self.current_pos[0] / resolution), int(self.current_pos[1] / resolution))
+        print(f"Navigation: Planning path from {start} to {goal}...")
+        path = self._plan(start, goal)
+        if not path:
             print("Navigation: Cannot reach target.")
+            return
+        print(f"Navigation: Path found with {len(path)} steps.")
 
+        # Execute path (mock execution)
+        version = self.map.version
+        while len(path) > 1:
+            if cancel_event is not None and cancel_event.is_set():
+                print("Navigation: Route cancelled.")
+                self.mover.stop()
+                return
+            node = path[1]
+            print(f"Navigating to grid cell {node}...")
+            self.mover.move_forward(speed=0.5)
+            # In real code: wait for odometry/encoder feedback
+            self.current_pos = (node[0] * resolution, node[1] * resolution)
+            self.scan_and_map()
+            if self.map.version == version:
+                path = path[1:]
+                continue
+            version = self.map.version
+            began = time.perf_counter()
+            path = self._plan(node, goal)
+            if not path:
+                print("Navigation: Route blocked, cannot reach target.")
+                self.mover.stop()
+                return
+            print(f"Navigation: Map changed, route repaired in {1000 * (time.perf_counter() - began):.1f} ms")
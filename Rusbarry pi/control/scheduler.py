@@ -0,0 +1,237 @@
+"""
+Command Scheduler Module
+========================
+
+This module queues robot actions from all inputs (voice, vision, remote) and
+executes them one at a time in priority order.
+
+- Safety actions (`stop`, obstacle alerts) jump the queue, preempt the action
+  that is currently running and discard queued motion.
+- Each action has a deadline; commands that waited too long are dropped
+  instead of being executed late.
+- Queue depth and wait times are tracked for monitoring.
+
+Integration Note:
+    - `RobotApp` creates the scheduler with `process_action` as the executor.
+    - Inputs call `submit(intent, source=...)` instead of executing directly.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+# Lower number = more urgent
+PRIORITY_SAFETY = 0
+PRIORITY_MOTION = 1
+PRIORITY_MEDIA = 2
+PRIORITY_SOCIAL = 3
+
+ACTION_PRIORITIES = {
+    "stop": PRIORITY_SAFETY,
+    "obstacle_alert": PRIORITY_SAFETY,
+    "move_forward": PRIORITY_MOTION,
+    "move_backward": PRIORITY_MOTION,
+    "turn_left": PRIORITY_MOTION,
+    "turn_right": PRIORITY_MOTION,
+    "come_here": PRIORITY_MOTION,
+    "play_music": PRIORITY_MEDIA,
+    "open_youtube": PRIORITY_MEDIA,
+    "say": PRIORITY_SOCIAL,
+    "greet": PRIORITY_SOCIAL,
+}
+
+# Seconds a command may wait in the queue before it is stale (None = never)
+ACTION_DEADLINES = {
+    "stop": None,
+    "obstacle_alert": None,
+    "move_forward": 3.0,
+    "move_backward": 3.0,
+    "turn_left": 3.0,
+    "turn_right": 3.0,
+    "come_here": 10.0,
+    "play_music": 15.0,
+    "open_youtube": 15.0,
+    "say": 15.0,
+    "greet": 2.0,
+}
+
+
+class ScheduledCommand:
+    """
+    A queued intent together with its scheduling metadata.
+    """
+    def __init__(self, intent, source, priority, deadline):
+        self.intent = intent
+        self.source = source
+        self.priority = priority
+        self.submitted_at = time.monotonic()
+        self.expires_at = None if deadline is None else self.submitted_at + deadline
+        # Set when a more urgent command preempts this one while it runs
+        self.cancel_event = threading.Event()
+
+    @property
+    def action(self):
+        return self.intent.get("action")
+
+    def is_expired(self, now=None):
+        return self.expires_at is not None and (now or time.monotonic()) > self.expires_at
+
+    def __repr__(self):
+        return f"<ScheduledCommand {self.action} from {self.source} (priority {self.priority})>"
+
+
+class CommandScheduler:
+    """
+    Priority queue of robot actions with preemption and deadlines.
+    """
+    def __init__(self, executor, on_preempt=None, max_depth=16):
+        """
+        Initialize the scheduler.
+
+        Args:
+            executor (callable): Runs a command: executor(intent, cancel_event).
+            on_preempt (callable, optional): Called with the running command when a
+                                             safety command preempts it (e.g. stop motors).
+            max_depth (int): Queue bound; beyond it the least urgent command is dropped.
+        """
+        self.executor = executor
+        self.on_preempt = on_preempt
+        self.max_depth = max_depth
+        self.queue = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.current = None
+        self.running = False
+        self.thread = None
+        self.stats = {
+            "submitted": 0, "executed": 0, "dropped_stale": 0, "discarded": 0,
+            "preempted": 0, "total_wait": 0.0, "max_wait": 0.0, "by_source": {},
+        }
+
+    def submit(self, intent, source="voice", priority=None, deadline=-1):
+        """
+        Queues an action.
+
+        Args:
+            intent (dict): The action to execute ({"action": ..., "value": ...}).
+            source (str): Where it came from ("voice", "vision", "sensors", "remote").
+            priority (int, optional): Overrides the default priority of the action.
+            deadline (float, optional): Overrides the default seconds the command may wait.
+
+        Returns:
+            ScheduledCommand: The queued command.
+        """
+        action = intent.get("action")
+        if priority is None:
+            priority = ACTION_PRIORITIES.get(action, PRIORITY_SOCIAL)
+        if deadline == -1:
+            deadline = ACTION_DEADLINES.get(action, 5.0)
+
+        command = ScheduledCommand(intent, source, priority, deadline)
+        with self.condition:
+            self.stats["submitted"] += 1
+            self.stats["by_source"][source] = self.stats["by_source"].get(source, 0) + 1
+
+            if priority == PRIORITY_SAFETY:
+                self._preempt_for(command)
+
+            heapq.heappush(self.queue, (priority, next(self.counter), command))
+            if len(self.queue) > self.max_depth:
+                # Drop the least urgent, most recent command
+                self.queue.remove(max(self.queue))
+                heapq.heapify(self.queue)
+                self.stats["discarded"] += 1
+            self.condition.notify()
+        return command
+
+    def _preempt_for(self, command):
+        """Cancels the running command and drops queued motion. Caller holds the lock."""
+        running = self.current
+        if running is not None and running.priority > PRIORITY_SAFETY:
+            print(f"Scheduler: '{command.action}' preempts '{running.action}'")
+            running.cancel_event.set()
+            self.stats["preempted"] += 1
+            if self.on_preempt:
+                self.on_preempt(running)
+
+        kept = [entry for entry in self.queue if entry[2].priority != PRIORITY_MOTION]
+        self.stats["discarded"] += len(self.queue) - len(kept)
+        self.queue = kept
+        heapq.heapify(self.queue)
+
+    def run_next(self, timeout=None):
+        """
+        Executes the most urgent queued command, waiting up to `timeout` for one.
+
+        Returns:
+            ScheduledCommand: The executed command, or None if nothing ran.
+        """
+        with self.condition:
+            if not self.queue:
+                self.condition.wait(timeout)
+            command = None
+            now = time.monotonic()
+            while self.queue:
+                _, _, candidate = heapq.heappop(self.queue)
+                if candidate.is_expired(now):
+                    print(f"Scheduler: Dropping stale '{candidate.action}' from {candidate.source}")
+                    self.stats["dropped_stale"] += 1
+                    continue
+                command = candidate
+                break
+            if command is None:
+                return None
+
+            wait = now - command.submitted_at
+            self.stats["total_wait"] += wait
+            self.stats["max_wait"] = max(self.stats["max_wait"], wait)
+            self.current = command
+
+        try:
+            self.executor(command.intent, command.cancel_event)
+        except Exception as e:
+            print(f"Scheduler: Action '{command.action}' failed: {e}")
+        finally:
+            with self.condition:
+                self.current = None
+                self.stats["executed"] += 1
+        return command
+
+    def _worker(self):
+        while self.running:
+            self.run_next(timeout=0.5)
+
+    def start(self):
+        """Starts executing commands on a background thread."""
+        self.running = True
+        self.thread = threading.Thread(target=self._worker, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stops the worker thread after the current command."""
+        self.running = False
+        with self.condition:
+            self.condition.notify_all()
+        if self.thread:
+            self.thread.join(timeout=2)
+
+    def queue_depth(self):
+        with self.condition:
+            return len(self.queue)
+
+    def report(self):
+        """
+        Returns scheduler statistics.
+
+        Returns:
+            dict: Queue depth, executed/dropped/preempted counts, average and
+                  maximum queue wait in seconds, and submissions per source.
+        """
+        with self.condition:
+            executed = self.stats["executed"]
+            report = dict(self.stats)
+            report["by_source"] = dict(self.stats["by_source"])
+            report["queue_depth"] = len(self.queue)
+            report["avg_wait"] = self.stats["total_wait"] / executed if executed else 0.0
+        return report
@@ -50,8 +50,13 @@ class EnvironmentalAwareness:
     """
     High-level manager to check for immediate hazards.
     """
-    def __init__(self):
-        self.front_sonar = UltrasonicSensor(trig_pin=5, echo_pin=6)
+    def __init__(self, front_sonar=None):
+        """
+        Args:
+            front_sonar (optional): Distance sensor to use instead of the
+                                    HC-SR04 (e.g. a replay of a recording).
+        """
+        self.front_sonar = front_sonar or UltrasonicSensor(trig_pin=5, echo_pin=6)
         
     def check_path_clear(self):
         """
@@ -0,0 +1,383 @@
+"""
+Navigation Module - Tiled Map and Hierarchical Planning
+=======================================================
+
+`GridMap` is one dense array sized up front. For large floors (a 100 m x 100 m
+warehouse is 1000x1000 cells at 10 cm) most of that is open space nobody
+has seen yet. `TiledMap` splits the world into square tiles of fine cells
+and only allocates a tile when something is marked in it, so the map grows
+in any direction (including negative coordinates) as the robot explores.
+Tiles never allocated are free.
+
+`HierarchicalPlanner` plans in two levels:
+    1. Coarse: A* over tiles, preferring open tiles and only crossing tile
+       borders that have a free cell on both sides.
+    2. Fine: `PathPlanner` on a small dense window around the next few tiles
+       of the coarse route, from the robot to a crossing cell into the last
+       of them (or the goal). Windows are chained until the goal is reached;
+       if one fails, that tile border is excluded and the coarse route redone.
+       When no coarse route is left, a single fine search over the explored
+       area decides.
+
+Routes are longer than a dense A* because they follow the coarse route, in
+exchange for never touching more than a window of cells at once. On the
+floor plans of `benchmarks/bench_tiled_map.py` they are 6-9% longer on
+average and up to 1.6x in the worst case. Short routes on cluttered maps
+fare worse: when the coarse route picks the wrong gap, the route can be
+up to about 3.5x the optimal length.
+
+Integration Note:
+    - Same marking interface as `GridMap` (`add_points`, `set_cells`,
+      `update_obstacle`, `is_blocked`), with robot-radius inflation.
+    - `HierarchicalPlanner.find_path(start, goal)` takes world coordinates
+      like `PathPlanner.find_path`.
+    - Not used by `Navigator` yet, which relies on the dense `GridMap` for
+      D* Lite repairs and distance fields (see the README follow-ups).
+"""
+
+import heapq
+import time
+
+import numpy as np
+
+from .navigation import FREE, OBSTACLE, PathPlanner, disk_offsets
+
+
+class TiledMap:
+    """
+    Occupancy grid made of tiles allocated on demand.
+
+    Each tile holds `tile_size` x `tile_size` cells as a uint8 obstacle
+    array and a boolean blocked array (obstacles plus inflation).
+    """
+    def __init__(self, key="default", resolution=10, tile_size=32, robot_radius=0):
+        """
+        Args:
+            resolution (float): cm per cell.
+            tile_size (int): Cells along each side of a tile.
+            robot_radius (float): Robot radius in cm used to inflate obstacles.
+        """
+        self.resolution = resolution
+        self.tile_size = tile_size
+        self.robot_radius = robot_radius
+        # (tile_x, tile_y) -> arrays indexed [y, x] within the tile
+        self.grids = {}
+        self.blocked = {}
+        self.blocked_counts = {}
+        self.version = 0
+        print(f"Navigation: Initialized TiledMap ({tile_size}x{tile_size} cells per tile, {resolution} cm/cell)")
+
+    @property
+    def inflation_cells(self):
+        return self.robot_radius / self.resolution
+
+    def to_cells(self, points):
+        """
+        Converts world coordinates (cm) to grid cells (unbounded).
+
+        Args:
+            points: (N, 2) array-like of (x, y).
+
+        Returns:
+            tuple: (xs, ys) integer arrays.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        return (np.floor(points[:, 0] / self.resolution).astype(np.intp),
+                np.floor(points[:, 1] / self.resolution).astype(np.intp))
+
+    def _by_tile(self, xs, ys):
+        """Yields (tile key, local xs, local ys) for cells grouped by tile."""
+        size = self.tile_size
+        tx, ty = np.floor_divide(xs, size), np.floor_divide(ys, size)
+        keys, inverse = np.unique(np.stack([tx, ty], axis=1), axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(keys) + 1))
+        for i, (key_x, key_y) in enumerate(keys.tolist()):
+            cells = order[bounds[i]:bounds[i + 1]]
+            yield (key_x, key_y), xs[cells] - key_x * size, ys[cells] - key_y * size
+
+    def _tile(self, key):
+        if key not in self.grids:
+            self.grids[key] = np.zeros((self.tile_size, self.tile_size), dtype=np.uint8)
+            self.blocked[key] = np.zeros((self.tile_size, self.tile_size), dtype=bool)
+            self.blocked_counts[key] = 0
+        return self.grids[key], self.blocked[key]
+
+    def add_points(self, points):
+        """
+        Marks obstacles from a point cloud, allocating tiles as needed.
+
+        Args:
+            points: (N, 2) array-like of world coordinates (x, y) in cm.
+
+        Returns:
+            int: Number of cells that became obstacles.
+        """
+        xs, ys = self.to_cells(points)
+        return self.set_cells(xs, ys)
+
+    def set_cells(self, xs, ys):
+        """
+        Marks grid cells as obstacles and inflates around them.
+
+        Returns:
+            int: Number of cells that became obstacles.
+        """
+        xs, ys = np.asarray(xs, dtype=np.intp).ravel(), np.asarray(ys, dtype=np.intp).ravel()
+        if not len(xs):
+            return 0
+        new_xs, new_ys = [], []
+        for key, lx, ly in self._by_tile(xs, ys):
+            grid, _ = self._tile(key)
+            fresh = grid[ly, lx] == FREE
+            grid[ly, lx] = OBSTACLE
+            new_xs.append(lx[fresh] + key[0] * self.tile_size)
+            new_ys.append(ly[fresh] + key[1] * self.tile_size)
+        new_xs, new_ys = np.concatenate(new_xs), np.concatenate(new_ys)
+        if not len(new_xs):
+            return 0
+        # Stamp the robot-sized disk around every new obstacle, across tile borders
+        dy, dx = disk_offsets(self.inflation_cells)
+        cx = (new_xs[:, None] + dx[None, :]).ravel()
+        cy = (new_ys[:, None] + dy[None, :]).ravel()
+        for key, lx, ly in self._by_tile(cx, cy):
+            _, blocked = self._tile(key)
+            blocked[ly, lx] = True
+            self.blocked_counts[key] = int(np.count_nonzero(blocked))
+        self.version += 1
+        # Repeats within one call are counted once per cell
+        return len(np.unique(np.stack([new_xs, new_ys], axis=1), axis=0))
+
+    def update_obstacle(self, x, y):
+        """Marks a cell as an obstacle given world coordinates."""
+        if self.add_points([(x, y)]):
+            print(f"Map: Obstacle detected at ({x}, {y}) -> Grid[{int(x // self.resolution)}, {int(y // self.resolution)}]")
+
+    def tile_of(self, cell):
+        return (int(cell[0]) // self.tile_size, int(cell[1]) // self.tile_size)
+
+    def is_blocked(self, grid_x, grid_y):
+        key = self.tile_of((grid_x, grid_y))
+        if key not in self.blocked:
+            return False
+        return bool(self.blocked[key][grid_y - key[1] * self.tile_size, grid_x - key[0] * self.tile_size])
+
+    def tile_blocked(self, key):
+        """Blocked cells of a tile (all free if the tile was never allocated)."""
+        blocked = self.blocked.get(key)
+        if blocked is None:
+            return np.zeros((self.tile_size, self.tile_size), dtype=bool)
+        return blocked
+
+    def window(self, x0, y0, width, height):
+        """
+        Dense copy of the blocked cells in a rectangle.
+
+        Args:
+            x0, y0 (int): Cell at the window's corner; both multiples of `tile_size`.
+            width, height (int): Window size in cells; multiples of `tile_size`.
+
+        Returns:
+            numpy.ndarray: Boolean array indexed [y, x] relative to (x0, y0).
+        """
+        size = self.tile_size
+        blocked = np.zeros((height, width), dtype=bool)
+        for ty in range(height // size):
+            for tx in range(width // size):
+                tile = self.blocked.get((x0 // size + tx, y0 // size + ty))
+                if tile is not None:
+                    blocked[ty * size:(ty + 1) * size, tx * size:(tx + 1) * size] = tile
+        return blocked
+
+    def tile_bounds(self):
+        """(min tile x, min tile y, max tile x, max tile y) of allocated tiles, or None."""
+        if not self.grids:
+            return None
+        keys = np.array(list(self.grids))
+        return tuple(keys.min(axis=0).tolist()) + tuple(keys.max(axis=0).tolist())
+
+    @property
+    def nbytes(self):
+        return sum(grid.nbytes for grid in self.grids.values()) + \
+            sum(blocked.nbytes for blocked in self.blocked.values())
+
+    @property
+    def dense_nbytes(self):
+        """Bytes a `GridMap` covering the same tiles' bounding box would take."""
+        bounds = self.tile_bounds()
+        if bounds is None:
+            return 0
+        cells = (bounds[2] - bounds[0] + 1) * (bounds[3] - bounds[1] + 1) * self.tile_size ** 2
+        return cells * 2
+
+
+class MapWindow:
+    """
+    A dense blocked array presented with the `GridMap` interface `PathPlanner` uses.
+    """
+    def __init__(self, blocked, resolution):
+        self.blocked = blocked
+        self.height, self.width = blocked.shape
+        self.resolution = resolution
+        self.version = 0
+
+    def view(self):
+        return self.blocked
+
+
+class HierarchicalPlanner:
+    """
+    Plans on a `TiledMap`: A* over tiles, then `PathPlanner` in local windows.
+    """
+    def __init__(self, tiled_map, connectivity=4, window=4):
+        """
+        Args:
+            tiled_map (TiledMap): The map to plan on.
+            connectivity (int): 4 or 8 neighbours per cell for fine planning.
+            window (int): Coarse route tiles refined per fine search.
+        """
+        self.map = tiled_map
+        self.connectivity = connectivity
+        self.window = window
+        self.stats = {"searches": 0, "coarse_expanded": 0, "fine_expanded": 0, "windows": 0,
+                      "retries": 0, "fallbacks": 0, "last_ms": 0.0}
+
+    def find_path(self, start, goal):
+        """
+        Calculates a path from start (x, y) to goal (x, y) in world coords.
+        Returns a list of waypoints (grid cells).
+        """
+        start_node = tuple(int(v) for v in np.floor(np.asarray(start) / self.map.resolution))
+        goal_node = tuple(int(v) for v in np.floor(np.asarray(goal) / self.map.resolution))
+        print(f"Navigation: Planning path from {start_node} to {goal_node}...")
+        path = self.find_cells(start_node, goal_node)
+        if path is None:
+            print("Navigation: No path found!")
+            return None
+        print(f"Navigation: Path found with {len(path)} steps.")
+        return path
+
+    def _crossing_open(self, a, b):
+        """Free cells on both sides of the border between adjacent tiles a and b."""
+        blocked_a, blocked_b = self.map.tile_blocked(a), self.map.tile_blocked(b)
+        if b[0] != a[0]:
+            # East/west border: compare columns
+            side_a, side_b = (-1, 0) if b[0] > a[0] else (0, -1)
+            return ~blocked_a[:, side_a] & ~blocked_b[:, side_b]
+        side_a, side_b = (-1, 0) if b[1] > a[1] else (0, -1)
+        return ~blocked_a[side_a, :] & ~blocked_b[side_b, :]
+
+    def _coarse(self, start_tile, goal_tile, banned):
+        """A* over tiles within the explored area (plus a one-tile margin)."""
+        bounds = self.map.tile_bounds() or start_tile + start_tile
+        min_x = min(bounds[0], start_tile[0], goal_tile[0]) - 1
+        min_y = min(bounds[1], start_tile[1], goal_tile[1]) - 1
+        max_x = max(bounds[2], start_tile[0], goal_tile[0]) + 1
+        max_y = max(bounds[3], start_tile[1], goal_tile[1]) + 1
+        area = self.map.tile_size ** 2
+        heuristic = lambda t: abs(t[0] - goal_tile[0]) + abs(t[1] - goal_tile[1])
+        frontier = [(heuristic(start_tile), start_tile)]
+        came_from = {start_tile: None}
+        cost_so_far = {start_tile: 0.0}
+        closed = set()
+        while frontier:
+            _, current = heapq.heappop(frontier)
+            if current in closed:
+                continue
+            if current == goal_tile:
+                break
+            closed.add(current)
+            self.stats["coarse_expanded"] += 1
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                next_tile = (current[0] + dx, current[1] + dy)
+                if next_tile in closed or (current, next_tile) in banned or \
+                        not (min_x <= next_tile[0] <= max_x and min_y <= next_tile[1] <= max_y):
+                    continue
+                if not self._crossing_open(current, next_tile).any():
+                    continue
+                # Crowded tiles cost more to cross
+                new_cost = cost_so_far[current] + 1 + self.map.blocked_counts.get(next_tile, 0) / area
+                if new_cost < cost_so_far.get(next_tile, float("inf")):
+                    cost_so_far[next_tile] = new_cost
+                    came_from[next_tile] = current
+                    heapq.heappush(frontier, (new_cost + heuristic(next_tile), next_tile))
+        if goal_tile not in came_from:
+            return None
+        route, tile = [], goal_tile
+        while tile is not None:
+            route.append(tile)
+            tile = came_from[tile]
+        return route[::-1]
+
+    def _crossing(self, a, b, current, goal):
+        """Cell in tile b next to tile a that is closest to the straight route."""
+        size = self.map.tile_size
+        open_cells = np.flatnonzero(self._crossing_open(a, b))
+        if b[0] != a[0]:
+            x = b[0] * size if b[0] > a[0] else b[0] * size + size - 1
+            cells = [(x, b[1] * size + int(i)) for i in open_cells]
+        else:
+            y = b[1] * size if b[1] > a[1] else b[1] * size + size - 1
+            cells = [(b[0] * size + int(i), y) for i in open_cells]
+        return min(cells, key=lambda c: abs(c[0] - current[0]) + abs(c[1] - current[1])
+                   + abs(c[0] - goal[0]) + abs(c[1] - goal[1]))
+
+    def _refine(self, tiles, current, target):
+        """Fine path from current to target over the bounding box of `tiles` plus a tile margin."""
+        size = self.map.tile_size
+        keys = np.array(tiles)
+        x0, y0 = (keys.min(axis=0) - 1) * size
+        x1, y1 = (keys.max(axis=0) + 2) * size
+        window = MapWindow(self.map.window(int(x0), int(y0), int(x1 - x0), int(y1 - y0)), self.map.resolution)
+        planner = PathPlanner(window, connectivity=self.connectivity)
+        path = planner.find_cells((current[0] - x0, current[1] - y0), (target[0] - x0, target[1] - y0))
+        self.stats["windows"] += 1
+        self.stats["fine_expanded"] += planner.stats["last_expanded"]
+        if path is None:
+            return None
+        return [(int(x + x0), int(y + y0)) for x, y in path]
+
+    def find_cells(self, start_node, goal_node):
+        """
+        Plans between two grid cells.
+
+        Returns:
+            list: (x, y) cells from start to goal, or None if unreachable.
+        """
+        began = time.perf_counter()
+        start_node = (int(start_node[0]), int(start_node[1]))
+        goal_node = (int(goal_node[0]), int(goal_node[1]))
+        self.stats["searches"] += 1
+        if self.map.is_blocked(*goal_node):
+            return None
+        goal_tile = self.map.tile_of(goal_node)
+        banned = set()
+        path, current = [start_node], start_node
+        route, i = self._coarse(self.map.tile_of(current), goal_tile, banned), 0
+        while current != goal_node:
+            if route is None:
+                # No coarse route left: one fine search over the whole explored area
+                self.stats["fallbacks"] += 1
+                bounds = self.map.tile_bounds() or goal_tile + goal_tile
+                segment = self._refine([bounds[:2], bounds[2:], self.map.tile_of(current), goal_tile],
+                                       current, goal_node)
+                self.stats["last_ms"] = 1000 * (time.perf_counter() - began)
+                return path + segment[1:] if segment else None
+            k = min(i + self.window, len(route) - 1)
+            target = goal_node if k == len(route) - 1 else \
+                self._crossing(route[k - 1], route[k], current, goal_node)
+            segment = self._refine(route[i:k + 1], current, target)
+            if segment is None:
+                # The border can't be reached from here: route around it
+                self.stats["retries"] += 1
+                banned.add((route[k - 1], route[k]) if k > i else (route[i], route[i]))
+                if k == i:
+                    route = None
+                    continue
+                route, i = self._coarse(self.map.tile_of(current), goal_tile, banned), 0
+                continue
+            path.extend(segment[1:])
+            current, i = target, k
+        self.stats["last_ms"] = 1000 * (time.perf_counter() - began)
+        return path
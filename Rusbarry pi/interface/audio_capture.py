@@ -0,0 +1,308 @@
+"""
+Interface Module - Persistent Audio Capture
+===========================================
+
+This module keeps one microphone stream open for the lifetime of the robot.
+
+A background thread reads the stream into a fixed-size ring buffer, so audio
+keeps being recorded while the rest of the system is busy transcribing,
+thinking or moving. An energy-based voice activity detector (VAD) marks where
+utterances start and end, and consumers cut those utterances out of the buffer.
+
+The background noise level is adapted continuously and saved to disk, so
+startup doesn't block for an ambient-noise calibration.
+
+Integration Note:
+    - Used by `VoiceRecognizer` when created with `persistent_stream=True`.
+"""
+
+import collections
+import json
+import os
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyaudio
+except ImportError:
+    pyaudio = None
+
+DEFAULT_CALIBRATION_PATH = "data/voice_calibration.json"
+
+
+class AudioRingBuffer:
+    """
+    Fixed-size circular buffer of int16 samples addressed by absolute sample index.
+    """
+    def __init__(self, capacity):
+        """
+        Args:
+            capacity (int): Number of samples kept (e.g. 30 s * 16000 Hz).
+        """
+        self.capacity = capacity
+        self.data = np.zeros(capacity, dtype=np.int16)
+        # Total samples ever written; the buffer holds [total - capacity, total)
+        self.total = 0
+        self.lock = threading.Lock()
+        self.new_data = threading.Condition(self.lock)
+
+    def write(self, samples):
+        """Appends samples, overwriting the oldest ones when full."""
+        samples = samples[-self.capacity:]
+        n = len(samples)
+        with self.lock:
+            start = self.total % self.capacity
+            first = min(n, self.capacity - start)
+            self.data[start:start + first] = samples[:first]
+            self.data[:n - first] = samples[first:]
+            self.total += n
+            self.new_data.notify_all()
+
+    def oldest(self):
+        with self.lock:
+            return max(0, self.total - self.capacity)
+
+    def read(self, start, end):
+        """
+        Copies samples [start, end) out of the buffer.
+
+        Returns:
+            numpy.ndarray: The samples, or None if they were already overwritten.
+        """
+        with self.lock:
+            end = min(end, self.total)
+            if start < self.total - self.capacity or start >= end:
+                return None
+            a, b = start % self.capacity, end % self.capacity
+            if a < b:
+                return self.data[a:b].copy()
+            return np.concatenate((self.data[a:], self.data[:b]))
+
+    def wait_for(self, index, timeout):
+        """Blocks until sample `index` has been written or `timeout` passes."""
+        with self.new_data:
+            return self.new_data.wait_for(lambda: self.total > index, timeout)
+
+
+class EnergyVAD:
+    """
+    Energy-based voice activity detector with an adaptive noise floor.
+    """
+    def __init__(self, sample_rate=16000, noise_floor=300.0, ratio=3.0, min_threshold=200.0,
+                 start_frames=2, end_silence=0.6, pre_roll=0.3, max_utterance=10.0):
+        """
+        Args:
+            sample_rate (int): Samples per second.
+            noise_floor (float): Initial RMS of background noise (e.g. from the calibration cache).
+            ratio (float): Speech must be this many times louder than the noise floor.
+            min_threshold (float): Lowest RMS treated as speech.
+            start_frames (int): Consecutive loud frames needed to start an utterance.
+            end_silence (float): Seconds of quiet that end an utterance.
+            pre_roll (float): Seconds kept before the detected start (soft first syllables).
+            max_utterance (float): Utterances are cut at this length.
+        """
+        self.sample_rate = sample_rate
+        self.noise_floor = noise_floor
+        self.ratio = ratio
+        self.min_threshold = min_threshold
+        self.start_frames = start_frames
+        self.end_silence = end_silence
+        self.pre_roll = int(pre_roll * sample_rate)
+        self.max_utterance = int(max_utterance * sample_rate)
+        self.in_speech = False
+        self.loud_run = 0
+        self.utterance_start = None
+        self.last_loud = None
+
+    @property
+    def threshold(self):
+        return max(self.min_threshold, self.noise_floor * self.ratio)
+
+    def process(self, samples, end_index):
+        """
+        Classifies one frame of audio.
+
+        Args:
+            samples (numpy.ndarray): The frame's int16 samples.
+            end_index (int): Absolute index just after the frame in the ring buffer.
+
+        Returns:
+            tuple: (start, end) sample indices of an utterance that just ended, or None.
+        """
+        rms = float(np.sqrt(np.mean(samples.astype(np.float32) ** 2))) if len(samples) else 0.0
+        loud = rms > self.threshold
+
+        if not self.in_speech:
+            # Track the background level only while nobody is talking
+            if not loud:
+                self.noise_floor = 0.95 * self.noise_floor + 0.05 * rms
+            self.loud_run = self.loud_run + 1 if loud else 0
+            if self.loud_run >= self.start_frames:
+                self.in_speech = True
+                frames = self.loud_run * len(samples)
+                self.utterance_start = max(0, end_index - frames - self.pre_roll)
+                self.last_loud = end_index
+            return None
+
+        if loud:
+            self.last_loud = end_index
+        quiet_for = end_index - self.last_loud
+        too_long = end_index - self.utterance_start >= self.max_utterance
+        if quiet_for >= self.end_silence * self.sample_rate or too_long:
+            self.in_speech = False
+            self.loud_run = 0
+            return (self.utterance_start, end_index)
+        return None
+
+
+class MicrophoneStream:
+    """
+    Keeps the microphone open on a background thread, feeding a ring buffer and a VAD.
+    """
+    def __init__(self, sample_rate=16000, chunk=1024, buffer_seconds=30,
+                 calibration_path=DEFAULT_CALIBRATION_PATH, device_index=None, source=None):
+        """
+        Args:
+            sample_rate (int): Capture rate in Hz (mono, 16-bit).
+            chunk (int): Samples per read from the device.
+            buffer_seconds (float): Audio history kept in the ring buffer.
+            calibration_path (str): JSON file with the saved noise floor.
+            device_index (int, optional): PyAudio input device.
+            source (optional): An object with PyAudio's stream `read()` interface
+                               to use instead of opening the microphone (e.g. a replay).
+        """
+        self.sample_rate = sample_rate
+        self.chunk = chunk
+        self.device_index = device_index
+        self.calibration_path = calibration_path
+        self.ring = AudioRingBuffer(int(buffer_seconds * sample_rate))
+        self.vad = EnergyVAD(sample_rate, noise_floor=self.load_calibration())
+        self.utterances = collections.deque(maxlen=8)
+        self.utterance_ready = threading.Condition()
+        self.running = False
+        self.thread = None
+        self.audio = None
+        self.stream = source
+        self.sinks = []
+        self.stats = {"chunks": 0, "utterances": 0, "overruns": 0, "device_errors": 0}
+
+    def load_calibration(self):
+        """Returns the saved noise floor, or a default if none was saved yet."""
+        try:
+            with open(self.calibration_path) as f:
+                return float(json.load(f)["noise_floor"])
+        except (OSError, ValueError, KeyError):
+            return 300.0
+
+    def save_calibration(self):
+        directory = os.path.dirname(self.calibration_path)
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.calibration_path, "w") as f:
+                json.dump({"noise_floor": self.vad.noise_floor, "saved_at": time.time()}, f)
+        except OSError as e:
+            print(f"[Voice] Could not save calibration: {e}")
+
+    def feed(self, samples):
+        """Adds captured samples to the buffer and runs the VAD on them."""
+        for sink in self.sinks:
+            sink(samples, time.monotonic())
+        self.ring.write(samples)
+        self.stats["chunks"] += 1
+        segment = self.vad.process(samples, self.ring.total)
+        if segment is not None:
+            with self.utterance_ready:
+                self.utterances.append(segment)
+                self.stats["utterances"] += 1
+                self.utterance_ready.notify_all()
+
+    def _loop(self):
+        while self.running:
+            try:
+                data = self.stream.read(self.chunk, exception_on_overflow=False)
+            except OSError as e:
+                self.stats["device_errors"] += 1
+                print(f"[Voice] Microphone read failed: {e}")
+                time.sleep(0.1)
+                continue
+            self.feed(np.frombuffer(data, dtype=np.int16))
+
+    def start(self):
+        """Opens the microphone once and starts capturing in the background."""
+        if np is None or (pyaudio is None and self.stream is None):
+            print("Interface: Persistent microphone unavailable (pyaudio/numpy missing)")
+            return False
+        if self.stream is None:
+            self.audio = pyaudio.PyAudio()
+            self.stream = self.audio.open(format=pyaudio.paInt16, channels=1, rate=self.sample_rate,
+                                          input=True, frames_per_buffer=self.chunk,
+                                          input_device_index=self.device_index)
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, name="microphone", daemon=True)
+        self.thread.start()
+        print(f"Interface: Microphone stream open ({self.sample_rate} Hz, noise floor {self.vad.noise_floor:.0f})")
+        return True
+
+    def add_sink(self, sink):
+        """
+        Registers a function called from the capture thread with every chunk:
+        sink(samples, timestamp). It must be quick (e.g. appending to a recording).
+        """
+        self.sinks.append(sink)
+
+    def stop(self):
+        """Stops capturing, closes the device and saves the noise calibration."""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=1)
+        if self.stream:
+            self.stream.stop_stream()
+            self.stream.close()
+        if self.audio:
+            self.audio.terminate()
+        self.save_calibration()
+
+    def next_utterance(self, timeout=None):
+        """
+        Waits for the next complete utterance.
+
+        Returns:
+            numpy.ndarray: The utterance's samples, or None on timeout or if it
+                           was overwritten before it could be read.
+        """
+        with self.utterance_ready:
+            if not self.utterance_ready.wait_for(lambda: self.utterances, timeout):
+                return None
+            start, end = self.utterances.popleft()
+        samples = self.ring.read(start, end)
+        if samples is None:
+            self.stats["overruns"] += 1
+        return samples
+
+    def clear_utterances(self):
+        """Forgets utterances that were already consumed some other way (e.g. live decoding)."""
+        with self.utterance_ready:
+            self.utterances.clear()
+
+    def read_from(self, cursor, timeout=0.5):
+        """
+        Returns audio captured since `cursor`, for decoding while the user speaks.
+
+        Returns:
+            tuple: (new cursor, samples or None). If the cursor fell out of the
+                   buffer it jumps to the oldest sample still available.
+        """
+        if not self.ring.wait_for(cursor, timeout):
+            return cursor, None
+        oldest = self.ring.oldest()
+        if cursor < oldest:
+            self.stats["overruns"] += 1
+            cursor = oldest
+        end = self.ring.total
+        return end, self.ring.read(cursor, end)
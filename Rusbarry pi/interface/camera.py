@@ -3,36 +3,304 @@ Interface Module - Camera Manager
 =================================
 
 This module handles video capture and frame processing.
+
+A background thread reads the camera continuously and keeps only the newest
+frame, so consumers always get a fresh image instead of whatever is queued in
+the driver. Frames are read into a small pool of preallocated NumPy buffers
+and handed out as read-only views (no per-frame copies), tagged with a
+sequence number and capture timestamp.
+
+Several consumers (vision, recording, ...) can share one capture; each gets
+its own subscription that counts the frames it skipped and the frames that
+were already old when it got them.
 """
 
+import threading
+import time
+
 try:
     import cv2
 except ImportError:
     cv2 = None
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Frame:
+    """
+    A captured image with its sequence number and capture time.
+
+    The image is a read-only view into the camera's buffer pool; call
+    `release()` (or use the frame as a context manager) when done with it so
+    the buffer can be reused.
+    """
+    def __init__(self, image, seq, timestamp, slot=None, pool=None, generation=None):
+        self.image = image
+        self.seq = seq
+        self.timestamp = timestamp
+        self.slot = slot
+        self.pool = pool
+        self.generation = generation
+
+    @property
+    def age(self):
+        """Seconds since the frame was captured."""
+        return time.monotonic() - self.timestamp
+
+    def release(self):
+        if self.pool is not None:
+            self.pool.release(self.slot, self.generation)
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def __repr__(self):
+        return f"<Frame #{self.seq} {getattr(self.image, 'shape', None)}>"
+
+
+class FramePool:
+    """
+    Preallocated image buffers with per-buffer reference counts.
+
+    The capture thread only writes into buffers that no consumer holds and
+    that are not the published latest frame. Reallocating (on a resolution
+    change) starts a new generation: frames still held from the old buffers
+    keep them alive, and their releases no longer count.
+    """
+    def __init__(self, slots):
+        self.slots = slots
+        self.buffers = None
+        self.refs = [0] * slots
+        self.generation = 0
+        self.lock = threading.Lock()
+
+    def allocate(self, image):
+        with self.lock:
+            self.buffers = [np.empty_like(image) for _ in range(self.slots)]
+            self.refs = [0] * self.slots
+            self.generation += 1
+
+    def free_slot(self, latest):
+        with self.lock:
+            for i, refs in enumerate(self.refs):
+                if refs == 0 and i != latest:
+                    return i
+        return None
+
+    def acquire(self, slot):
+        """Holds a buffer. Caller holds the lock. Returns the pool generation."""
+        self.refs[slot] += 1
+        return self.generation
+
+    def release(self, slot, generation):
+        with self.lock:
+            if generation == self.generation:
+                self.refs[slot] -= 1
+
+
+class FrameSubscriber:
+    """
+    One consumer's view of a shared camera.
+    """
+    def __init__(self, camera, name, stale_after):
+        self.camera = camera
+        self.name = name
+        self.stale_after = stale_after
+        self.last_seq = 0
+        self.stats = {"received": 0, "dropped": 0, "stale": 0}
+
+    def get(self, timeout=1.0):
+        """
+        Waits for a frame newer than the last one this consumer received.
+
+        Returns:
+            Frame: The newest frame (release it when done), or None on timeout.
+        """
+        frame = self.camera.latest(self.last_seq, timeout)
+        if frame is None:
+            return None
+        if self.last_seq:
+            # Frames captured in between were never seen by this consumer
+            self.stats["dropped"] += frame.seq - self.last_seq - 1
+        if frame.age > self.stale_after:
+            self.stats["stale"] += 1
+        self.stats["received"] += 1
+        self.last_seq = frame.seq
+        return frame
+
+
 class Camera:
     """
-    Wrapper for OpenCV VideoCapture.
+    Wrapper for OpenCV VideoCapture with a background capture thread.
     """
-    def __init__(self, camera_index=0):
+    def __init__(self, camera_index=0, capture=None, max_consumers=2):
+        """
+        Args:
+            camera_index (int): OpenCV device index.
+            capture (optional): An object with OpenCV's `read()`/`release()`
+                                interface to use instead of opening a device.
+            max_consumers (int): Frames that may be held at once; sizes the buffer pool.
+        """
         self.camera_index = camera_index
-        if cv2:
-            # self.cap = cv2.VideoCapture(camera_index)
+        self.cap = capture
+        # Latest frame + one being written + one per consumer holding a frame
+        self.pool = FramePool(max_consumers + 2)
+        self.latest_slot = None
+        self.latest_frame = None
+        self.seq = 0
+        self.condition = threading.Condition()
+        self.subscribers = []
+        self.sinks = []
+        self.running = False
+        self.thread = None
+        self.stats = {"captured": 0, "read_failures": 0, "pool_exhausted": 0}
+
+        if self.cap is None and cv2:
+            self.cap = cv2.VideoCapture(camera_index)
+            # Don't let the driver queue up old frames
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        if self.cap is not None:
             print(f"Interface: Camera initialized at index {camera_index}")
         else:
             print("Interface: Camera unavailable (OpenCV not installed)")
 
+    @property
+    def available(self):
+        return self.cap is not None and np is not None
+
+    def start(self):
+        """Starts capturing in the background."""
+        if not self.available or self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, name="camera", daemon=True)
+        self.thread.start()
+
+    def capture_once(self):
+        """
+        Reads one frame from the device into a free buffer and publishes it.
+
+        Returns:
+            bool: False if no frame was captured (device error, or every
+                  buffer is still held by a consumer).
+        """
+        slot = None
+        if self.pool.buffers is not None:
+            slot = self.pool.free_slot(self.latest_slot)
+            if slot is None:
+                self.stats["pool_exhausted"] += 1
+                return False
+            ok, image = self.cap.read(self.pool.buffers[slot])
+        else:
+            ok, image = self.cap.read()
+        if not ok or image is None:
+            self.stats["read_failures"] += 1
+            return False
+        timestamp = time.monotonic()
+
+        if slot is None or image.shape != self.pool.buffers[slot].shape:
+            # First frame (or resolution change): size the pool to match
+            self.pool.allocate(image)
+            slot = 0
+        if image is not self.pool.buffers[slot]:
+            np.copyto(self.pool.buffers[slot], image)
+
+        view = self.pool.buffers[slot].view()
+        view.flags.writeable = False
+        with self.condition:
+            self.seq += 1
+            self.latest_slot = slot
+            self.latest_frame = Frame(view, self.seq, timestamp)
+            self.stats["captured"] += 1
+            self.condition.notify_all()
+        for sink in self.sinks:
+            sink(view, self.latest_frame.seq, timestamp)
+        return True
+
+    def _loop(self):
+        while self.running:
+            if not self.capture_once():
+                time.sleep(0.05)
+
+    def latest(self, after_seq=0, timeout=1.0):
+        """
+        Returns the newest frame once one newer than `after_seq` exists.
+
+        Returns:
+            Frame: A held frame (call `release()`), or None on timeout.
+        """
+        with self.condition:
+            ready = self.condition.wait_for(
+                lambda: self.latest_frame is not None and self.latest_frame.seq > after_seq, timeout)
+            if not ready:
+                return None
+            frame = self.latest_frame
+            with self.pool.lock:
+                generation = self.pool.acquire(self.latest_slot)
+            return Frame(frame.image, frame.seq, frame.timestamp, self.latest_slot, self.pool, generation)
+
+    def subscribe(self, name, stale_after=0.2):
+        """
+        Registers a consumer of this camera.
+
+        Args:
+            name (str): Consumer name for reports.
+            stale_after (float): Frame age in seconds counted as stale.
+
+        Returns:
+            FrameSubscriber: Call `get()` on it for each new frame.
+        """
+        subscriber = FrameSubscriber(self, name, stale_after)
+        self.subscribers.append(subscriber)
+        return subscriber
+
+    def add_sink(self, sink):
+        """
+        Registers a function called from the capture thread with every new
+        frame: sink(image, seq, timestamp). It must be quick (e.g. a copy
+        into shared memory for another process).
+        """
+        self.sinks.append(sink)
+
     def get_frame(self):
         """
         Captures a single frame.
+
+        Returns:
+            numpy.ndarray: A copy of the newest image, or None. Long-running
+                           consumers should use `subscribe()` to avoid the copy.
         """
-        if cv2:
-            # ret, frame = self.cap.read()
-            # return frame if ret else None
-            return "FRAME_DATA" # Mock
-        return None
+        if not self.available:
+            return None
+        self.start()
+        frame = self.latest(timeout=1.0)
+        if frame is None:
+            return None
+        with frame:
+            return frame.image.copy()
+
+    def report(self):
+        """
+        Returns capture statistics.
+
+        Returns:
+            dict: Frames captured, read failures and per-consumer received /
+                  dropped / stale counts.
+        """
+        report = dict(self.stats)
+        report["consumers"] = {s.name: dict(s.stats) for s in self.subscribers}
+        return report
 
     def release(self):
-        if cv2:
-            # self.cap.release()
-            pass
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=1)
+        if self.cap is not None:
+            self.cap.release()
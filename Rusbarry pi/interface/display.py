@@ -30,6 +30,7 @@ class LCDController:
             i2c_addr (hex): I2C address of the display (default generic address).
         """
         self.address = i2c_addr
+        self._stream_buffer = ""
         # Mock connection logic
         # self.lcd = CharLCD('PCF8574', address=i2c_addr)
         print(f"Interface: LCD Initialized at address {hex(i2c_addr)}")
@@ -82,6 +83,29 @@ class LCDController:
             # Reduced sleep time for better responsiveness, or use non-blocking approach in main loop
             time.sleep(0.5)
 
+    def show_ai_chunk(self, text_chunk):
+        """
+        Displays a streamed AI response as it arrives.
+
+        Text is buffered and each full 16-character line is shown as soon as
+        it is available, instead of waiting for the whole response.
+
+        Args:
+            text_chunk (str): The next piece of the AI response.
+        """
+        self._stream_buffer += text_chunk
+        chunk_size = 16
+        while len(self._stream_buffer) >= chunk_size:
+            line = self._stream_buffer[:chunk_size]
+            self._stream_buffer = self._stream_buffer[chunk_size:]
+            self.show_text("AI says:", line)
+
+    def end_ai_stream(self):
+        """Shows any text left over from `show_ai_chunk` and resets the stream."""
+        if self._stream_buffer:
+            self.show_text("AI says:", self._stream_buffer)
+        self._stream_buffer = ""
+
     def show_visual_feedback(self, feedback_type):
         """
         Displays iconic or preset visual feedback.
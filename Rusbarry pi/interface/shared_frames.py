@@ -0,0 +1,145 @@
+"""
+Interface Module - Shared Memory Frame Ring
+===========================================
+
+This module passes camera frames to another process without pickling or
+pipes. The frames live in a ring of slots in one `multiprocessing`
+shared memory block:
+
+    header: (slots + 1) x 2 float64
+        row 0:       [latest sequence number, reader heartbeat]
+        row 1 + i:   [sequence number in slot i (-1 while writing), capture time]
+    data:   slots x frame
+
+The writer (the camera's capture thread) fills slot `seq % slots`. A reader
+copies the newest slot out and checks the slot's sequence number before and
+after the copy, so a frame overwritten mid-copy is detected and skipped
+instead of being processed torn.
+
+Integration Note:
+    - `VisionProcess` creates the ring and registers `write` as a camera sink.
+"""
+
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+HEADER_ALIGN = 64
+
+
+class SharedFrameRing:
+    """
+    Fixed ring of frames in shared memory: one writer, any number of readers.
+    """
+    def __init__(self, shape, slots=4, dtype="uint8", name=None):
+        """
+        Args:
+            shape (tuple): Frame shape, e.g. (480, 640, 3).
+            slots (int): Frames kept; a reader may fall this many frames behind.
+            dtype (str): Frame element type.
+            name (str, optional): Attach to an existing ring instead of creating one.
+        """
+        self.shape = tuple(shape)
+        self.slots = slots
+        self.dtype = np.dtype(dtype)
+        frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        header_bytes = (slots + 1) * 2 * 8
+        self.data_offset = -(-header_bytes // HEADER_ALIGN) * HEADER_ALIGN
+        self.owner = name is None
+
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=self.data_offset + slots * frame_bytes)
+        else:
+            # Readers are started through multiprocessing and share the owner's
+            # resource tracker, so the block is still freed only once
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self.header = np.ndarray((slots + 1, 2), dtype=np.float64, buffer=self.shm.buf)
+        self.frames = np.ndarray((slots,) + self.shape, dtype=self.dtype,
+                                 buffer=self.shm.buf, offset=self.data_offset)
+        if self.owner:
+            self.header[:] = 0
+            self.header[1:, 0] = -1
+        self.stats = {"written": 0, "read": 0, "torn": 0, "shape_mismatch": 0}
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def spec(self):
+        """Arguments a reader process needs to attach: (shape, slots, dtype, name)."""
+        return (self.shape, self.slots, self.dtype.str, self.name)
+
+    def write(self, image, seq, timestamp):
+        """
+        Stores a frame (called by the camera's capture thread).
+
+        Returns:
+            bool: False if the frame's shape doesn't match the ring.
+        """
+        if image.shape != self.shape:
+            self.stats["shape_mismatch"] += 1
+            return False
+        slot = seq % self.slots
+        self.header[1 + slot, 0] = -1
+        np.copyto(self.frames[slot], image)
+        self.header[1 + slot, 1] = timestamp
+        self.header[1 + slot, 0] = seq
+        self.header[0, 0] = seq
+        self.stats["written"] += 1
+        return True
+
+    @property
+    def latest_seq(self):
+        return int(self.header[0, 0])
+
+    def read_latest(self, out, after_seq=0):
+        """
+        Copies the newest frame into `out` if it is newer than `after_seq`.
+
+        Args:
+            out (numpy.ndarray): Destination buffer with the ring's frame shape.
+            after_seq (int): Last sequence number the reader already has.
+
+        Returns:
+            tuple: (seq, capture timestamp), or None if there is no new
+                   complete frame.
+        """
+        seq = self.latest_seq
+        if seq <= after_seq:
+            return None
+        slot = seq % self.slots
+        if self.header[1 + slot, 0] != seq:
+            return None
+        timestamp = self.header[1 + slot, 1]
+        np.copyto(out, self.frames[slot])
+        if self.header[1 + slot, 0] != seq:
+            # The writer lapped us during the copy
+            self.stats["torn"] += 1
+            return None
+        self.stats["read"] += 1
+        return seq, timestamp
+
+    def beat(self):
+        """Records that the reader is alive (checked by the supervisor)."""
+        self.header[0, 1] = time.monotonic()
+
+    @property
+    def last_heartbeat(self):
+        return float(self.header[0, 1])
+
+    def close(self):
+        """Detaches; the creating process also frees the memory."""
+        self.header = None
+        self.frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
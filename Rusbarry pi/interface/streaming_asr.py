@@ -0,0 +1,151 @@
+"""
+Interface Module - Offline Streaming Speech Recognition
+=======================================================
+
+This module decodes speech locally with Vosk (Kaldi) while the user is still
+talking. Audio is fed chunk by chunk and the recognizer emits partial
+hypotheses as words are recognized, followed by a final transcript when it
+detects the end of the utterance.
+
+Unlike `recognize_google`, this needs no internet connection and adds no
+network round trip after the user stops talking.
+
+Setup:
+    pip install vosk
+    Download a model (e.g. vosk-model-small-en-us-0.15) from
+    https://alphacephei.com/vosk/models and unpack it into `models/`.
+
+Integration Note:
+    - Used by `VoiceRecognizer` when created with `backend="vosk"`.
+    - Partial transcripts let the AI fast path react before the phrase ends.
+"""
+
+import json
+import os
+import time
+
+try:
+    from vosk import Model, KaldiRecognizer, SetLogLevel
+except ImportError:
+    Model = None
+    KaldiRecognizer = None
+    SetLogLevel = None
+
+DEFAULT_MODEL_PATH = "models/vosk-model-small-en-us-0.15"
+
+
+class StreamingRecognizer:
+    """
+    Chunk-by-chunk offline speech recognizer with partial results.
+    """
+    def __init__(self, model_path=DEFAULT_MODEL_PATH, sample_rate=16000):
+        """
+        Load the acoustic model.
+
+        Args:
+            model_path (str): Directory of an unpacked Vosk model.
+            sample_rate (int): Sample rate (Hz) of the 16-bit mono audio to decode.
+        """
+        self.model_path = model_path
+        self.sample_rate = sample_rate
+        self.model = None
+        self.recognizer = None
+        self.last_partial = ""
+        self.stats = {"audio_seconds": 0.0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "utterances": 0}
+
+        if Model is None:
+            print("Interface: Offline ASR unavailable (vosk not installed)")
+            return
+        if not os.path.isdir(model_path):
+            print(f"Interface: Offline ASR model not found at {model_path}")
+            return
+
+        SetLogLevel(-1)
+        self.model = Model(model_path)
+        self.reset()
+        print(f"Interface: Offline ASR ready ({os.path.basename(model_path)})")
+
+    @property
+    def available(self):
+        return self.model is not None
+
+    def reset(self, sample_rate=None):
+        """Starts a new utterance, optionally at a different sample rate."""
+        if sample_rate:
+            self.sample_rate = sample_rate
+        self.recognizer = KaldiRecognizer(self.model, self.sample_rate)
+        self.last_partial = ""
+
+    def accept_chunk(self, pcm):
+        """
+        Decodes the next piece of audio.
+
+        Args:
+            pcm (bytes): 16-bit little-endian mono samples.
+
+        Returns:
+            tuple: ("partial", text) when the hypothesis changed, ("final", text)
+                   when the recognizer detected the end of an utterance, or None.
+        """
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+
+        if self.recognizer.AcceptWaveform(pcm):
+            text = json.loads(self.recognizer.Result()).get("text", "")
+            self.last_partial = ""
+            self.stats["utterances"] += 1
+            event = ("final", text)
+        else:
+            text = json.loads(self.recognizer.PartialResult()).get("partial", "")
+            event = None
+            if text and text != self.last_partial:
+                self.last_partial = text
+                event = ("partial", text)
+
+        self.stats["wall_seconds"] += time.perf_counter() - wall_start
+        self.stats["cpu_seconds"] += time.process_time() - cpu_start
+        self.stats["audio_seconds"] += len(pcm) / (2 * self.sample_rate)
+        return event
+
+    def finish(self):
+        """
+        Flushes the decoder at the end of the audio.
+
+        Returns:
+            str: The final transcript of the remaining audio.
+        """
+        text = json.loads(self.recognizer.FinalResult()).get("text", "")
+        self.last_partial = ""
+        return text
+
+    def transcribe_stream(self, chunks):
+        """
+        Decodes an iterable of audio chunks.
+
+        Yields:
+            tuple: ("partial", text) and ("final", text) events in order.
+        """
+        for pcm in chunks:
+            event = self.accept_chunk(pcm)
+            if event:
+                yield event
+        text = self.finish()
+        if text:
+            yield ("final", text)
+
+    def report(self):
+        """
+        Returns decoding speed figures.
+
+        Returns:
+            dict: Seconds of audio decoded, real-time factor (decode time /
+                  audio time; below 1.0 keeps up with live audio) and CPU load
+                  relative to one core.
+        """
+        audio = self.stats["audio_seconds"]
+        return {
+            "audio_seconds": audio,
+            "utterances": self.stats["utterances"],
+            "real_time_factor": self.stats["wall_seconds"] / audio if audio else 0.0,
+            "cpu_per_audio_second": self.stats["cpu_seconds"] / audio if audio else 0.0,
+        }
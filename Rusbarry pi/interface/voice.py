@@ -3,26 +3,82 @@ Interface Module - Voice Recognition
 ====================================
 
 This module handles audio input and converts speech to text using
-the SpeechRecognition library. It supports offline engines (Sphinx)
-and online APIs (Google).
+the SpeechRecognition library. It supports offline engines (Sphinx,
+streaming Vosk) and online APIs (Google).
+
+By default the microphone is opened once and recorded continuously
+(see `audio_capture.py`), so nothing said between two commands is lost.
+With a wake word set, only speech addressed to the robot reaches the
+full recognizer (see `wake_word.py`).
 """
 
 import sys
+import time
+
+from .audio_capture import MicrophoneStream
+from .streaming_asr import StreamingRecognizer, DEFAULT_MODEL_PATH
+from .wake_word import WakeWordDetector
 
 try:
     import speech_recognition as sr
 except ImportError:
     sr = None
 
+# Audio after the wake phrase shorter than this is treated as "wake phrase only"
+MIN_COMMAND_SECONDS = 0.3
+
 class VoiceRecognizer:
     """
     Handles listening to the microphone and recognizing speech.
     """
-    def __init__(self):
+    def __init__(self, backend="google", model_path=DEFAULT_MODEL_PATH, on_partial=None,
+                 persistent_stream=True, wake_word=None, audio_source=None):
+        """
+        Initialize the microphone and recognizer.
+
+        Args:
+            backend (str): "google" (online, whole phrase) or "vosk" (offline,
+                           decoded while the user speaks). Falls back to
+                           "google" if Vosk or its model is missing.
+            model_path (str): Vosk model directory for the "vosk" backend.
+            on_partial (callable, optional): Called with partial transcripts (vosk only).
+            persistent_stream (bool): Keep the microphone open in the background with
+                                      voice activity detection instead of reopening it
+                                      (and recalibrating) for every phrase.
+            wake_word (str, optional): Only accept speech starting with this phrase
+                                       (or shortly after it), e.g. "hey robot".
+            audio_source (optional): Replaces the microphone of the persistent
+                                     stream (see `utilities/recording.py`).
+        """
+        self.on_partial = on_partial
+        self.asr = None
+        self.stream = None
+        self.wake = None
+        # Ring buffer position the next live decode resumes from, so audio
+        # captured while the robot was busy is still decoded
+        self.read_cursor = None
+        if sr and backend == "vosk":
+            self.asr = StreamingRecognizer(model_path)
+            if not self.asr.available:
+                print(" - Falling back to online recognition.")
+                self.asr = None
+
         if sr:
             self.recognizer = sr.Recognizer()
-            self.microphone = sr.Microphone()
             print("Interface: Voice Recognizer initialized.")
+            if wake_word:
+                model = self.asr.model if self.asr else None
+                self.wake = WakeWordDetector((wake_word,), model=model, model_path=model_path)
+                print(f" - Wake word: '{wake_word}'")
+            if persistent_stream or audio_source is not None:
+                # Noise level comes from the saved calibration and adapts while running
+                self.stream = MicrophoneStream(source=audio_source)
+                if self.stream.start():
+                    print(" - Ready to listen.")
+                    return
+                self.stream = None
+
+            self.microphone = sr.Microphone()
             # Adjust for ambient noise
             with self.microphone as source:
                 print(" - Adjusting for ambient noise... (Please be quiet)")
@@ -31,32 +87,59 @@ class VoiceRecognizer:
         else:
             print("Interface: Voice Recognition unavailable (libraries missing)")
 
-    def listen(self):
+    def capture(self):
         """
-        Listens for a single command.
-        
+        Records a single phrase from the microphone.
+
         Returns:
-            str: The recognized text, or None if failed/timeout.
+            sr.AudioData: The recorded phrase, or None if nothing was heard.
         """
         if not sr:
             return None
-        
+
         print("[Voice] Listening...")
+        if self.stream:
+            if self.audio_gated:
+                samples = self._next_addressed_utterance(timeout=5)
+            else:
+                samples = self.stream.next_utterance(timeout=5)
+            if samples is None:
+                print("[Voice] Cleanup: No speech detected.")
+                return None
+            return sr.AudioData(samples.tobytes(), self.stream.sample_rate, 2)
+
         try:
             with self.microphone as source:
                 # Listen with a timeout
-                audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=5)
-            
-            print("[Voice] Processing...")
+                return self.recognizer.listen(source, timeout=5, phrase_time_limit=5)
+        except sr.WaitTimeoutError:
+            print("[Voice] Cleanup: No speech detected.")
+            return None
+        except Exception as e:
+            print(f"[Voice] Error: {e}")
+            return None
+
+    def transcribe(self, audio):
+        """
+        Converts recorded audio to text.
+
+        Args:
+            audio (sr.AudioData): A phrase returned by `capture`.
+
+        Returns:
+            str: The recognized text, or None if failed.
+        """
+        if not sr or audio is None:
+            return None
+
+        print("[Voice] Processing...")
+        try:
             # Using Google Web Speech API (default key) - requires internet
             # For offline, use Recognize Sphinx (requires pocketsphinx)
             text = self.recognizer.recognize_google(audio)
             print(f"[Voice] Heard: '{text}'")
-            return text
+            return self._gate_text(text)
             
-        except sr.WaitTimeoutError:
-            print("[Voice] Cleanup: No speech detected.")
-            return None
         except sr.UnknownValueError:
             print("[Voice] Could not understand audio.")
             return None
@@ -67,6 +150,170 @@ class VoiceRecognizer:
             print(f"[Voice] Error: {e}")
             return None
 
+    @property
+    def audio_gated(self):
+        """True when the wake word is spotted on audio, before full recognition runs."""
+        return self.wake is not None and self.wake.available and self.stream is not None
+
+    def _wait_for_wake(self, timeout):
+        """
+        Discards utterances until one starts with the wake phrase.
+
+        Returns:
+            numpy.ndarray: Samples spoken after the wake phrase (may be empty),
+                           or None if no wake phrase was heard within `timeout`.
+        """
+        rate = self.stream.sample_rate
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            samples = self.stream.next_utterance(timeout=remaining) if remaining > 0 else None
+            if samples is None:
+                return None
+            end = self.wake.detect(samples.tobytes())
+            if end is not None:
+                print("[Voice] Wake word heard.")
+                return samples[int(end * rate):]
+
+    def _next_addressed_utterance(self, timeout):
+        """Returns the next utterance meant for the robot, or None."""
+        if not self.wake.is_awake():
+            command = self._wait_for_wake(timeout)
+            if command is None:
+                return None
+            if len(command) >= MIN_COMMAND_SECONDS * self.stream.sample_rate:
+                return command
+        samples = self.stream.next_utterance(timeout=self.wake.window)
+        if samples is not None:
+            self.wake.wake()
+        return samples
+
+    def _gate_text(self, text):
+        """Applies the wake word to a transcript when it could not be checked on audio."""
+        if text is None or self.wake is None or self.audio_gated:
+            return text
+        command = self.wake.match_text(text)
+        if command is None:
+            print("[Voice] Ignored (no wake word).")
+        return command or None
+
+    @property
+    def streaming(self):
+        """True when speech is decoded offline while the user is talking."""
+        return self.asr is not None
+
+    def listen_streaming(self, timeout=5, phrase_time_limit=10):
+        """
+        Listens for a command and decodes it chunk by chunk as it is spoken.
+
+        Partial transcripts are passed to `on_partial` while the user talks.
+
+        Args:
+            timeout (float): Seconds to wait for speech to start.
+            phrase_time_limit (float): Maximum length of a command in seconds.
+
+        Returns:
+            str: The final transcript, or None if nothing was recognized.
+        """
+        print("[Voice] Listening (offline)...")
+        if self.stream:
+            if self.audio_gated and not self.wake.is_awake():
+                command = self._wait_for_wake(timeout)
+                if command is None:
+                    return None
+                # The wake utterance was consumed from the VAD queue: resume live
+                # decoding just before now rather than re-reading it
+                self.read_cursor = None
+                if len(command) >= MIN_COMMAND_SECONDS * self.stream.sample_rate:
+                    # "Hey robot, turn left" in one breath: decode the rest right away
+                    self.asr.reset(self.stream.sample_rate)
+                    events = self.asr.transcribe_stream([command.tobytes()])
+                    text = " ".join(t for kind, t in events if kind == "final" and t)
+                    print(f"[Voice] Heard: '{text}'")
+                    return text or None
+            text = self._listen_streaming_persistent(timeout, phrase_time_limit)
+            if text and self.audio_gated:
+                self.wake.wake()
+            return self._gate_text(text)
+        try:
+            with self.microphone as source:
+                self.asr.reset(source.SAMPLE_RATE)
+                start = time.monotonic()
+                heard = False
+                while True:
+                    pcm = source.stream.read(source.CHUNK)
+                    event = self.asr.accept_chunk(pcm)
+                    elapsed = time.monotonic() - start
+
+                    if event and event[0] == "partial":
+                        heard = True
+                        if self.on_partial:
+                            self.on_partial(event[1])
+                    elif event and event[0] == "final" and event[1]:
+                        print(f"[Voice] Heard: '{event[1]}'")
+                        return self._gate_text(event[1])
+
+                    if not heard and elapsed > timeout:
+                        print("[Voice] Cleanup: No speech detected.")
+                        return None
+                    if elapsed > phrase_time_limit:
+                        text = self.asr.finish()
+                        return self._gate_text(text or None)
+        except Exception as e:
+            print(f"[Voice] Error: {e}")
+            return None
+
+    def _listen_streaming_persistent(self, timeout, phrase_time_limit):
+        """Feeds audio from the always-open microphone to the streaming recognizer."""
+        self.asr.reset(self.stream.sample_rate)
+        # This audio is decoded live, so the VAD's copy of it is not needed
+        self.stream.clear_utterances()
+        ring = self.stream.ring
+        if self.read_cursor is None:
+            # Start a little in the past so the first syllable isn't clipped
+            self.read_cursor = ring.total - self.stream.vad.pre_roll
+        # Resume where the last command ended (as far back as the buffer reaches)
+        cursor = max(ring.oldest(), self.read_cursor)
+        start = time.monotonic()
+        heard = False
+        while True:
+            cursor, samples = self.stream.read_from(cursor)
+            self.read_cursor = cursor
+            event = self.asr.accept_chunk(samples.tobytes()) if samples is not None else None
+            elapsed = time.monotonic() - start
+
+            if event and event[0] == "partial":
+                heard = True
+                if self.on_partial:
+                    self.on_partial(event[1])
+            elif event and event[0] == "final" and event[1]:
+                print(f"[Voice] Heard: '{event[1]}'")
+                return event[1]
+
+            if not heard and elapsed > timeout:
+                print("[Voice] Cleanup: No speech detected.")
+                return None
+            if elapsed > phrase_time_limit:
+                text = self.asr.finish()
+                return text or None
+
+    def close(self):
+        """Closes the persistent microphone stream and saves its noise calibration."""
+        if self.stream:
+            self.stream.stop()
+            self.stream = None
+
+    def listen(self):
+        """
+        Listens for a single command.
+        
+        Returns:
+            str: The recognized text, or None if failed/timeout.
+        """
+        if self.streaming:
+            return self.listen_streaming()
+        return self.transcribe(self.capture())
+
 if __name__ == "__main__":
     # Test
     vr = VoiceRecognizer()
@@ -0,0 +1,148 @@
+"""
+Interface Module - Wake Word Gating
+===================================
+
+This module decides whether an utterance is addressed to the robot before any
+expensive speech recognition or LLM call is made.
+
+Each utterance cut by the voice activity detector is checked by a small
+keyword spotter: a Vosk recognizer restricted to a grammar of the wake phrases,
+which costs a fraction of full dictation decoding. Only speech that starts
+with a wake phrase (or follows one within a short listening window) is passed
+on to the full recognizer.
+
+Without Vosk, the gate falls back to checking the transcript text, which still
+keeps background chatter away from the LLM and the motors.
+
+Integration Note:
+    - Enabled with `VoiceRecognizer(wake_word="hey robot")`.
+"""
+
+import json
+import re
+import time
+
+try:
+    from vosk import Model, KaldiRecognizer
+except ImportError:
+    Model = None
+    KaldiRecognizer = None
+
+from .streaming_asr import DEFAULT_MODEL_PATH
+
+
+class WakeWordDetector:
+    """
+    Grammar-restricted keyword spotter with a listening window after each detection.
+    """
+    def __init__(self, phrases=("hey robot",), model=None, model_path=DEFAULT_MODEL_PATH,
+                 sample_rate=16000, window=8.0):
+        """
+        Args:
+            phrases (tuple): Wake phrases, lower case.
+            model (vosk.Model, optional): An already loaded model to share with
+                                          the streaming recognizer.
+            model_path (str): Vosk model directory, used if `model` is None.
+            sample_rate (int): Sample rate of the audio to check.
+            window (float): Seconds after a detection during which follow-up
+                            commands are accepted without the wake phrase.
+        """
+        self.phrases = [tuple(phrase.lower().split()) for phrase in phrases]
+        self.sample_rate = sample_rate
+        self.window = window
+        self.awake_until = 0.0
+        self.model = model
+        if self.model is None and Model is not None:
+            try:
+                self.model = Model(model_path)
+            except Exception as e:
+                print(f"Interface: Wake word spotter unavailable ({e})")
+        # Restricting the vocabulary is what makes spotting cheap
+        self.grammar = json.dumps([" ".join(p) for p in self.phrases] + ["[unk]"])
+        self.stats = {"checked": 0, "detected": 0, "rejected": 0,
+                      "audio_seconds": 0.0, "cpu_seconds": 0.0}
+
+    @property
+    def available(self):
+        """True when spotting runs on audio; otherwise only `match_text` is usable."""
+        return self.model is not None and KaldiRecognizer is not None
+
+    def is_awake(self, now=None):
+        return (now or time.monotonic()) < self.awake_until
+
+    def wake(self, now=None):
+        """Opens the listening window."""
+        self.awake_until = (now or time.monotonic()) + self.window
+
+    def _find_phrase(self, words):
+        """Returns the index just after the first wake phrase in `words`, or None."""
+        for phrase in self.phrases:
+            for i in range(len(words) - len(phrase) + 1):
+                if tuple(words[i:i + len(phrase)]) == phrase:
+                    return i + len(phrase)
+        return None
+
+    def detect(self, pcm):
+        """
+        Looks for a wake phrase in one utterance.
+
+        Args:
+            pcm (bytes): 16-bit mono samples of the utterance.
+
+        Returns:
+            float: Seconds into the audio where the wake phrase ends, or None
+                   if the utterance is not addressed to the robot.
+        """
+        cpu_start = time.process_time()
+        recognizer = KaldiRecognizer(self.model, self.sample_rate, self.grammar)
+        recognizer.SetWords(True)
+        recognizer.AcceptWaveform(pcm)
+        result = json.loads(recognizer.FinalResult()).get("result", [])
+        self.stats["cpu_seconds"] += time.process_time() - cpu_start
+        self.stats["audio_seconds"] += len(pcm) / (2 * self.sample_rate)
+        self.stats["checked"] += 1
+
+        end = self._find_phrase([w["word"] for w in result])
+        if end is None:
+            self.stats["rejected"] += 1
+            return None
+        self.stats["detected"] += 1
+        self.wake()
+        return result[end - 1]["end"]
+
+    def match_text(self, text):
+        """
+        Text fallback: checks a transcript for a wake phrase.
+
+        Punctuation is ignored, as in `normalize_command`, so "Robot, stop"
+        and "hey robot." match too.
+
+        Returns:
+            str: The command after the wake phrase ("" if there is none), or
+                 None if the transcript is not addressed to the robot. While
+                 the listening window is open the whole text is returned.
+        """
+        words = re.sub(r"[^\w\s']", " ", text).split()
+        end = self._find_phrase([word.lower() for word in words])
+        self.stats["checked"] += 1
+        if end is None:
+            if self.is_awake():
+                return text
+            self.stats["rejected"] += 1
+            return None
+        self.stats["detected"] += 1
+        self.wake()
+        return " ".join(words[end:])
+
+    def report(self):
+        """
+        Returns gating statistics.
+
+        Returns:
+            dict: Utterances checked, detected and rejected, and spotting CPU
+                  cost per second of audio.
+        """
+        audio = self.stats["audio_seconds"]
+        report = {k: self.stats[k] for k in ("checked", "detected", "rejected")}
+        report["cpu_per_audio_second"] = self.stats["cpu_seconds"] / audio if audio else 0.0
+        return report
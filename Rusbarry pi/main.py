@@ -15,41 +15,96 @@ The main loop listens for input, processes it via AI, and executes actions.
 import time
 import threading
 import sys
-import queue
+import asyncio
 
 # Import Modules
 from control.motor_driver import RobotMover
 from control.sensors import EnvironmentalAwareness
 from control.navigation import Navigator
+from control.scheduler import CommandScheduler
+from control.motion_executor import MotionExecutor
 from ai.initialization import initialize_ai_environment
+from ai.async_llm_handler import AsyncLocalLLMHandler
 from ai.vision import VisionSystem
+from ai.vision_worker import VisionProcess
+from ai.activity_gate import ActivityGate
 from interface.display import LCDController
 from interface.voice import VoiceRecognizer
 from interface.camera import Camera
 from utilities.media import MediaController
+from utilities.pipeline import Pipeline
+from utilities.loop_timer import LoopTimer
+from utilities.recording import Recorder, RecordingSensor, Replay
+
+# Actions that don't need the 'value' field and can start as soon as the
+# streamed LLM response names them.
+EARLY_ACTIONS = {"stop", "move_forward", "turn_left", "turn_right", "come_here"}
+
+# Speech is only acted on when addressed to the robot
+WAKE_WORD = "hey robot"
+
+# Navigation destinations (world coordinates in cm) with precomputed routes
+HOME = (0, 0)
+COME_HERE_TARGET = (10, 10)
+
+# People and pets closer than this (cm) in the robot's lane stop forward driving
+MOVING_STOP_DISTANCE = 40
+LANE_HALF_WIDTH = 15
 
 class RobotApp:
-    def __init__(self):
+    def __init__(self, vision_in_process=True, record_path=None, replay=None):
+        """
+        Args:
+            vision_in_process (bool): Run face recognition in a separate worker
+                                      process instead of a thread of this one.
+            record_path (str, optional): Record camera, microphone and sonar to
+                                         this directory.
+            replay (Replay, optional): Play a recording back instead of using
+                                       the camera, microphone and sonar.
+        """
         print(">>> SYSTEM STARTUP <<<")
         
         # 1. Hardware Initialization
         self.lcd = LCDController()
         self.lcd.show_status("BOOTING", "Please Wait...")
         
-        self.camera = Camera()
+        self.replay = replay
+        self.camera = Camera(capture=replay.capture() if replay else None)
         self.mover = RobotMover()
-        self.sensors = EnvironmentalAwareness()
+        self.motion = MotionExecutor(self.mover)
+        self.sensors = EnvironmentalAwareness(front_sonar=replay.sensor() if replay else None)
         self.navigator = Navigator(self.mover, self.sensors)
+        self.navigator.register_destination("home", *HOME)
+        self.navigator.register_destination("come_here", *COME_HERE_TARGET)
         self.media = MediaController()
         
         # 2. AI Initialization
         self.ai = initialize_ai_environment(model_name="llama3.2:3b")
-        self.vision = VisionSystem()
-        self.voice = VoiceRecognizer()
+        self.vision_in_process = vision_in_process
+        # The worker process builds its own VisionSystem
+        self.vision = None if vision_in_process else VisionSystem()
+        self.vision_gate = None if vision_in_process else ActivityGate()
+        self.vision_process = VisionProcess(self.camera, on_obstacles=self.on_obstacles_seen) \
+            if vision_in_process else None
+        self.voice = VoiceRecognizer(backend="vosk", on_partial=self.on_partial_transcript,
+                                     wake_word=WAKE_WORD, audio_source=replay.audio() if replay else None)
+
+        self.recorder = Recorder(record_path) if record_path else None
+        if self.recorder:
+            self.camera.add_sink(self.recorder.frame_sink())
+            self.sensors.front_sonar = RecordingSensor(self.sensors.front_sonar, self.recorder)
+            if self.voice.stream:
+                self.voice.stream.add_sink(self.recorder.audio_sink(sample_rate=self.voice.stream.sample_rate))
         
         # 3. State Management
         self.running = True
-        self.command_queue = queue.Queue()
+        self.stream_llm = True
+        self.last_seen = None
+        self.voice_pipeline = None
+        self.control_timer = LoopTimer(0.1)
+        # Voice, vision and sensor inputs all feed this queue
+        self.scheduler = CommandScheduler(self.process_action,
+                                          on_preempt=lambda command: self.motion.cancel_all())
         
         if self.ai:
             self.lcd.show_visual_feedback("smile")
@@ -59,21 +114,76 @@ class RobotApp:
             self.lcd.show_visual_feedback("alert")
             self.lcd.show_status("ERROR", "AI Offline")
 
+    def on_person_seen(self, name):
+        if name and name != self.last_seen:
+            # Greet people once when they come into view
+            self.scheduler.submit({"action": "greet", "value": name}, source="vision")
+        self.last_seen = name
+
     def vision_loop(self):
         """Background thread for checking visual inputs."""
+        self.camera.start()
+        if self.vision_in_process:
+            # Recognition runs in the worker process; only results come back here
+            if not self.vision_process.start():
+                return
+            while self.running:
+                result = self.vision_process.get_result(timeout=1.0)
+                if result is not None:
+                    self.on_person_seen(result[1])
+            return
+
+        feed = self.camera.subscribe("vision")
         while self.running:
-            frame = self.camera.get_frame()
-            if frame:
-                name = self.vision.scan_for_people(frame)
-                if name:
-                    # If we see someone new, maybe greet them?
-                    # For now, just log it to avoid spamming the AI
-                    # print(f"Seen: {name}")
-                    pass
-            time.sleep(1)
+            frame = feed.get(timeout=1.0)
+            if frame is None:
+                continue
+            with frame:
+                # Faces are tracked between detections, so every frame goes to
+                # the tracker; the gate only decides when detection runs (often
+                # while the scene changes, rarely while it is static)
+                detect = self.vision_gate.should_process(frame.image)
+                start = time.monotonic()
+                name = self.vision.scan_for_people(frame.image, detect=detect)
+                # Same frame buffer, no copy
+                obstacles = self.vision.scan_for_obstacles(frame.image) if detect else []
+                if detect:
+                    self.vision_gate.record_processing(time.monotonic() - start)
+            self.on_person_seen(name)
+            self.on_obstacles_seen(obstacles)
+            # Tracking is cheap but not free: ~10 frames/s is enough to follow faces
+            time.sleep(0.1)
+
+    def on_obstacles_seen(self, obstacles):
+        """Maps static obstacles; people and pets in the way stop the robot instead."""
+        self.navigator.add_obstacles(obstacles)
+        in_lane = any(obstacle.get("moving") and obstacle["position"][0] < MOVING_STOP_DISTANCE
+                      and abs(obstacle["position"][1]) < LANE_HALF_WIDTH for obstacle in obstacles)
+        if in_lane and self.driving_forward():
+            self.scheduler.submit({"action": "obstacle_alert"}, source="vision")
+
+    def driving_forward(self):
+        return self.mover.left_motor.current_speed > 0 and self.mover.right_motor.current_speed > 0
+
+    def safety_loop(self):
+        """Background thread that raises an obstacle alert while driving forward."""
+        while self.running:
+            if self.driving_forward() and not self.sensors.check_path_clear():
+                self.scheduler.submit({"action": "obstacle_alert"}, source="sensors")
+            self.control_timer.wait()
+
+    def process_action(self, intent, cancel_event=None):
+        """
+        Executes the structured command from the AI.
 
-    def process_action(self, intent):
-        """Executes the structured command from the AI."""
+        Args:
+            intent (dict): The action and optional value.
+            cancel_event (threading.Event, optional): Set by the scheduler when a
+                                                      safety command preempts this one.
+
+        Timed moves are handed to the motion executor and run in the background,
+        so this returns immediately and a new command replaces the current move.
+        """
         action = intent.get("action")
         value = intent.get("value")
         
@@ -86,78 +196,232 @@ class RobotApp:
         elif action == "move_forward":
             self.lcd.show_status("MOVING", "Forward")
             if self.sensors.check_path_clear():
-                self.mover.move_forward()
-                time.sleep(2) # Move for 2 seconds
-                self.mover.stop()
+                # Move for 2 seconds
+                self.motion.submit("move_forward", self.mover.move_forward, 2.0, replace=True)
             else:
                 self.lcd.show_visual_feedback("alert")
                 self.lcd.show_text("OBSTACLE", "Cannot Move")
                 
+        elif action == "move_backward":
+            # No rear sensor: back up briefly
+            self.lcd.show_status("MOVING", "Backward")
+            self.motion.submit("move_backward", self.mover.move_backward, 1.0, replace=True)
+
         elif action == "turn_left":
-            self.mover.turn_left()
-            time.sleep(1)
-            self.mover.stop()
+            self.motion.submit("turn_left", self.mover.turn_left, 1.0, replace=True)
             
         elif action == "turn_right":
-            self.mover.turn_right()
-            time.sleep(1)
-            self.mover.stop()
+            self.motion.submit("turn_right", self.mover.turn_right, 1.0, replace=True)
             
         elif action == "stop":
-            self.mover.stop()
+            self.motion.cancel_all()
             self.lcd.show_status("STOPPED", "")
+
+        elif action == "obstacle_alert":
+            self.motion.cancel_all()
+            self.lcd.show_visual_feedback("alert")
+            self.lcd.show_text("OBSTACLE", "Stopped")
+
+        elif action == "greet":
+            self.lcd.show_text("Hello,", value or "there!")
             
         elif action == "play_music" or action == "open_youtube":
             self.lcd.show_status("MEDIA", "Playing...")
-            if value:
-                self.media.play_youtube(value)
-            else:
-                self.media.play_youtube("robot music")
+            self.media.play_youtube(value or "robot music", cancel_event=cancel_event)
                 
         elif action == "come_here":
             self.lcd.show_status("NAVIGATING", "To You")
             # Navigate to 'home' or specific coords
-            self.navigator.go_to(10, 10) 
+            self.motion.cancel_all()
+            self.navigator.go_to(*COME_HERE_TARGET, cancel_event=cancel_event)
             
         else:
             print("Unknown Action")
             
         self.lcd.show_status("READY", "")
 
+    def handle_command(self, cmd_text):
+        """
+        Interprets a voice command and executes it.
+
+        With streaming enabled, motion actions start as soon as the LLM has
+        produced the action name and 'say' text is shown while it is generated.
+        """
+        if not self.stream_llm:
+            intent = self.ai.interpret_command(cmd_text)
+            self.scheduler.submit(intent, source="voice")
+            return
+
+        started = []
+        streamed_say = []
+
+        def on_action(action):
+            if action in EARLY_ACTIONS:
+                started.append(action)
+                self.scheduler.submit({"action": action}, source="voice")
+
+        def on_say(text):
+            streamed_say.append(text)
+            self.lcd.show_ai_chunk(text)
+
+        intent = self.ai.interpret_command_stream(cmd_text, on_action=on_action, on_say=on_say)
+
+        if streamed_say:
+            self.lcd.end_ai_stream()
+            self.lcd.show_status("READY", "")
+        elif not started or intent.get("action") != started[0]:
+            self.scheduler.submit(intent, source="voice")
+
     def run(self):
         """Main event loop."""
         
-        # Start vision in background
+        # Start vision, sensor monitoring and command execution in background
         vision_thread = threading.Thread(target=self.vision_loop, daemon=True)
         vision_thread.start()
+        threading.Thread(target=self.safety_loop, daemon=True).start()
+        self.motion.start()
+        self.scheduler.start()
+        
+        # Voice path: each stage runs concurrently, so the microphone keeps
+        # listening while the AI thinks and the robot moves. Execution is the
+        # command scheduler, which the intent stage submits to.
+        self.voice_pipeline = Pipeline(queue_size=2)
+        if self.voice.streaming:
+            # Offline ASR decodes while recording, so capture and transcription are one stage
+            self.voice_pipeline.add_stage("listen", self.voice.listen)
+        else:
+            self.voice_pipeline.add_stage("capture", self.voice.capture) \
+                               .add_stage("transcribe", self.voice.transcribe)
+        self.voice_pipeline.add_stage("intent", self.resolve_intent)
+        self.voice_pipeline.start()
         
         print(">>> ROBOT IS LISTENING <<<")
         try:
             while self.running:
-                # 1. Listen for voice
-                cmd_text = self.voice.listen()
-                
-                if cmd_text:
-                    self.lcd.show_status("THINKING", "Processing...")
-                    
-                    # 2. Ask AI
-                    if self.ai:
-                        intent = self.ai.interpret_command(cmd_text)
-                        
-                        # 3. Execute
-                        self.process_action(intent)
-                    else:
-                        print("AI Offline, cannot process.")
-                        
-                # Small delay to prevent CPU hogging if listen returns None immediately
-                time.sleep(0.1)
+                time.sleep(1)
                 
         except KeyboardInterrupt:
-            print("\n>>> SHUTTING DOWN <<<")
-            self.running = False
-            self.mover.stop()
-            self.lcd.clear()
+            self.shutdown()
+
+    def on_partial_transcript(self, text):
+        """Stops on a partial "stop" without waiting for the end of the phrase."""
+        matcher = self.ai.matcher if self.ai else None
+        if matcher is None:
+            return
+        intent, confidence = matcher.match(text)
+        if intent and intent["action"] == "stop" and confidence >= matcher.threshold:
+            self.scheduler.submit(intent, source="voice")
+
+    def resolve_intent(self, cmd_text):
+        """Intent stage of the voice pipeline: interprets text and queues the action."""
+        if not cmd_text:
+            return None
+        self.lcd.show_status("THINKING", "Processing...")
+        if self.ai:
+            self.handle_command(cmd_text)
+        else:
+            print("AI Offline, cannot process.")
+        return None
+
+    async def run_async(self):
+        """
+        Main event loop using the asyncio LLM handler.
+
+        A new utterance cancels the command still being interpreted, so "stop"
+        is not stuck behind a slow "go forward". The microphone read is a
+        blocking library call and is awaited through the default executor;
+        the LLM side needs no threads.
+        """
+        vision_thread = threading.Thread(target=self.vision_loop, daemon=True)
+        vision_thread.start()
+        threading.Thread(target=self.safety_loop, daemon=True).start()
+        self.motion.start()
+        self.scheduler.start()
+
+        llm = AsyncLocalLLMHandler.from_handler(self.ai) if self.ai else None
+        loop = asyncio.get_running_loop()
+
+        def on_intent(task):
+            if task.cancelled():
+                return
+            error = task.exception()
+            if error is not None:
+                print(f"AI Error: Command interpretation failed: {error!r}")
+                return
+            self.scheduler.submit(task.result(), source="voice")
+
+        print(">>> ROBOT IS LISTENING (async) <<<")
+        try:
+            while self.running:
+                cmd_text = await loop.run_in_executor(None, self.voice.listen)
+                if not cmd_text:
+                    await asyncio.sleep(0.1)
+                    continue
+
+                if llm:
+                    self.lcd.show_status("THINKING", "Processing...")
+                    llm.submit(cmd_text).add_done_callback(on_intent)
+                else:
+                    print("AI Offline, cannot process.")
+        finally:
+            if llm and llm.current_task:
+                llm.current_task.cancel()
+
+    def shutdown(self):
+        """Stops the robot and prints runtime statistics."""
+        print("\n>>> SHUTTING DOWN <<<")
+        self.running = False
+        if self.voice_pipeline:
+            self.voice_pipeline.stop()
+            print(f"Voice pipeline: {self.voice_pipeline.report()}")
+        if self.voice.wake:
+            print(f"Wake word gate: {self.voice.wake.report()}")
+        self.voice.close()
+        self.scheduler.stop()
+        self.motion.stop()
+        self.mover.stop()
+        self.lcd.clear()
+        self.camera.release()
+        if self.recorder:
+            self.recorder.close()
+        print(f"Camera: {self.camera.report()}")
+        if self.vision_process:
+            print(f"Vision: Worker process {self.vision_process.report()}")
+            self.vision_process.stop()
+        else:
+            print(f"Vision: Face tracking {self.vision.tracker.report()}")
+            print(f"Vision: Activity gate {self.vision_gate.report()}")
+            print(f"Vision: Object detection {self.vision.objects.report()}")
+        print(f"Control loop jitter: {self.control_timer.report()}")
+        print(f"Scheduler: {self.scheduler.report()}")
+        print(f"Motion timing jitter: {self.motion.report()}")
+        print(f"Navigation: Destination routes {self.navigator.destinations.report()}")
+        if self.ai:
+            self.ai.cache.flush()
+            print(f"AI: Ollama client stats: {self.ai.client.stats()}")
+            if self.ai.matcher:
+                print(f"AI: Fast path hit rate {self.ai.matcher.hit_rate():.0%}, "
+                      f"~{self.ai.matcher.stats['time_saved']:.1f}s of LLM time saved")
+
+def option_value(flag):
+    """Returns the command line value after `flag`, or None."""
+    if flag in sys.argv and sys.argv.index(flag) + 1 < len(sys.argv):
+        return sys.argv[sys.argv.index(flag) + 1]
+    return None
 
 if __name__ == "__main__":
-    app = RobotApp()
-    app.run()
+    # --record DIR saves what the robot perceives; --replay DIR [--unthrottled] plays it back
+    replay_path = option_value("--replay")
+    replay = Replay(replay_path, speed=None if "--unthrottled" in sys.argv else 1.0) if replay_path else None
+    if replay and not replay.clock.realtime:
+        print("Replay: Frames the app can't keep up with are skipped, so unthrottled runs "
+              "differ; use benchmarks/bench_replay.py for reproducible numbers")
+    app = RobotApp(vision_in_process="--vision-thread" not in sys.argv,
+                   record_path=option_value("--record"), replay=replay)
+    if "--async" in sys.argv:
+        try:
+            asyncio.run(app.run_async())
+        except KeyboardInterrupt:
+            app.shutdown()
+    else:
+        app.run()
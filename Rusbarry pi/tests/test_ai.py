@@ -3,31 +3,42 @@ from unittest.mock import patch, MagicMock
 import sys
 import os
 import json
+import time
+import asyncio
+import tempfile
+import io
+import contextlib
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import ai.llm_handler
+import ai.ollama_client
 
-# Manually inject requests mock if it's missing (import failed)
-if ai.llm_handler.requests is None:
-    ai.llm_handler.requests = MagicMock()
-    # Define a real exception class for the mock to use
-    class MockRequestException(Exception): pass
-    ai.llm_handler.requests.exceptions.RequestException = MockRequestException
-
-from ai.llm_handler import LocalLLMHandler
+from ai.llm_handler import LocalLLMHandler, StreamingIntentParser
+from ai.ollama_client import OllamaClient
+from ai.intent_matcher import IntentMatcher, normalize_command
+from ai.intent_cache import IntentCache
+from ai.async_llm_handler import AsyncLocalLLMHandler
+from ai.face_tracking import FaceTracker, np
+from ai.face_gallery import FaceGallery
+from ai.face_index import BruteForceIndex, IVFIndex, make_index
+from ai.vision import VisionSystem, FaceRecognizer
+from ai.vision_worker import VisionProcess
+from ai.activity_gate import ActivityGate
+from ai.object_detection import ObjectDetector, GroundProjector
+from interface.camera import Camera
 
 class TestAIModule(unittest.TestCase):
     def setUp(self):
-        self.ai = LocalLLMHandler(model_name="test-model")
-        # Reset side effects and return values for the global mock
-        ai.llm_handler.requests.post.side_effect = None
-        ai.llm_handler.requests.post.return_value = MagicMock()
-        ai.llm_handler.requests.post.return_value.status_code = 200
-        ai.llm_handler.requests.post.return_value.json.return_value = {"response": "Mock Response"}
+        self.client = OllamaClient(keep_alive="10m")
+        # Replace the pooled session so no real HTTP requests are made
+        self.client.session = MagicMock()
+        self.client.session.post.return_value.status_code = 200
+        self.client.session.post.return_value.json.return_value = {"response": "Mock Response"}
+        self.ai = LocalLLMHandler(model_name="test-model", client=self.client)
 
     def test_query_llm_success(self):
-        mock_post = ai.llm_handler.requests.post
+        mock_post = self.client.session.post
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"response": "Hello world"}
@@ -37,15 +48,72 @@ class TestAIModule(unittest.TestCase):
         self.assertEqual(response, "Hello world")
 
     def test_query_llm_failure(self):
-        mock_post = ai.llm_handler.requests.post
+        mock_post = self.client.session.post
         # Raise the specific mocked exception class
-        mock_post.side_effect = ai.llm_handler.requests.exceptions.RequestException("Connection refused")
+        mock_post.side_effect = ai.ollama_client.RequestError("Connection refused")
         
         response = self.ai.query_llm("Say hello")
         self.assertIn("Error", response)
         
-        # Cleanup
-        mock_post.side_effect = None
+    def test_client_sends_keep_alive_and_timeouts(self):
+        self.ai.query_llm("Say hello")
+        _, kwargs = self.client.session.post.call_args
+        self.assertEqual(kwargs["json"]["keep_alive"], "10m")
+        self.assertFalse(kwargs["json"]["stream"])
+        self.assertEqual(kwargs["timeout"], self.client.timeout)
+
+    def test_client_splits_cold_and_warm_latency(self):
+        self.client.session.post.return_value.json.return_value = {"response": "", "load_duration": 3e9}
+        self.client.warm_up("test-model")
+        self.client.session.post.return_value.json.return_value = {"response": "Hi", "load_duration": 1e6}
+        self.ai.query_llm("Say hello")
+        self.assertEqual(len(self.client.cold_latencies), 1)
+        self.assertEqual(len(self.client.warm_latencies), 1)
+
+    def test_ping_uses_short_timeout(self):
+        self.client.session.get.return_value.status_code = 200
+        self.assertTrue(self.client.ping())
+        self.assertEqual(self.client.session.get.call_args[1]["timeout"], self.client.ping_timeout)
+
+    def test_works_without_requests_library(self):
+        with patch.object(ai.ollama_client, "requests", None):
+            client = OllamaClient()
+        handler = LocalLLMHandler(model_name="test-model", client=client, reuse_context=False)
+        self.assertFalse(client.ping())
+        self.assertIsNone(client.warm_up("test-model"))
+        self.assertIn("Error", handler.query_llm("Say hello"))
+        self.assertEqual(client.stats()["requests"], 0)
+
+    def test_context_reuse_sends_only_user_words(self):
+        self.client.session.post.return_value.json.return_value = {"response": "OK", "context": [1, 2, 3]}
+        self.ai.interpret_command("Tell me a joke")
+
+        payload = self.client.session.post.call_args[1]["json"]
+        self.assertEqual(payload["prompt"], "User Command: Tell me a joke")
+        self.assertEqual(payload["context"], [1, 2, 3])
+
+    def test_prime_sends_instructions_as_system_message(self):
+        self.client.session.post.return_value.json.return_value = {"response": "{}", "context": [1]}
+        self.ai.prime_context()
+
+        payload = self.client.session.post.call_args[1]["json"]
+        self.assertIn("Available actions", payload["system"])
+        self.assertNotIn("Reply with OK", payload["system"] + payload["prompt"])
+
+    def test_failed_prime_is_not_retried_on_every_command(self):
+        self.client.session.post.side_effect = ai.ollama_client.RequestError("down")
+        self.ai.prime_context()
+        prompt, context = self.ai.build_prompt("Turn left")
+
+        self.assertEqual(self.client.session.post.call_count, 1)
+        self.assertIn("Available actions", prompt)
+        self.assertIsNone(context)
+
+    def test_context_reuse_disabled_sends_full_prompt(self):
+        handler = LocalLLMHandler(model_name="test-model", client=self.client, reuse_context=False)
+        prompt, context = handler.build_prompt("Turn left")
+        self.assertIn("Available actions", prompt)
+        self.assertIsNone(context)
 
     @patch('ai.llm_handler.LocalLLMHandler.query_llm')
     def test_interpret_command_json(self, mock_query):
@@ -64,5 +132,496 @@ class TestAIModule(unittest.TestCase):
         self.assertEqual(result['action'], 'say')
         self.assertEqual(result['value'], "I did not understand that.")
 
+    def test_streaming_parser_reports_action_early(self):
+        parser = StreamingIntentParser()
+        self.assertEqual(parser.feed('{"act'), (None, ""))
+        self.assertEqual(parser.feed('ion": "turn_'), (None, ""))
+        self.assertEqual(parser.feed('left", "val'), ("turn_left", ""))
+        self.assertEqual(parser.feed('ue": "Hi \\"th'), (None, 'Hi "th'))
+        self.assertEqual(parser.feed('ere"}'), (None, "ere"))
+        self.assertTrue(parser.value_done)
+
+    @patch('ai.llm_handler.LocalLLMHandler.query_llm_stream')
+    def test_interpret_command_stream(self, mock_stream):
+        mock_stream.return_value = iter(['{"action": "sa', 'y", "value": "Hello ', 'there"}'])
+        actions, said = [], []
+
+        result = self.ai.interpret_command_stream("Greet me", on_action=actions.append, on_say=said.append)
+        self.assertEqual(result, {"action": "say", "value": "Hello there"})
+        self.assertEqual(actions, ["say"])
+        self.assertEqual("".join(said), "Hello there")
+        self.assertIsNotNone(self.ai.metrics["time_to_first_action"])
+
+class TestIntentMatcher(unittest.TestCase):
+    def setUp(self):
+        self.matcher = IntentMatcher()
+
+    def test_normalize_strips_fillers_and_punctuation(self):
+        self.assertEqual(normalize_command("Hey robot, STOP please!"), "stop")
+        self.assertEqual(normalize_command("Play the Beatles now"), "play the beatles")
+
+    def test_synonyms_and_slots(self):
+        self.assertEqual(self.matcher.resolve("Halt!"), {"action": "stop", "value": None})
+        self.assertEqual(self.matcher.resolve("go ahead"), {"action": "move_forward", "value": None})
+        self.assertEqual(self.matcher.resolve("turn to the left"), {"action": "turn_left", "value": None})
+        self.assertEqual(self.matcher.resolve("Can you play Shape of You"),
+                         {"action": "play_music", "value": "shape of you"})
+        self.assertEqual(self.matcher.resolve("play some music"), {"action": "play_music", "value": None})
+
+    def test_low_confidence_falls_back(self):
+        self.assertIsNone(self.matcher.resolve("don't stop"))
+        self.assertIsNone(self.matcher.resolve("what do you think about the left wing"))
+        self.assertEqual(self.matcher.stats["misses"], 2)
+
+    @patch('ai.llm_handler.LocalLLMHandler.query_llm')
+    def test_handler_skips_llm_on_hit(self, mock_query):
+        handler = LocalLLMHandler(model_name="test-model", client=MagicMock(), reuse_context=False)
+        self.assertEqual(handler.interpret_command("Stop!")["action"], "stop")
+        mock_query.assert_not_called()
+
+        mock_query.return_value = '{"action": "say", "value": "Hi"}'
+        handler.interpret_command("How are you today?")
+        mock_query.assert_called_once()
+        self.assertEqual(handler.matcher.hit_rate(), 0.5)
+
+class TestIntentCache(unittest.TestCase):
+    def test_normalized_lookup_and_say_skipped(self):
+        cache = IntentCache()
+        self.assertTrue(cache.put("Come here, please!", {"action": "come_here", "value": None}))
+        self.assertEqual(cache.get("come here")["action"], "come_here")
+        self.assertFalse(cache.put("How are you?", {"action": "say", "value": "Great"}))
+        self.assertIsNone(cache.get("how are you"))
+
+    def test_lru_and_ttl_eviction(self):
+        cache = IntentCache(max_entries=2, ttl=60)
+        cache.put("go to the kitchen", {"action": "come_here"})
+        cache.put("play jazz", {"action": "play_music", "value": "jazz"})
+        cache.get("go to the kitchen")
+        cache.put("play rock", {"action": "play_music", "value": "rock"})
+        self.assertIsNone(cache.get("play jazz"))
+        self.assertEqual(cache.stats["evictions"], 1)
+
+        with patch('ai.intent_cache.time.time', return_value=time.time() + 120):
+            self.assertIsNone(cache.get("play rock"))
+        self.assertEqual(cache.stats["expired"], 1)
+
+    def test_persists_across_restarts(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "intent_cache.json")
+            cache = IntentCache(path=path)
+            cache.put("play robot music", {"action": "play_music", "value": "robot music"})
+            cache.put("come here", {"action": "come_here"})
+            # Both changes go out in one write
+            with patch.object(cache, "save", wraps=cache.save) as save:
+                cache.flush()
+                cache.flush()
+            save.assert_called_once()
+            self.assertEqual(IntentCache(path=path).get("Play robot music!")["value"], "robot music")
+
+    def test_unknown_actions_not_cached(self):
+        cache = IntentCache()
+        self.assertFalse(cache.put("do a backflip", {"action": "backflip"}))
+        self.assertFalse(cache.put("what", {"value": "x"}))
+
+    def test_malformed_file_treated_as_missing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "intent_cache.json")
+            for content in ('{"stop": "x"}', '[["stop", "not an intent"]]', '[1, 2]'):
+                with open(path, "w") as f:
+                    f.write(content)
+                cache = IntentCache(path=path)
+                self.assertEqual(len(cache.entries), 0)
+                self.assertTrue(cache.put("stop", {"action": "stop"}))
+
+    @patch('ai.llm_handler.LocalLLMHandler.query_llm')
+    def test_handler_answers_repeats_from_cache(self, mock_query):
+        mock_query.return_value = '{"action": "come_here", "value": "kitchen"}'
+        handler = LocalLLMHandler(model_name="test-model", client=MagicMock(), reuse_context=False)
+        handler.interpret_command("Go to the kitchen")
+        self.assertEqual(handler.interpret_command("go to the kitchen!")["value"], "kitchen")
+        mock_query.assert_called_once()
+
+class TestAsyncLLMHandler(unittest.TestCase):
+    async def _serve(self, chunks, delay):
+        """Starts a fake Ollama that streams `chunks` slowly; returns (server, closed event)."""
+        closed = asyncio.Event()
+
+        async def handle(reader, writer):
+            while (await reader.readline()) not in (b"\r\n", b""):
+                pass
+            writer.write(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n")
+            try:
+                for chunk in chunks:
+                    line = json.dumps(chunk).encode() + b"\n"
+                    writer.write(b"%x\r\n%s\r\n" % (len(line), line))
+                    await writer.drain()
+                    await asyncio.sleep(delay)
+                writer.write(b"0\r\n\r\n")
+                await writer.drain()
+                await reader.read()
+            except (ConnectionError, OSError):
+                pass
+            closed.set()
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        return server, closed
+
+    def _handler(self, server):
+        port = server.sockets[0].getsockname()[1]
+        client = OllamaClient(f"http://127.0.0.1:{port}")
+        return AsyncLocalLLMHandler(model_name="test-model", client=client, reuse_context=False)
+
+    def test_streams_intent(self):
+        async def scenario():
+            server, _ = await self._serve([{"response": '{"action": "say", '}, {"response": '"value": "Hi"}'},
+                                           {"response": "", "done": True}], 0)
+            async with server:
+                handler = self._handler(server)
+                return await handler.submit("Tell me a joke")
+
+        self.assertEqual(asyncio.run(scenario()), {"action": "say", "value": "Hi"})
+
+    def test_newer_command_cancels_stream(self):
+        async def scenario():
+            server, closed = await self._serve([{"response": " "}] * 100, 0.05)
+            async with server:
+                handler = self._handler(server)
+                first = handler.submit("Tell me a long story")
+                await asyncio.sleep(0.1)
+                second = handler.submit("Stop!")
+                result = await second
+                await asyncio.wait_for(closed.wait(), 2)
+                return first.cancelled(), result, handler.cancelled_count
+
+        cancelled, result, count = asyncio.run(scenario())
+        self.assertTrue(cancelled)
+        self.assertEqual(result["action"], "stop")
+        self.assertEqual(count, 1)
+
+    def test_failed_priming_does_not_block_event_loop(self):
+        async def scenario():
+            server, _ = await self._serve([{"response": '{"action": "stop"}'}, {"response": "", "done": True}], 0)
+            async with server:
+                handler = self._handler(server)
+                handler.reuse_context = True
+                handler.use_fast_path = False
+                handler.matcher = None
+
+                async def prime_fails():
+                    return None
+                handler.prime_context_async = prime_fails
+                handler.prime_context = MagicMock()
+                return await handler.submit("please halt"), handler.prime_context.called
+
+        intent, primed_sync = asyncio.run(scenario())
+        self.assertEqual(intent, {"action": "stop"})
+        self.assertFalse(primed_sync)
+
+class FakeFaceRecognizer:
+    """Finds the single 'face' patch at a known position in the downscaled frame."""
+    def __init__(self):
+        self.box = None
+        self.recognize_calls = 0
+
+    def detect(self, rgb):
+        return [self.box]
+
+    def recognize(self, rgb, boxes):
+        self.recognize_calls += 1
+        return ["Alice"] * len(boxes)
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestFaceTracker(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.background = rng.integers(0, 60, (400, 400, 3), dtype=np.uint8)
+        self.face = rng.integers(100, 255, (80, 80, 3), dtype=np.uint8)
+        self.recognizer = FakeFaceRecognizer()
+        self.tracker = FaceTracker(self.recognizer, detect_every=5, scale=4)
+
+    def frame_with_face(self, x):
+        frame = self.background.copy()
+        frame[100:180, x:x + 80] = self.face
+        # Box in downscaled coordinates: (top, right, bottom, left)
+        self.recognizer.box = (25, x // 4 + 20, 45, x // 4)
+        return frame
+
+    def test_tracks_between_detections_and_keeps_name(self):
+        for i in range(10):
+            tracks = self.tracker.update(self.frame_with_face(100 + 4 * i))
+        self.assertEqual(self.tracker.stats["detections"], 2)
+        self.assertEqual(self.recognizer.recognize_calls, 1)
+        self.assertEqual(self.tracker.names(), ["Alice"])
+        self.assertEqual(tracks[0].box, self.recognizer.box)
+
+    def test_scene_change_forces_detection(self):
+        self.tracker.update(self.frame_with_face(100))
+        self.tracker.update(self.frame_with_face(104))
+        self.assertEqual(self.tracker.stats["detections"], 1)
+        self.tracker.update(np.full((400, 400, 3), 255, dtype=np.uint8))
+        self.assertEqual(self.tracker.stats["detections"], 2)
+        self.assertEqual(self.tracker.report()["scene_changes"], 1)
+
+    def test_external_gate_controls_detection_but_not_tracking(self):
+        self.tracker.update(self.frame_with_face(100), detect=True)
+        for i in range(1, 12):
+            tracks = self.tracker.update(self.frame_with_face(100 + 4 * i), detect=False)
+        # Past detect_every, yet the gate suppressed detection; tracking kept up
+        self.assertEqual(self.tracker.stats["detections"], 1)
+        self.assertEqual(tracks[0].box, self.recognizer.box)
+        self.assertEqual(self.tracker.names(), ["Alice"])
+        self.tracker.update(self.frame_with_face(148), detect=True)
+        self.assertEqual(self.tracker.stats["detections"], 2)
+
+    def test_suppressed_detection_drops_lost_tracks(self):
+        self.tracker.update(self.frame_with_face(100), detect=True)
+        self.tracker.update(np.zeros((400, 400, 3), dtype=np.uint8), detect=False)
+        self.assertEqual(self.tracker.names(), [])
+        self.assertEqual(self.tracker.stats["tracks_lost"], 1)
+
+class TestVisionSystem(unittest.TestCase):
+    def test_remove_face_tolerates_missing_photos(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            kept = os.path.join(tmp, "front.jpg")
+            open(kept, "wb").close()
+            recognizer = FaceRecognizer.__new__(FaceRecognizer)
+            recognizer.gallery = MagicMock()
+            recognizer.gallery.remove.return_value = [os.path.join(tmp, "gone.jpg"), kept]
+            self.assertEqual(recognizer.remove_face("bob", delete_photos=True), 2)
+            self.assertFalse(os.path.exists(kept))
+
+    @patch("ai.vision.face_recognition", object())
+    def test_recognition_logged_once_per_new_name(self):
+        vision = VisionSystem.__new__(VisionSystem)
+        vision.tracker = MagicMock()
+        vision.last_name = None
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            for names in (["Alice"], ["Alice"], ["Alice"], [], ["Alice"], ["Bob"]):
+                vision.tracker.names.return_value = names
+                vision.scan_for_people(None)
+        self.assertEqual(out.getvalue().count("Vision: Recognized"), 3)
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestFaceGallery(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.faces = os.path.join(self.tmp.name, "faces")
+        os.makedirs(os.path.join(self.faces, "bob"))
+        self.cache = os.path.join(self.tmp.name, "encodings.npz")
+        self.write("alice.jpg", b"a")
+        self.write("bob/front.jpg", b"b")
+        self.encoded = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        with open(os.path.join(self.faces, name), "wb") as f:
+            f.write(data)
+
+    def encode(self, path):
+        """Fake encoder: the first byte of the 'photo' sets the encoding."""
+        self.encoded.append(os.path.basename(path))
+        with open(path, "rb") as f:
+            return np.full(128, f.read(1)[0] / 255.0)
+
+    def test_sync_only_encodes_new_or_changed_photos(self):
+        FaceGallery(self.faces, self.cache).sync(self.encode)
+        self.assertEqual(sorted(self.encoded), ["alice.jpg", "front.jpg"])
+
+        self.encoded = []
+        self.write("alice.jpg", b"cc")
+        os.remove(os.path.join(self.faces, "bob", "front.jpg"))
+        gallery = FaceGallery(self.faces, self.cache)
+        result = gallery.sync(self.encode)
+        self.assertEqual(self.encoded, ["alice.jpg"])
+        # The changed photo was re-encoded, not removed
+        self.assertEqual(result, {"cached": 0, "encoded": 1, "removed": 1})
+        self.assertEqual(gallery.names.tolist(), ["alice"])
+
+    def test_photos_without_a_face_are_not_encoded_again(self):
+        self.write("blurry.jpg", b"\x00")
+        encode = lambda path: None if path.endswith("blurry.jpg") else self.encode(path)
+        FaceGallery(self.faces, self.cache).sync(encode)
+
+        self.encoded = []
+        result = FaceGallery(self.faces, self.cache).sync(encode)
+        self.assertEqual(self.encoded, [])
+        self.assertEqual(result, {"cached": 3, "encoded": 0, "removed": 0})
+
+        self.write("blurry.jpg", b"d")
+        gallery = FaceGallery(self.faces, self.cache)
+        gallery.sync(self.encode)
+        self.assertEqual(self.encoded, ["blurry.jpg"])
+        self.assertEqual(sorted(gallery.names.tolist()), ["alice", "blurry", "bob"])
+
+    def test_vectorized_match_and_incremental_remove(self):
+        gallery = FaceGallery(self.faces, self.cache)
+        gallery.sync(self.encode)
+        queries = [np.full(128, ord("b") / 255.0), np.full(128, 0.9)]
+        self.assertEqual(gallery.match(queries), ["bob", "Unknown"])
+        self.assertEqual(gallery.match([]), [])
+
+        self.assertEqual(gallery.remove("bob"), [os.path.join(self.faces, "bob", "front.jpg")])
+        reloaded = FaceGallery(self.faces, self.cache)
+        self.assertTrue(reloaded.load())
+        self.assertEqual(reloaded.names.tolist(), ["alice"])
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestFaceIndex(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        people = rng.normal(0, 0.1, (200, 128))
+        self.vectors = np.repeat(people, 3, axis=0) + rng.normal(0, 0.02, (600, 128))
+        self.queries = people + rng.normal(0, 0.02, (200, 128))
+
+    def test_ivf_matches_brute_force(self):
+        brute, ivf = BruteForceIndex(), IVFIndex(nprobe=4)
+        for index in (brute, ivf):
+            index.add(np.arange(600), self.vectors)
+        self.assertIsNotNone(ivf.centroids)
+        _, expected = brute.search(self.queries, k=1)
+        _, found = ivf.search(self.queries, k=1)
+        self.assertGreaterEqual((found == expected).mean(), 0.95)
+
+    def test_incremental_insert_and_delete(self):
+        for index in (BruteForceIndex(), IVFIndex(min_train=100)):
+            index.add(np.arange(600), self.vectors)
+            index.remove(0)
+            _, ids = index.search(self.vectors[0], k=1)
+            self.assertIn(ids[0, 0], (1, 2))
+            index.add([1000], self.vectors[0])
+            _, ids = index.search(self.vectors[0], k=1)
+            self.assertEqual(ids[0, 0], 1000)
+            self.assertEqual(len(index), 600)
+
+    def test_auto_uses_brute_force_for_small_galleries(self):
+        self.assertIsInstance(make_index("auto", size=50), BruteForceIndex)
+        self.assertNotIsInstance(make_index("auto", size=5000), BruteForceIndex)
+
+class BrightnessVision:
+    """Worker-side processor: 'recognizes' Alice in bright frames."""
+    def scan_for_people(self, frame, detect=None):
+        return "Alice" if frame.mean() > 128 else None
+
+def create_brightness_vision():
+    return BrightnessVision()
+
+class StillCapture:
+    def read(self, image=None):
+        return True, np.full((8, 8, 3), 200, dtype=np.uint8)
+
+    def release(self):
+        pass
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestVisionProcess(unittest.TestCase):
+    def setUp(self):
+        self.camera = Camera(capture=StillCapture())
+        self.vision = VisionProcess(self.camera, factory=create_brightness_vision, max_backoff=0.1)
+        self.assertTrue(self.vision.start(shape=(8, 8, 3)))
+
+    def tearDown(self):
+        self.vision.stop()
+
+    def next_result(self, deadline=20.0):
+        end = time.monotonic() + deadline
+        while time.monotonic() < end:
+            self.camera.capture_once()
+            result = self.vision.get_result(timeout=0.1)
+            if result is not None:
+                return result
+        self.fail("no result from the vision worker")
+
+    def test_results_come_back_from_worker_process(self):
+        seq, name = self.next_result()
+        self.assertEqual(name, "Alice")
+        self.assertGreater(self.vision.report()["frames_shared"], 0)
+
+    def test_worker_is_restarted_after_crash(self):
+        self.next_result()
+        self.vision.process.kill()
+        self.vision.process.join()
+        self.assertEqual(self.next_result()[1], "Alice")
+        self.assertEqual(self.vision.report()["restarts"], 1)
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestActivityGate(unittest.TestCase):
+    def setUp(self):
+        self.gate = ActivityGate(min_rate=0.5, max_rate=10.0)
+        # Don't let the test machine's load average change the rate
+        patcher = patch("ai.activity_gate.os.getloadavg", return_value=(0.0, 0.0, 0.0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.empty = np.zeros((64, 64, 3), dtype=np.uint8)
+        self.person = self.empty.copy()
+        self.person[16:48, 16:48] = 200
+
+    def run_frames(self, frames, start=0.0, fps=10):
+        return [self.gate.should_process(frame, now=start + i / fps) for i, frame in enumerate(frames)]
+
+    def test_static_scene_runs_at_min_rate(self):
+        runs = self.run_frames([self.empty] * 100)
+        # First frame plus one every 2 s over 10 s
+        self.assertEqual(sum(runs), 5)
+        self.assertGreater(self.gate.report()["skipped_ratio"], 0.9)
+
+    def test_motion_onset_triggers_immediately(self):
+        self.run_frames([self.empty] * 5)
+        self.assertTrue(self.gate.should_process(self.person, now=0.6))
+        self.assertEqual(self.gate.report()["motion_triggers"], 1)
+        self.assertEqual(self.gate.target_rate(), self.gate.max_rate)
+
+    def test_cpu_budget_caps_rate(self):
+        self.run_frames([self.empty] * 5)
+        self.gate.record_processing(0.25)
+        self.gate.observe(self.person)
+        # 0.5 of a core at 250 ms per recognition allows 2 per second
+        self.assertAlmostEqual(self.gate.target_rate(), 2.0)
+
+class FakeSSD:
+    """Stands in for a cv2.dnn network: one chair per crop, plus a faint cat."""
+    def setInput(self, blob):
+        self.blob = blob
+
+    def forward(self):
+        rows = []
+        for i in range(len(self.blob)):
+            rows.append([i, 1, 0.9, 0.25, 0.5, 0.75, 1.0])
+            rows.append([i, 2, 0.1, 0.0, 0.0, 1.0, 1.0])
+        return np.array(rows, dtype=np.float32).reshape(1, 1, -1, 7)
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestObjectDetector(unittest.TestCase):
+    def setUp(self):
+        self.net = FakeSSD()
+        self.detector = ObjectDetector(net=self.net, labels=["background", "chair", "cat"],
+                                       input_size=32, batch_size=2)
+        self.frame = np.zeros((100, 200, 3), dtype=np.uint8)
+
+    def test_boxes_mapped_from_roi_to_frame(self):
+        found = self.detector.detect(self.frame, rois=[(0.5, 1.0, 1.0, 0.0)])
+        self.assertEqual(len(found), 1)
+        self.assertEqual(found[0]["label"], "chair")
+        # Lower half crop: y 0.5-1.0 of 50 rows starting at row 50
+        self.assertEqual(found[0]["box"], (75, 150, 100, 50))
+
+    def test_crops_run_in_batches(self):
+        rois = [(0.0, 0.5, 1.0, 0.0), (0.0, 1.0, 1.0, 0.5)]
+        found = self.detector.detect_batch([self.frame, self.frame], rois=rois)
+        self.assertEqual([len(f) for f in found], [2, 2])
+        self.assertEqual(self.net.blob.shape, (2, 3, 32, 32))
+        self.assertEqual(self.detector.report()["batches"], 2)
+        self.assertEqual(found[1][1]["box"][3], 125)
+
+    def test_ground_projection(self):
+        projector = GroundProjector(camera_height=15, tilt=10)
+        forward, lateral = projector.to_ground((300, 500, 480, 400), (480, 640, 3))
+        self.assertGreater(forward, 0)
+        self.assertLess(lateral, 0)  # right of centre
+        self.assertIsNone(projector.to_ground((0, 340, 100, 300), (480, 640, 3)))
+
 if __name__ == '__main__':
     unittest.main()
@@ -6,6 +6,16 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from control.motor_driver import RobotMover
+from control.scheduler import CommandScheduler
+from control.motion_executor import MotionExecutor
+from control.navigation import Navigator, GridMap, PathPlanner
+from control.dstar_lite import DStarLite
+from control.distance_field import DistanceFieldCache
+from control.tiled_map import TiledMap, HierarchicalPlanner
+from ai.intent_matcher import IntentMatcher
+import numpy as np
+import time
+from unittest.mock import MagicMock
 
 class TestControlModule(unittest.TestCase):
     def setUp(self):
@@ -39,5 +49,331 @@ class TestControlModule(unittest.TestCase):
         self.assertEqual(self.bot.left_motor.current_speed, 0)
         self.assertEqual(self.bot.right_motor.current_speed, 0)
 
+class TestCommandScheduler(unittest.TestCase):
+    def setUp(self):
+        self.executed = []
+        self.scheduler = CommandScheduler(lambda intent, cancel: self.executed.append(intent["action"]))
+
+    def test_safety_runs_first_and_discards_motion(self):
+        self.scheduler.submit({"action": "say", "value": "hi"})
+        self.scheduler.submit({"action": "move_forward"})
+        self.scheduler.submit({"action": "stop"})
+        while self.scheduler.run_next(timeout=0):
+            pass
+        self.assertEqual(self.executed, ["stop", "say"])
+        self.assertEqual(self.scheduler.report()["discarded"], 1)
+
+    def test_stale_commands_dropped(self):
+        self.scheduler.submit({"action": "turn_left"}, deadline=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(self.scheduler.run_next(timeout=0))
+        self.assertEqual(self.scheduler.report()["dropped_stale"], 1)
+
+    def test_stop_preempts_running_motion(self):
+        preempted = []
+        cancel_seen = []
+
+        def executor(intent, cancel):
+            if intent["action"] == "move_forward":
+                cancel_seen.append(cancel.wait(2))
+
+        scheduler = CommandScheduler(executor, on_preempt=preempted.append)
+        scheduler.start()
+        try:
+            scheduler.submit({"action": "move_forward"}, source="voice")
+            time.sleep(0.05)
+            start = time.monotonic()
+            scheduler.submit({"action": "stop"}, source="sensors")
+            while not cancel_seen and time.monotonic() - start < 1:
+                time.sleep(0.01)
+        finally:
+            scheduler.stop()
+
+        self.assertEqual(cancel_seen, [True])
+        self.assertEqual(preempted[0].action, "move_forward")
+        report = scheduler.report()
+        self.assertEqual(report["by_source"], {"voice": 1, "sensors": 1})
+        self.assertEqual(report["preempted"], 1)
+
+class TestMotionExecutor(unittest.TestCase):
+    def setUp(self):
+        self.bot = RobotMover()
+        self.motion = MotionExecutor(self.bot, tick=0.01)
+
+    def test_timed_move_stops_after_duration(self):
+        task = self.motion.submit("move_forward", self.bot.move_forward, 1.0)
+        self.motion.step(now=100.0)
+        self.assertEqual(self.bot.left_motor.current_speed, 1.0)
+        self.motion.step(now=100.5)
+        self.assertEqual(self.bot.left_motor.current_speed, 1.0)
+        self.motion.step(now=101.004)
+        self.assertEqual(self.bot.left_motor.current_speed, 0)
+        self.assertTrue(task.done.is_set())
+        self.assertAlmostEqual(self.motion.report()["max_ms"], 4.0, places=3)
+
+    def test_chained_moves_run_back_to_back(self):
+        forward, turn = self.motion.chain([("forward", self.bot.move_forward, 1.0),
+                                           ("left", self.bot.turn_left, 0.5)])
+        self.motion.step(now=0.0)
+        self.motion.step(now=1.0)
+        self.assertTrue(forward.done.is_set())
+        self.assertEqual(self.bot.left_motor.current_speed, -0.8)
+        self.motion.step(now=1.5)
+        self.assertTrue(turn.done.is_set())
+        self.assertEqual(self.bot.right_motor.current_speed, 0)
+
+    def test_cancel_stops_immediately(self):
+        self.motion.start()
+        try:
+            task = self.motion.submit("move_forward", self.bot.move_forward, 5.0)
+            time.sleep(0.05)
+            self.assertEqual(self.bot.left_motor.current_speed, 1.0)
+            self.motion.cancel_all()
+            self.assertEqual(self.bot.left_motor.current_speed, 0)
+            self.assertTrue(task.cancelled)
+            self.assertFalse(self.motion.is_busy())
+        finally:
+            self.motion.stop()
+
+class TestProcessAction(unittest.TestCase):
+    def setUp(self):
+        from main import RobotApp
+        # Only the parts process_action touches
+        self.app = RobotApp.__new__(RobotApp)
+        self.app.lcd = MagicMock()
+        self.app.sensors = MagicMock()
+        self.app.mover = RobotMover()
+        self.app.motion = MotionExecutor(self.app.mover)
+
+    def test_fast_path_move_backward_drives_backward(self):
+        intent, confidence = IntentMatcher().match("back up")
+        self.assertEqual(confidence, 1.0)
+        self.app.process_action(intent)
+        # Run the executor's control tick by hand instead of its thread
+        self.app.motion.step()
+        self.assertEqual(self.app.motion.current.name, "move_backward")
+        self.assertLess(self.app.mover.left_motor.current_speed, 0)
+        self.assertLess(self.app.mover.right_motor.current_speed, 0)
+
+class TestNavigator(unittest.TestCase):
+    def test_camera_obstacles_marked_on_map(self):
+        navigator = Navigator(RobotMover(), sensors=None)
+        navigator.current_pos = (50, 50)
+        marked = navigator.add_obstacles([{"label": "chair", "position": (40.0, -15.0)}])
+        self.assertEqual(marked, 1)
+        self.assertTrue(navigator.map.is_blocked(9, 3))
+
+    def test_moving_obstacles_stay_off_the_map(self):
+        navigator = Navigator(RobotMover(), sensors=None)
+        navigator.current_pos = (50, 50)
+        marked = navigator.add_obstacles([{"label": "person", "position": (40.0, -15.0), "moving": True}])
+        self.assertEqual(marked, 0)
+        self.assertFalse(navigator.map.is_blocked(9, 3))
+
+class TestGridMap(unittest.TestCase):
+    def test_bulk_points_marked_once(self):
+        grid = GridMap(width=100, height=50, resolution=10)
+        added = grid.add_points([(15, 25), (19, 21), (995, 495), (-5, 10), (2000, 10)])
+        self.assertEqual(added, 2)  # one duplicate cell, two out of bounds
+        self.assertTrue(grid.is_blocked(1, 2))
+        self.assertTrue(grid.is_blocked(99, 49))
+        self.assertEqual(int(grid.grid.sum()), 2)
+
+    def test_incremental_inflation_matches_full_pass(self):
+        grid = GridMap(width=200, height=150, resolution=5, robot_radius=17)
+        points = np.random.default_rng(1).uniform(0, 1000, size=(300, 2))
+        grid.add_points(points)
+        incremental = grid.blocked.copy()
+        grid.inflate()
+        np.testing.assert_array_equal(incremental, grid.blocked)
+        # The cell next to an obstacle is blocked by inflation, not as an obstacle
+        x, y = int(points[0, 0] // 5), int(points[0, 1] // 5)
+        if x + 3 < 200:
+            self.assertTrue(grid.is_blocked(x + 3, y))
+
+    def test_planner_view_is_read_only(self):
+        grid = GridMap()
+        grid.update_obstacle(55, 55)
+        view = grid.view()
+        self.assertTrue(view[5, 5])
+        with self.assertRaises(ValueError):
+            view[0, 0] = True
+
+    def test_packed_round_trip(self):
+        grid = GridMap(width=1000, height=1000)
+        grid.add_points(np.random.default_rng(2).uniform(0, 10000, size=(5000, 2)))
+        packed = grid.packed()
+        self.assertEqual(packed.nbytes, 1000 * 1000 // 8)
+        copy = GridMap(width=1000, height=1000)
+        copy.load_packed(packed)
+        np.testing.assert_array_equal(copy.grid, grid.grid)
+
+class TestPathPlanner(unittest.TestCase):
+    def setUp(self):
+        self.grid = GridMap(width=40, height=30)
+        # A wall with a gap at the top
+        self.grid.set_cells(np.full(25, 20), np.arange(5, 30))
+
+    def path_length(self, path):
+        return sum(np.hypot(b[0] - a[0], b[1] - a[1]) for a, b in zip(path, path[1:]))
+
+    def test_four_connected_path_is_shortest(self):
+        path = PathPlanner(self.grid).find_cells((2, 20), (35, 20))
+        self.assertEqual(path[0], (2, 20))
+        self.assertEqual(path[-1], (35, 20))
+        # Up to the gap at y=4, across and back down
+        self.assertEqual(len(path) - 1, 33 + 2 * 16)
+        self.assertFalse(any(self.grid.is_blocked(x, y) for x, y in path))
+
+    def test_jump_point_search_matches_eight_connected_astar(self):
+        astar = PathPlanner(self.grid, connectivity=8)
+        jps = PathPlanner(self.grid, jump_points=True)
+        expected = astar.find_cells((2, 20), (35, 20))
+        found = jps.find_cells((2, 20), (35, 20))
+        self.assertAlmostEqual(self.path_length(found), self.path_length(expected))
+        self.assertLess(jps.stats["last_expanded"], astar.stats["last_expanded"])
+        for a, b in zip(found, found[1:]):
+            self.assertLessEqual(max(abs(b[0] - a[0]), abs(b[1] - a[1])), 1)
+
+    def test_diagonal_moves_do_not_cut_corners(self):
+        grid = GridMap(width=3, height=3)
+        grid.set_cells([1], [0])
+        path = PathPlanner(grid, connectivity=8).find_cells((0, 0), (2, 0))
+        # Both diagonals would clip the blocked cell's corners: go around it
+        self.assertEqual(path, [(0, 0), (0, 1), (1, 1), (2, 1), (2, 0)])
+
+    def test_replans_after_map_change(self):
+        planner = PathPlanner(self.grid)
+        self.assertIsNotNone(planner.find_cells((2, 2), (35, 2)))
+        self.grid.set_cells([20] * 5, range(5))
+        self.assertIsNone(planner.find_cells((2, 2), (35, 2)))
+
+class ObstacleAfterSteps:
+    """Sensors that see an obstacle 20 cm ahead once, on the given check."""
+    def __init__(self, step):
+        self.step = step
+        self.checks = 0
+
+    def check_path_clear(self):
+        self.checks += 1
+        return self.checks != self.step
+
+class TestReplanning(unittest.TestCase):
+    def test_go_to_repairs_route_around_new_obstacle(self):
+        navigator = Navigator(RobotMover(), ObstacleAfterSteps(3))
+        navigator.go_to(150, 0)
+        self.assertEqual(navigator.current_pos, (150, 0))
+        self.assertTrue(navigator.map.is_blocked(5, 0))
+        self.assertEqual(navigator.replanner.stats["repairs"], 1)
+        self.assertEqual(navigator.replanner.stats["plans"], 1)
+
+    def test_incremental_plan_matches_full_search(self):
+        grid = GridMap(width=60, height=40)
+        grid.set_cells(np.full(30, 30), np.arange(30))
+        replanner = DStarLite(grid)
+        planner = PathPlanner(grid, connectivity=8)
+        cell = (2, 2)
+        for step in range(20):
+            path = replanner.plan(cell, (57, 2))
+            expected = planner.find_cells(cell, (57, 2))
+            self.assertAlmostEqual(self.length(path), self.length(expected))
+            cell = path[1]
+            # Drop obstacles across the remaining route
+            grid.set_cells([path[min(5, len(path) - 1)][0]], [path[min(5, len(path) - 1)][1] + 1])
+        self.assertGreater(replanner.stats["repairs"], 0)
+
+    def length(self, path):
+        return sum(np.hypot(b[0] - a[0], b[1] - a[1]) for a, b in zip(path, path[1:]))
+
+class TestDistanceFields(unittest.TestCase):
+    def setUp(self):
+        self.grid = GridMap(width=30, height=20)
+        # Wall with a gap at the top
+        self.grid.set_cells(np.full(17, 15), np.arange(17))
+        self.cache = DistanceFieldCache(self.grid)
+        self.cache.register("dock", (28, 1))
+
+    def test_descent_matches_shortest_path(self):
+        planner = PathPlanner(self.grid)
+        for start in [(1, 1), (14, 0), (20, 19), (28, 1)]:
+            path = self.cache.path(start, (28, 1))
+            self.assertEqual(len(path), len(planner.find_cells(start, (28, 1))))
+            self.assertEqual((path[0], path[-1]), (start, (28, 1)))
+        self.assertEqual(self.cache.report()["hit_rate"], 1.0)
+
+    def test_new_obstacles_are_repaired_in_place(self):
+        # Inside the wall: already blocked, nothing changes
+        self.grid.set_cells([15], [5])
+        self.cache.path((1, 1), (28, 1))
+        self.assertEqual(self.cache.stats["repairs"], 0)
+        # Narrowing the gap lengthens routes from the left side
+        self.grid.set_cells([15, 15], [17, 18])
+        path = self.cache.path((1, 1), (28, 1))
+        self.assertEqual(len(path), len(PathPlanner(self.grid).find_cells((1, 1), (28, 1))))
+        self.assertEqual(self.cache.stats["repairs"], 1)
+        self.assertEqual(self.cache.stats["builds"], 1)
+        # Closing it cuts the left side off
+        self.grid.set_cells([15], [19])
+        self.assertIsNone(self.cache.path((1, 1), (28, 1)))
+        self.assertEqual(self.cache.report()["hit_rate"], 1.0)
+
+    def test_freed_cells_rebuild_the_field(self):
+        # Inflation closes the gap
+        self.grid.inflate(robot_radius=30)
+        self.assertIsNone(self.cache.path((1, 1), (28, 1)))
+        self.grid.inflate(robot_radius=0)
+        self.assertIsNotNone(self.cache.path((1, 1), (28, 1)))
+        self.assertEqual(self.cache.stats["invalidations"], 1)
+        self.assertEqual(self.cache.stats["builds"], 2)
+
+    def test_go_to_uses_registered_destination(self):
+        navigator = Navigator(RobotMover(), ObstacleAfterSteps(0))
+        navigator.register_destination("home", 50, 30)
+        navigator.go_to(50, 30)
+        self.assertEqual(navigator.current_pos, (50, 30))
+        self.assertEqual(navigator.destinations.stats["queries"], 1)
+        self.assertEqual(navigator.replanner.stats["plans"], 0)
+
+class TestTiledMap(unittest.TestCase):
+    def test_tiles_allocated_on_demand(self):
+        tiled = TiledMap(tile_size=16, robot_radius=10)
+        self.assertEqual(tiled.nbytes, 0)
+        # Far apart and at negative coordinates; inflation spills into the next tile
+        self.assertEqual(tiled.add_points([(-5, -5), (50000, 20000)]), 2)
+        self.assertTrue(tiled.is_blocked(-1, -1))
+        self.assertTrue(tiled.is_blocked(0, -1))
+        self.assertTrue(tiled.is_blocked(5000, 2001))
+        self.assertFalse(tiled.is_blocked(100, 100))
+        self.assertLess(tiled.nbytes, 16 * 16 * 2 * 8)
+        self.assertGreater(tiled.dense_nbytes, 1000 * tiled.nbytes)
+
+    def test_hierarchical_path_matches_dense_planner(self):
+        tiled = TiledMap(tile_size=8)
+        dense = GridMap(width=64, height=64)
+        # Wall with a door, crossing several tiles
+        xs, ys = np.full(60, 30), np.arange(60)
+        tiled.set_cells(xs, ys)
+        dense.set_cells(xs, ys)
+        planner = HierarchicalPlanner(tiled, window=2)
+        path = planner.find_cells((2, 5), (60, 5))
+        expected = PathPlanner(dense).find_cells((2, 5), (60, 5))
+        self.assertEqual((path[0], path[-1]), ((2, 5), (60, 5)))
+        for a, b in zip(path, path[1:]):
+            self.assertEqual(abs(a[0] - b[0]) + abs(a[1] - b[1]), 1)
+            self.assertFalse(tiled.is_blocked(*b))
+        self.assertLessEqual(len(path), 1.1 * len(expected))
+        self.assertGreater(planner.stats["windows"], 1)
+
+    def test_detour_outside_coarse_route_found(self):
+        tiled = TiledMap(tile_size=8)
+        # A U-shaped wall around the start: the way out is behind it
+        tiled.set_cells(np.full(40, 12), np.arange(-20, 20))
+        tiled.set_cells(np.arange(0, 13), np.full(13, -20))
+        tiled.set_cells(np.arange(0, 13), np.full(13, 19))
+        path = HierarchicalPlanner(tiled).find_cells((10, 0), (14, 0))
+        self.assertEqual(path[-1], (14, 0))
+        self.assertGreater(len(path), 40)
+        self.assertIsNone(HierarchicalPlanner(tiled).find_cells((10, 0), (12, 0)))
+
 if __name__ == '__main__':
     unittest.main()
@@ -3,10 +3,20 @@ from unittest.mock import patch
 import sys
 import os
 import io
+import json
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from interface.display import LCDController
+import interface.streaming_asr
+from interface.streaming_asr import StreamingRecognizer
+from interface.audio_capture import AudioRingBuffer, MicrophoneStream, np
+from interface.voice import VoiceRecognizer
+import tempfile
+import interface.wake_word
+from interface.wake_word import WakeWordDetector
+from interface.camera import Camera
+from interface.shared_frames import SharedFrameRing
 
 class TestInterfaceModule(unittest.TestCase):
     def setUp(self):
@@ -30,5 +40,247 @@ class TestInterfaceModule(unittest.TestCase):
             self.lcd.show_visual_feedback("smile")
             self.assertIn("^   ^", mock_stdout.getvalue())
 
+    def test_show_ai_chunk_streams_full_lines(self):
+        with patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+            self.lcd.show_ai_chunk("Hello there, ")
+            self.assertNotIn("Hello there", mock_stdout.getvalue())
+            self.lcd.show_ai_chunk("human!")
+            self.assertIn("Hello there, hum", mock_stdout.getvalue())
+            self.lcd.end_ai_stream()
+            self.assertIn("an!", mock_stdout.getvalue())
+
+class FakeKaldiRecognizer:
+    """Recognizes one word per chunk and ends the utterance on an empty chunk."""
+    def __init__(self, model, rate):
+        self.words = []
+        self.final = False
+
+    def AcceptWaveform(self, pcm):
+        if not pcm.strip(b"\x00"):
+            self.final = True
+            return True
+        self.words.append(pcm.decode().strip())
+        return False
+
+    def PartialResult(self):
+        return '{"partial": "%s"}' % " ".join(self.words)
+
+    def Result(self):
+        text, self.words = " ".join(self.words), []
+        return '{"text": "%s"}' % text
+
+    def FinalResult(self):
+        return self.Result()
+
+class TestStreamingRecognizer(unittest.TestCase):
+    @patch('interface.streaming_asr.os.path.isdir', return_value=True)
+    @patch.multiple(interface.streaming_asr, Model=lambda path: object(),
+                    KaldiRecognizer=FakeKaldiRecognizer, SetLogLevel=lambda level: None)
+    def test_emits_partials_then_final(self, _):
+        asr = StreamingRecognizer("fake-model", sample_rate=8)
+        events = list(asr.transcribe_stream([b"go", b"forward", b"\x00" * 16]))
+        self.assertEqual(events, [("partial", "go"), ("partial", "go forward"), ("final", "go forward")])
+
+        report = asr.report()
+        self.assertEqual(report["utterances"], 1)
+        self.assertGreater(report["audio_seconds"], 0)
+
+class FakeSpotter:
+    """Grammar recognizer stand-in: the 'audio' is the spoken words as text."""
+    def __init__(self, model, rate, grammar):
+        self.words = []
+
+    def SetWords(self, enabled):
+        pass
+
+    def AcceptWaveform(self, pcm):
+        self.words = pcm.decode().split()
+
+    def FinalResult(self):
+        result = [{"word": w, "start": i * 0.5, "end": (i + 1) * 0.5} for i, w in enumerate(self.words)]
+        return json.dumps({"result": result})
+
+class TestWakeWordDetector(unittest.TestCase):
+    @patch.object(interface.wake_word, 'KaldiRecognizer', FakeSpotter)
+    def test_detects_wake_phrase_and_returns_its_end(self):
+        wake = WakeWordDetector(("hey robot",), model=object())
+        self.assertIsNone(wake.detect(b"pass me the wrench"))
+        self.assertFalse(wake.is_awake())
+        self.assertEqual(wake.detect(b"hey robot turn left"), 1.0)
+        self.assertTrue(wake.is_awake())
+        self.assertEqual(wake.report()["rejected"], 1)
+
+    def test_text_fallback_strips_wake_phrase_and_honors_window(self):
+        wake = WakeWordDetector(("hey robot",), model=None, window=8.0)
+        self.assertIsNone(wake.match_text("turn left please"))
+        self.assertEqual(wake.match_text("Hey robot turn left"), "turn left")
+        self.assertEqual(wake.match_text("now go forward"), "now go forward")
+        wake.awake_until = 0.0
+        self.assertIsNone(wake.match_text("now go forward"))
+
+    def test_text_fallback_ignores_punctuation(self):
+        wake = WakeWordDetector(("hey robot", "robot"), model=None)
+        self.assertEqual(wake.match_text("Robot, stop"), "stop")
+        self.assertEqual(wake.match_text("hey robot."), "")
+        self.assertEqual(wake.match_text("Hey, robot! Play Shape of You"), "Play Shape of You")
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestAudioCapture(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.calibration = os.path.join(self.tmp.name, "calibration.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_ring_buffer_wraps_and_detects_overwrite(self):
+        ring = AudioRingBuffer(8)
+        ring.write(np.arange(6, dtype=np.int16))
+        ring.write(np.arange(6, 12, dtype=np.int16))
+        self.assertEqual(ring.read(4, 12).tolist(), list(range(4, 12)))
+        self.assertIsNone(ring.read(2, 6))
+
+    def test_vad_cuts_utterance_and_adapts_noise_floor(self):
+        mic = MicrophoneStream(sample_rate=1000, chunk=100, buffer_seconds=5,
+                               calibration_path=self.calibration)
+        rng = np.random.default_rng(0)
+        quiet = lambda: rng.normal(0, 50, 100).astype(np.int16)
+        for _ in range(10):
+            mic.feed(quiet())
+        for _ in range(5):
+            mic.feed(np.full(100, 3000, dtype=np.int16))
+        for _ in range(8):
+            mic.feed(quiet())
+
+        self.assertLess(mic.vad.noise_floor, 300)
+        samples = mic.next_utterance(timeout=0)
+        self.assertIsNotNone(samples)
+        self.assertEqual(int((samples == 3000).sum()), 500)
+        self.assertIsNone(mic.next_utterance(timeout=0))
+
+    def test_calibration_persists_between_runs(self):
+        mic = MicrophoneStream(calibration_path=self.calibration)
+        mic.vad.noise_floor = 123.0
+        mic.stop()
+        self.assertEqual(MicrophoneStream(calibration_path=self.calibration).vad.noise_floor, 123.0)
+
+class FakeWordDecoder:
+    """Streaming recognizer stand-in: sample value 1000 says "go", 2000 says "left"."""
+    WORDS = {1000: "go", 2000: "left"}
+
+    def reset(self, sample_rate=None):
+        pass
+
+    def accept_chunk(self, pcm):
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        words = [self.WORDS[v] for v in dict.fromkeys(samples.tolist()) if v in self.WORDS]
+        return ("final", " ".join(words)) if words else None
+
+    def finish(self):
+        return None
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestPersistentStreaming(unittest.TestCase):
+    def test_speech_while_busy_is_decoded_next_time(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            recognizer = VoiceRecognizer.__new__(VoiceRecognizer)
+            recognizer.stream = MicrophoneStream(sample_rate=1000, calibration_path=os.path.join(tmp, "c.json"))
+            recognizer.asr = FakeWordDecoder()
+            recognizer.on_partial = None
+            recognizer.read_cursor = None
+            mic = recognizer.stream
+            mic.feed(np.full(200, 1000, dtype=np.int16))
+            self.assertEqual(recognizer._listen_streaming_persistent(timeout=0.1, phrase_time_limit=1), "go")
+            # Spoken while the robot was still acting on "go", followed by a long silence
+            mic.feed(np.full(200, 2000, dtype=np.int16))
+            mic.feed(np.zeros(2000, dtype=np.int16))
+            self.assertEqual(recognizer._listen_streaming_persistent(timeout=0.1, phrase_time_limit=1), "left")
+
+class FakeCapture:
+    """VideoCapture stand-in producing numbered 4x4 frames."""
+    def __init__(self):
+        self.count = 0
+
+    def read(self, image=None):
+        self.count += 1
+        frame = np.full((4, 4, 3), self.count % 256, dtype=np.uint8)
+        if image is not None and image.shape == frame.shape:
+            image[...] = frame
+            return True, image
+        return True, frame
+
+    def release(self):
+        pass
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestCamera(unittest.TestCase):
+    def test_latest_frame_is_shared_without_copies(self):
+        camera = Camera(capture=FakeCapture())
+        vision, recorder = camera.subscribe("vision"), camera.subscribe("recorder")
+        for _ in range(3):
+            camera.capture_once()
+
+        with vision.get(timeout=0) as a, recorder.get(timeout=0) as b:
+            self.assertEqual(a.seq, 3)
+            self.assertIs(a.image.base, b.image.base)
+            self.assertFalse(a.image.flags.writeable)
+        self.assertIsNone(vision.get(timeout=0))
+
+    def test_held_frames_are_not_overwritten(self):
+        camera = Camera(capture=FakeCapture(), max_consumers=1)
+        feed = camera.subscribe("vision")
+        camera.capture_once()
+        held = feed.get(timeout=0)
+        for _ in range(5):
+            camera.capture_once()
+        self.assertEqual(int(held.image[0, 0, 0]), 1)
+        held.release()
+
+        frame = feed.get(timeout=0)
+        self.assertEqual(frame.seq, 6)
+        self.assertEqual(camera.report()["consumers"]["vision"]["dropped"], 4)
+
+    def test_resolution_change_resets_buffer_refs(self):
+        capture = FakeCapture()
+        camera = Camera(capture=capture, max_consumers=1)
+        feed = camera.subscribe("vision")
+        camera.capture_once()
+        held = feed.get(timeout=0)
+
+        capture.read = lambda image=None: (True, np.zeros((8, 8, 3), dtype=np.uint8))
+        camera.capture_once()
+        # The old frame stays readable but holds none of the new buffers,
+        # and releasing it doesn't touch their counts
+        self.assertEqual(held.image.shape, (4, 4, 3))
+        self.assertEqual(camera.pool.refs, [0, 0, 0])
+        held.release()
+        self.assertEqual(camera.pool.refs, [0, 0, 0])
+        for _ in range(4):
+            self.assertTrue(camera.capture_once())
+        with feed.get(timeout=0) as frame:
+            self.assertEqual(frame.image.shape, (8, 8, 3))
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestSharedFrameRing(unittest.TestCase):
+    def test_reader_gets_newest_complete_frame(self):
+        ring = SharedFrameRing((2, 2), slots=4)
+        reader = SharedFrameRing((2, 2), slots=4, name=ring.name)
+        out = np.empty((2, 2), dtype=np.uint8)
+        try:
+            for seq in range(1, 7):
+                ring.write(np.full((2, 2), seq, dtype=np.uint8), seq, 100.0 + seq)
+            self.assertEqual(reader.read_latest(out), (6, 106.0))
+            self.assertEqual(int(out[0, 0]), 6)
+            self.assertIsNone(reader.read_latest(out, after_seq=6))
+
+            # A slot being rewritten is skipped instead of read torn
+            ring.header[1 + 7 % 4, 0] = -1
+            ring.header[0, 0] = 7
+            self.assertIsNone(reader.read_latest(out, after_seq=6))
+            self.assertFalse(ring.write(np.zeros((3, 3), dtype=np.uint8), 8, 0.0))
+        finally:
+            reader.close()
+            ring.close()
+
 if __name__ == '__main__':
     unittest.main()
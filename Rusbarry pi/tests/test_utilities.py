@@ -0,0 +1,163 @@
+import unittest
+import sys
+import os
+import time
+import threading
+import tempfile
+from unittest.mock import patch, MagicMock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utilities.pipeline import Pipeline
+from utilities.recording import Recorder, Replay, np
+from interface.camera import Camera
+from interface.audio_capture import MicrophoneStream
+from control.sensors import EnvironmentalAwareness
+from utilities.media import MediaController
+
+class TestPipeline(unittest.TestCase):
+    def test_stages_overlap(self):
+        items = iter(range(4))
+        done = []
+        finished = threading.Event()
+        second_item_in_a = threading.Event()
+        overlapped = []
+
+        def source():
+            return next(items, None)
+
+        def stage_a(item):
+            time.sleep(0.05)
+            if item == 1:
+                second_item_in_a.set()
+            return item
+
+        def stage_b(item):
+            if item == 0:
+                # Run sequentially, stage a could not start item 1 before this returns
+                overlapped.append(second_item_in_a.wait(2))
+            return item
+
+        def sink(item):
+            done.append(item)
+            if len(done) == 4:
+                finished.set()
+
+        pipeline = Pipeline(queue_size=1).add_stage("source", source, idle_delay=0.01) \
+                                         .add_stage("a", stage_a).add_stage("b", stage_b).add_stage("sink", sink)
+        pipeline.start()
+        self.assertTrue(finished.wait(5))
+        pipeline.stop()
+
+        self.assertEqual(done, [0, 1, 2, 3])
+        self.assertEqual(overlapped, [True])
+        report = pipeline.report()
+        self.assertEqual(report["a"]["processed"], 4)
+        self.assertGreater(report["a"]["avg_latency"], 0.04)
+
+    def test_full_queue_applies_backpressure(self):
+        release = threading.Event()
+        pipeline = Pipeline(queue_size=1).add_stage("source", lambda: 1) \
+                                         .add_stage("stuck", lambda item: release.wait())
+        pipeline.start()
+        time.sleep(0.3)
+        report = pipeline.report()
+        release.set()
+        pipeline.stop()
+
+        self.assertEqual(report["stuck"]["input_depth"], 1)
+        self.assertGreater(report["source"]["blocked_time"], 0.1)
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestRecordReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = self.tmp.name
+        recorder = Recorder(self.path)
+        start = recorder.started
+        for i in range(5):
+            recorder.record("camera", np.full((1, 4, 6, 3), i, dtype=np.uint8), start + 0.02 * i)
+            recorder.record("microphone", np.full(160, i, dtype=np.int16), start + 0.02 * i,
+                            extra={"sample_rate": 8000})
+            recorder.record("front_sonar", np.array([100.0 - 25 * i]), start + 0.02 * i)
+        recorder.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_records_after_close_are_dropped(self):
+        recorder = Recorder(os.path.join(self.path, "late"))
+        recorder.record("front_sonar", np.array([50.0]))
+        recorder.close()
+        # A sensor thread still running during shutdown
+        recorder.record("front_sonar", np.array([40.0]))
+        recorder.record("microphone", np.zeros(160, dtype=np.int16))
+        self.assertEqual(len(Replay(os.path.join(self.path, "late")).channels["front_sonar"]), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.path, "late", "microphone.bin")))
+
+    def test_frames_replayed_through_camera(self):
+        camera = Camera(capture=Replay(self.path, speed=None).capture())
+        seen = []
+        while camera.capture_once():
+            frame = camera.latest(timeout=0)
+            seen.append(int(frame.image[0, 0, 0]))
+            frame.release()
+        camera.release()
+        self.assertEqual(seen, [0, 1, 2, 3, 4])
+
+    def test_audio_and_sonar_replayed(self):
+        replay = Replay(self.path, speed=None)
+        audio = replay.audio()
+        self.assertEqual(audio.sample_rate, 8000)
+        chunk = np.frombuffer(audio.read(320), dtype=np.int16)
+        self.assertEqual(chunk.tolist(), [0] * 160 + [1] * 160)
+        sensors = EnvironmentalAwareness(front_sonar=replay.sensor())
+        readings = [sensors.front_sonar.get_distance() for _ in range(5)]
+        self.assertEqual(readings, [100.0, 75.0, 50.0, 25.0, 0.0])
+        self.assertFalse(sensors.check_path_clear())  # last reading repeats
+        self.assertAlmostEqual(replay.clock.now(), 0.08)
+
+    def test_realtime_replay_follows_timestamps(self):
+        capture = Replay(self.path, speed=1.0).capture()
+        start = time.monotonic()
+        while capture.read()[0]:
+            pass
+        self.assertGreaterEqual(time.monotonic() - start, 0.075)
+
+    def test_microphone_stream_reads_replay(self):
+        stream = MicrophoneStream(sample_rate=8000, chunk=160, calibration_path=os.path.join(self.path, "cal.json"),
+                                  source=Replay(self.path, speed=None).audio())
+        self.assertTrue(stream.start())
+        deadline = time.monotonic() + 2
+        while stream.ring.total < 800 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stream.stop()
+        self.assertEqual(stream.ring.read(0, 800)[::160].tolist(), [0, 1, 2, 3, 4])
+
+class TestMediaController(unittest.TestCase):
+    def setUp(self):
+        self.media = MediaController()
+        self.cancel = threading.Event()
+        self.pywhatkit = MagicMock()
+        patcher = patch("utilities.media.pywhatkit", self.pywhatkit)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("utilities.media.webbrowser.open")
+    def test_plays_resolved_video(self, open_url):
+        self.pywhatkit.playonyt.return_value = "https://www.youtube.com/watch?v=x"
+        self.assertTrue(self.media.play_youtube("robot music", cancel_event=self.cancel))
+        open_url.assert_called_once_with("https://www.youtube.com/watch?v=x")
+
+    @patch("utilities.media.webbrowser.open")
+    def test_preempted_during_lookup_opens_nothing(self, open_url):
+        def lookup(query, open_video=True):
+            # A safety command preempts while the video is being looked up
+            self.cancel.set()
+            return "https://www.youtube.com/watch?v=x"
+        self.pywhatkit.playonyt.side_effect = lookup
+        self.assertFalse(self.media.play_youtube("robot music", cancel_event=self.cancel))
+        open_url.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
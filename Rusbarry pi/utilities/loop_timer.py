@@ -0,0 +1,65 @@
+"""
+Utilities Module - Loop Timer
+=============================
+
+This module paces a periodic loop at a fixed rate and records how late each
+iteration wakes up (jitter). Unlike `time.sleep(interval)`, the schedule does
+not drift when an iteration takes time.
+
+Used to monitor the timing of the robot's control loops, e.g. to see how much
+CPU-bound vision work running in the same process delays them.
+"""
+
+import collections
+import time
+
+
+class LoopTimer:
+    """
+    Fixed-rate loop pacing with wake-up jitter statistics.
+    """
+    def __init__(self, interval, history=1000):
+        """
+        Args:
+            interval (float): Loop period in seconds.
+            history (int): Number of recent iterations kept for the report.
+        """
+        self.interval = interval
+        self.next_deadline = None
+        self.samples = collections.deque(maxlen=history)
+        self.overruns = 0
+
+    def wait(self):
+        """Sleeps until the next period starts and records how late it woke up."""
+        now = time.monotonic()
+        if self.next_deadline is None:
+            self.next_deadline = now
+        self.next_deadline += self.interval
+        delay = self.next_deadline - now
+        if delay <= 0:
+            # The iteration took longer than a period: skip ahead instead of bursting
+            self.overruns += 1
+            self.samples.append(-delay)
+            self.next_deadline = now
+            return
+        time.sleep(delay)
+        self.samples.append(max(0.0, time.monotonic() - self.next_deadline))
+
+    def report(self):
+        """
+        Returns wake-up jitter statistics.
+
+        Returns:
+            dict: Iterations measured, overruns and mean / 95th percentile /
+                  max lateness in milliseconds.
+        """
+        samples = sorted(self.samples)
+        if not samples:
+            return {"iterations": 0, "overruns": 0, "mean_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        return {
+            "iterations": len(samples),
+            "overruns": self.overruns,
+            "mean_ms": 1000 * sum(samples) / len(samples),
+            "p95_ms": 1000 * samples[int(0.95 * (len(samples) - 1))],
+            "max_ms": 1000 * samples[-1],
+        }
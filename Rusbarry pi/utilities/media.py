@@ -23,23 +23,41 @@ class MediaController:
     def __init__(self):
         print("Utilities: Media Controller initialized.")
 
-    def play_youtube(self, query):
+    def play_youtube(self, query, cancel_event=None):
         """
         Searches for and plays a video on YouTube.
         
         Args:
             query (str): The search term (e.g., "Taylor Swift Shake it Off").
+            cancel_event (threading.Event, optional): If set (e.g. a safety
+                command preempted this one) before the video opens, nothing
+                is opened.
+
+        Returns:
+            bool: True if a video or search page was opened.
         """
+        cancelled = lambda: cancel_event is not None and cancel_event.is_set()
+        if cancelled():
+            return False
         print(f"Media: Playing '{query}' on YouTube...")
         
         if pywhatkit:
             try:
-                pywhatkit.playonyt(query)
+                # The video lookup is a web request that can take seconds:
+                # resolve the URL first, open it only if still wanted
+                url = pywhatkit.playonyt(query, open_video=False)
+                if cancelled():
+                    print("Media: Playback cancelled.")
+                    return False
+                webbrowser.open(url)
                 return True
             except Exception as e:
                 print(f"Media Error (pywhatkit): {e}")
                 # Fallback
         
+        if cancelled():
+            print("Media: Playback cancelled.")
+            return False
         # Fallback: Open browser search directly
         # If query is a URL, open it.
         if "youtube.com" in query or "youtu.be" in query:
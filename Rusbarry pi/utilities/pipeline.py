@@ -0,0 +1,160 @@
+"""
+Utilities Module - Staged Pipeline
+==================================
+
+This module runs a chain of processing stages concurrently, each on its own
+thread, connected by bounded queues.
+
+Used for the voice path (capture -> transcription -> intent resolution ->
+execution): the microphone keeps listening while the LLM thinks and while the
+robot moves, and overall throughput is limited by the slowest stage instead
+of the sum of all stages.
+
+Each stage records how many items it processed, how long each one took and
+how long it was blocked by a full downstream queue (backpressure).
+"""
+
+import queue
+import threading
+import time
+
+
+class PipelineStage:
+    """
+    One stage of a pipeline running `func` on its own thread.
+    """
+    def __init__(self, name, func, input_queue=None, output_queue=None, idle_delay=0.1):
+        """
+        Args:
+            name (str): Stage name used in reports.
+            func (callable): For a source stage (no input queue) called with no
+                             arguments; otherwise called with each input item.
+                             Returning None forwards nothing.
+            input_queue (queue.Queue, optional): Where items come from.
+            output_queue (queue.Queue, optional): Where results go.
+            idle_delay (float): Pause for a source stage that produced nothing.
+        """
+        self.name = name
+        self.func = func
+        self.input_queue = input_queue
+        self.output_queue = output_queue
+        self.idle_delay = idle_delay
+        self.running = False
+        self.thread = None
+        self.stats = {"processed": 0, "busy_time": 0.0, "max_latency": 0.0,
+                      "blocked_time": 0.0, "errors": 0}
+        self.blocked_since = None
+
+    def _put(self, result):
+        """Hands a result downstream, waiting while the next queue is full."""
+        self.blocked_since = time.monotonic()
+        while self.running:
+            try:
+                self.output_queue.put(result, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        self.stats["blocked_time"] += time.monotonic() - self.blocked_since
+        self.blocked_since = None
+
+    def _loop(self):
+        while self.running:
+            if self.input_queue is not None:
+                try:
+                    item = self.input_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+
+            start = time.monotonic()
+            try:
+                result = self.func() if self.input_queue is None else self.func(item)
+            except Exception as e:
+                print(f"Pipeline: Stage '{self.name}' failed: {e}")
+                self.stats["errors"] += 1
+                result = None
+            elapsed = time.monotonic() - start
+
+            if self.input_queue is not None or result is not None:
+                self.stats["processed"] += 1
+                self.stats["busy_time"] += elapsed
+                self.stats["max_latency"] = max(self.stats["max_latency"], elapsed)
+
+            if result is None:
+                if self.input_queue is None:
+                    time.sleep(self.idle_delay)
+                continue
+            if self.output_queue is not None:
+                self._put(result)
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, name=f"stage-{self.name}", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+
+    def report(self):
+        processed = self.stats["processed"]
+        blocked_time = self.stats["blocked_time"]
+        blocked_since = self.blocked_since
+        if blocked_since is not None:
+            # Include a wait that is still in progress
+            blocked_time += time.monotonic() - blocked_since
+        return {
+            "processed": processed,
+            "avg_latency": self.stats["busy_time"] / processed if processed else 0.0,
+            "max_latency": self.stats["max_latency"],
+            "blocked_time": blocked_time,
+            "input_depth": self.input_queue.qsize() if self.input_queue is not None else 0,
+            "errors": self.stats["errors"],
+        }
+
+
+class Pipeline:
+    """
+    A linear chain of concurrently running stages with bounded queues between them.
+    """
+    def __init__(self, queue_size=2):
+        """
+        Args:
+            queue_size (int): Capacity of each queue between stages. A full
+                              queue makes the upstream stage wait (backpressure).
+        """
+        self.queue_size = queue_size
+        self.stages = []
+
+    def add_stage(self, name, func, idle_delay=0.1):
+        """
+        Appends a stage. The first stage is the source and takes no input.
+
+        Returns:
+            Pipeline: self, so stages can be chained.
+        """
+        input_queue = None
+        if self.stages:
+            input_queue = queue.Queue(maxsize=self.queue_size)
+            self.stages[-1].output_queue = input_queue
+        self.stages.append(PipelineStage(name, func, input_queue, idle_delay=idle_delay))
+        return self
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+
+    def stop(self, timeout=1.0):
+        for stage in self.stages:
+            stage.stop()
+        for stage in self.stages:
+            if stage.thread:
+                stage.thread.join(timeout)
+
+    def report(self):
+        """
+        Returns per-stage statistics.
+
+        Returns:
+            dict: stage name -> processed count, average/max latency (s),
+                  time blocked on the next queue (s) and input queue depth.
+        """
+        return {stage.name: stage.report() for stage in self.stages}
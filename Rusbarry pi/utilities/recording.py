@@ -0,0 +1,336 @@
+"""
+Utilities Module - Sensor Record & Replay
+=========================================
+
+This module records what the robot perceives (camera frames, microphone
+audio, sensor readings) with timestamps, and plays it back in place of the
+hardware, so perception and control can be profiled and benchmarked
+reproducibly on a dev machine.
+
+A recording is a directory with one pair of files per channel:
+
+    <channel>.bin       raw items appended as they arrive (frames, samples, values)
+    <channel>.idx.npy   one row per record: [timestamp, first item, item count]
+    meta.json           item shape and dtype per channel, plus extras (sample rate)
+
+Timestamps are seconds since the recording started. Replay memory-maps the
+`.bin` files, so even long recordings open instantly and frames are read
+straight from the page cache.
+
+Replay runs in real time (sources wait for each record's timestamp, scaled
+by `speed`) or unthrottled (`speed=None`: every source delivers its records
+as fast as it is read, in order).
+
+What an unthrottled replay reproduces depends on who drives the reads:
+    - Reproducible: each source's sequence of records, and anything driven
+      by pulling them one at a time, e.g. `Camera.capture_once()` followed
+      by processing that frame (as `benchmarks/bench_replay.py` does).
+    - Not reproducible: the app itself. Its camera thread free-runs and
+      consumers only take the newest frame, so which frames are processed
+      depends on how fast they keep up; audio, camera and sonar threads also
+      advance the shared virtual clock in whatever order they are scheduled.
+
+Integration Note:
+    - Record: `python main.py --record recordings/hallway`
+    - Replay: `python main.py --replay recordings/hallway [--unthrottled]`
+    - `Replay.capture()` plugs into `Camera(capture=...)`, `Replay.audio()`
+      into `VoiceRecognizer(audio_source=...)` and `Replay.sensor()` into
+      `EnvironmentalAwareness(front_sonar=...)`.
+"""
+
+import json
+import os
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Recorder:
+    """
+    Appends timestamped records to per-channel files.
+    """
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Directory to write the recording to (created if missing).
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.started = time.monotonic()
+        self.channels = {}
+        self.lock = threading.Lock()
+        self.closed = False
+        print(f"Recorder: Recording to {path}")
+
+    def _channel(self, name, item_shape, dtype, extra=None):
+        """Returns the channel, created on first use. Caller holds the lock."""
+        channel = self.channels.get(name)
+        if channel is None:
+            channel = {
+                "file": open(os.path.join(self.path, f"{name}.bin"), "wb"),
+                "index": [],
+                "items": 0,
+                "meta": {"shape": list(item_shape), "dtype": np.dtype(dtype).str, **(extra or {})},
+            }
+            self.channels[name] = channel
+        return channel
+
+    def record(self, name, items, timestamp=None, extra=None):
+        """
+        Appends one record.
+
+        Args:
+            name (str): Channel name, e.g. "camera".
+            items (numpy.ndarray): Items of the record along the first axis
+                                   (one frame, a chunk of samples, one value).
+            timestamp (float, optional): `time.monotonic()` of the capture
+                                         (default: now).
+            extra (dict, optional): Stored in the channel's metadata when the
+                                    channel is created (e.g. the sample rate).
+
+        Records arriving after `close()` (from threads still running during
+        shutdown) are dropped.
+        """
+        items = np.ascontiguousarray(items)
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        with self.lock:
+            # Checked under the lock so close() can't shut the file mid-write
+            if self.closed:
+                return
+            channel = self._channel(name, items.shape[1:], items.dtype, extra)
+            channel["file"].write(items.tobytes())
+            channel["index"].append((timestamp - self.started, channel["items"], len(items)))
+            channel["items"] += len(items)
+
+    def frame_sink(self, name="camera"):
+        """Returns a `Camera.add_sink` callback recording every frame."""
+        def sink(image, seq, timestamp):
+            self.record(name, image[np.newaxis], timestamp)
+        return sink
+
+    def audio_sink(self, name="microphone", sample_rate=16000):
+        """Returns a `MicrophoneStream.add_sink` callback recording every chunk."""
+        def sink(samples, timestamp):
+            self.record(name, samples, timestamp, extra={"sample_rate": sample_rate})
+        return sink
+
+    def close(self):
+        """Writes the indexes and metadata; the recording is readable afterwards."""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            meta = {"duration": time.monotonic() - self.started, "channels": {}}
+            for name, channel in self.channels.items():
+                channel["file"].close()
+                index = np.array(channel["index"], dtype=np.float64).reshape(-1, 3)
+                np.save(os.path.join(self.path, f"{name}.idx.npy"), index)
+                meta["channels"][name] = dict(channel["meta"], records=len(index))
+            with open(os.path.join(self.path, "meta.json"), "w") as f:
+                json.dump(meta, f, indent=2)
+        saved = ", ".join(f"{name} ({channel['records']})" for name, channel in meta["channels"].items())
+        print(f"Recorder: Saved {saved}")
+
+
+class RecordingSensor:
+    """
+    Wraps a distance sensor and records every reading.
+    """
+    def __init__(self, sensor, recorder, name="front_sonar"):
+        self.sensor = sensor
+        self.recorder = recorder
+        self.name = name
+
+    def get_distance(self):
+        distance = self.sensor.get_distance()
+        self.recorder.record(self.name, np.array([distance], dtype=np.float64))
+        return distance
+
+
+class ReplayClock:
+    """
+    Shared time base of a replay: real time (scaled) or virtual (unthrottled).
+    """
+    def __init__(self, speed=1.0):
+        """
+        Args:
+            speed (float, optional): Playback speed; None replays unthrottled.
+        """
+        self.speed = speed
+        self.started = time.monotonic()
+        self.virtual = 0.0
+
+    @property
+    def realtime(self):
+        return self.speed is not None
+
+    def now(self):
+        """Recording time the replay has reached."""
+        if self.realtime:
+            return (time.monotonic() - self.started) * self.speed
+        return self.virtual
+
+    def wait_until(self, timestamp):
+        """Blocks until `timestamp` in real time; only advances virtual time otherwise."""
+        if self.realtime:
+            delay = timestamp / self.speed - (time.monotonic() - self.started)
+            if delay > 0:
+                time.sleep(delay)
+        else:
+            self.virtual = max(self.virtual, timestamp)
+
+
+class ReplayChannel:
+    """
+    Memory-mapped records of one channel.
+    """
+    def __init__(self, path, name, meta):
+        self.name = name
+        self.meta = meta
+        index = np.load(os.path.join(path, f"{name}.idx.npy"))
+        self.times = index[:, 0]
+        self.starts = index[:, 1].astype(np.int64)
+        self.counts = index[:, 2].astype(np.int64)
+        shape = tuple(meta["shape"])
+        total = int(self.starts[-1] + self.counts[-1]) if len(index) else 0
+        if total:
+            self.data = np.memmap(os.path.join(path, f"{name}.bin"), dtype=np.dtype(meta["dtype"]),
+                                  mode="r", shape=(total,) + shape)
+        else:
+            self.data = np.empty((0,) + shape, dtype=np.dtype(meta["dtype"]))
+
+    def __len__(self):
+        return len(self.times)
+
+    def items(self, i):
+        """Items of record `i` (a read-only view into the file)."""
+        return self.data[self.starts[i]:self.starts[i] + self.counts[i]]
+
+    def at(self, timestamp):
+        """Index of the last record at or before `timestamp` (-1 if none)."""
+        return int(np.searchsorted(self.times, timestamp, side="right")) - 1
+
+
+class ReplayCapture:
+    """
+    Replays camera frames through OpenCV's `read()`/`release()` interface.
+    """
+    def __init__(self, channel, clock, loop=False):
+        self.channel = channel
+        self.clock = clock
+        self.loop = loop
+        self.position = 0
+        self.lap_offset = 0.0
+
+    def read(self, image=None):
+        if self.position >= len(self.channel):
+            if not self.loop or not len(self.channel):
+                return False, None
+            self.position = 0
+            self.lap_offset += self.channel.times[-1]
+        self.clock.wait_until(self.lap_offset + self.channel.times[self.position])
+        frame = self.channel.items(self.position)[0]
+        self.position += 1
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return True, image
+        return True, np.array(frame)
+
+    def release(self):
+        pass
+
+
+class ReplayAudio:
+    """
+    Replays microphone audio through PyAudio's stream `read()` interface.
+    """
+    def __init__(self, channel, clock):
+        self.channel = channel
+        self.clock = clock
+        self.sample_rate = channel.meta.get("sample_rate", 16000)
+        self.ends = channel.starts + channel.counts
+        self.position = 0
+
+    @property
+    def finished(self):
+        return self.position >= len(self.channel.data)
+
+    def read(self, num_frames, exception_on_overflow=False):
+        if self.finished:
+            # Past the end the microphone goes quiet
+            time.sleep(num_frames / self.sample_rate)
+            return bytes(2 * num_frames)
+        end = min(self.position + num_frames, len(self.channel.data))
+        record = min(int(np.searchsorted(self.ends, end, side="left")), len(self.ends) - 1)
+        self.clock.wait_until(self.channel.times[record])
+        samples = self.channel.data[self.position:end]
+        self.position = end
+        if len(samples) < num_frames:
+            samples = np.concatenate([samples, np.zeros(num_frames - len(samples), samples.dtype)])
+        return samples.tobytes()
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class ReplaySensor:
+    """
+    Replays distance readings through the sensor's `get_distance()` interface.
+
+    In real time it returns the reading current at the replay time; unthrottled
+    it returns the recorded readings one after another.
+    """
+    def __init__(self, channel, clock):
+        self.channel = channel
+        self.clock = clock
+        self.position = 0
+
+    def get_distance(self):
+        if not len(self.channel):
+            return float("inf")
+        if self.clock.realtime:
+            i = max(0, self.channel.at(self.clock.now()))
+        else:
+            i = min(self.position, len(self.channel) - 1)
+            self.position += 1
+            self.clock.wait_until(self.channel.times[i])
+        return float(self.channel.items(i)[0])
+
+
+class Replay:
+    """
+    Opens a recording and creates replay sources sharing one clock.
+    """
+    def __init__(self, path, speed=1.0):
+        """
+        Args:
+            path (str): Recording directory written by `Recorder`.
+            speed (float, optional): Playback speed; None replays unthrottled.
+        """
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.clock = ReplayClock(speed)
+        self.channels = {name: ReplayChannel(path, name, meta)
+                         for name, meta in self.meta["channels"].items()}
+        mode = f"{speed}x" if speed is not None else "unthrottled"
+        print(f"Replay: {path} ({self.meta['duration']:.1f}s, {mode}): {', '.join(self.channels)}")
+
+    def capture(self, name="camera", loop=False):
+        """Camera source, or None if the recording has no such channel."""
+        return ReplayCapture(self.channels[name], self.clock, loop) if name in self.channels else None
+
+    def audio(self, name="microphone"):
+        """Microphone source, or None if the recording has no such channel."""
+        return ReplayAudio(self.channels[name], self.clock) if name in self.channels else None
+
+    def sensor(self, name="front_sonar"):
+        """Distance sensor, or None if the recording has no such channel."""
+        return ReplaySensor(self.channels[name], self.clock) if name in self.channels else None